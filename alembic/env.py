@@ -31,6 +31,14 @@ from src.models.user import User  # noqa: E402
 from src.models.session import UserSession  # noqa: E402
 from src.models.audit_log import AuditLog  # noqa
 from src.models.transaction import Transaction  # noqa: E402
+from src.models.chain_head import ChainHead  # noqa: E402
+from src.models.block import Block  # noqa: E402
+from src.models.chain_checkpoint import ChainCheckpoint  # noqa: E402
+from src.models.address_activity import AddressActivity  # noqa: E402
+from src.models.ledger_posting import LedgerPosting  # noqa: E402
+from src.models.balance_snapshot import BalanceSnapshot, BalanceSnapshotRun  # noqa: E402
+from src.models.balance_shard import BalanceShard  # noqa: E402
+from src.models.idempotency_key import IdempotencyKey  # noqa: E402
 from src.models.audit_log import AuditLog  # noqa: E402
 
 target_metadata = Base.metadata
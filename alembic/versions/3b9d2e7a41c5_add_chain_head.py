@@ -0,0 +1,50 @@
+"""add chain_head, block_index -> bigint
+
+Revision ID: 3b9d2e7a41c5
+Revises: c7f45e29940a
+Create Date: 2026-10-18 10:12:03.418221
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '3b9d2e7a41c5'
+down_revision = 'c7f45e29940a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # block_index: String(100) -> BigInteger ("9" > "10" leksik sort muammosi)
+    op.alter_column('transactions', 'block_index',
+               existing_type=sa.String(length=100),
+               type_=sa.BigInteger(),
+               existing_nullable=True,
+               postgresql_using='block_index::bigint')
+    op.create_index(op.f('ix_transactions_block_index'), 'transactions', ['block_index'], unique=True)
+
+    op.create_table('chain_head',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('block_index', sa.BigInteger(), nullable=False),
+    sa.Column('block_hash', sa.String(length=255), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # mavjud zanjir uchini bir marta ko'chirib qo'yamiz
+    op.execute(
+        """
+        insert into chain_head (id, block_index, block_hash)
+        select 1,
+               coalesce((select block_index from transactions order by block_index desc limit 1), 0),
+               coalesce((select block_hash from transactions order by block_index desc limit 1), 'GENESIS')
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('chain_head')
+    op.drop_index(op.f('ix_transactions_block_index'), table_name='transactions')
+    op.alter_column('transactions', 'block_index',
+               existing_type=sa.BigInteger(),
+               type_=sa.String(length=100),
+               existing_nullable=True)
@@ -0,0 +1,76 @@
+"""multi-tx blocks: blocks table, tx_hash/block_pos, from/to address
+
+Revision ID: 5e0a8c1f9d27
+Revises: 3b9d2e7a41c5
+Create Date: 2026-10-18 11:02:47.905113
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.db.chain_backfill import reseal_chain
+
+revision = '5e0a8c1f9d27'
+down_revision = '3b9d2e7a41c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('blocks',
+    sa.Column('block_index', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('prev_hash', sa.String(length=255), nullable=False),
+    sa.Column('block_hash', sa.String(length=255), nullable=False),
+    sa.Column('tx_root', sa.String(length=64), nullable=False),
+    sa.Column('tx_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('block_index')
+    )
+    op.create_index(op.f('ix_blocks_block_hash'), 'blocks', ['block_hash'], unique=False)
+
+    # router/explorer shu ustunlarni ishlatadi, modelda yo'q edi
+    op.add_column('transactions', sa.Column('from_address', sa.String(length=64), nullable=False, server_default=''))
+    op.add_column('transactions', sa.Column('to_address', sa.String(length=64), nullable=False, server_default=''))
+    op.alter_column('transactions', 'from_address', server_default=None)
+    op.alter_column('transactions', 'to_address', server_default=None)
+
+    op.add_column('transactions', sa.Column('block_pos', sa.Integer(), nullable=True))
+    op.add_column('transactions', sa.Column('tx_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_transactions_tx_hash'), 'transactions', ['tx_hash'], unique=True)
+
+    # bitta blockda endi bir nechta tx bo'ladi
+    op.drop_index(op.f('ix_transactions_block_index'), table_name='transactions')
+    op.create_index(op.f('ix_transactions_block_index'), 'transactions', ['block_index'], unique=False)
+    op.create_unique_constraint('uq_transactions_block_pos', 'transactions', ['block_index', 'block_pos'])
+
+    # eski "1 tx = 1 block" yozuvlari uchun header
+    op.execute("update transactions set block_pos = 0 where block_index is not null")
+    op.execute(
+        """
+        insert into blocks (block_index, prev_hash, block_hash, tx_root, tx_count, created_at)
+        select block_index, coalesce(prev_hash, ''), coalesce(block_hash, ''), '', 1, created_at
+        from transactions
+        where block_index is not null
+        """
+    )
+    # eski blocklar tx_hash / tx_root siz tekshirib bo'lmaydi — shu revisiya qoidasi bilan qayta yopiladi
+    reseal_chain(op.get_bind(), "tx_root", _tx_root)
+
+
+def _tx_root(tx_hashes):
+    # shu revisiyadagi qoida (8a4f6b2c3e10 da merkle_root ga almashadi)
+    return hashlib.sha256("|".join(tx_hashes).encode("utf-8")).hexdigest()
+
+
+def downgrade():
+    op.drop_constraint('uq_transactions_block_pos', 'transactions', type_='unique')
+    op.drop_index(op.f('ix_transactions_block_index'), table_name='transactions')
+    op.create_index(op.f('ix_transactions_block_index'), 'transactions', ['block_index'], unique=True)
+    op.drop_index(op.f('ix_transactions_tx_hash'), table_name='transactions')
+    op.drop_column('transactions', 'tx_hash')
+    op.drop_column('transactions', 'block_pos')
+    op.drop_column('transactions', 'to_address')
+    op.drop_column('transactions', 'from_address')
+    op.drop_index(op.f('ix_blocks_block_hash'), table_name='blocks')
+    op.drop_table('blocks')
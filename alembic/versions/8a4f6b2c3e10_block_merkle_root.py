@@ -0,0 +1,39 @@
+"""blocks.tx_root -> merkle_root
+
+Revision ID: 8a4f6b2c3e10
+Revises: 5e0a8c1f9d27
+Create Date: 2026-10-18 12:20:15.331870
+"""
+import hashlib
+
+from alembic import op
+
+from src.db.chain_backfill import reseal_chain
+
+revision = '8a4f6b2c3e10'
+down_revision = '5e0a8c1f9d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column('blocks', 'tx_root', new_column_name='merkle_root')
+    # verify-chain / proof endi Merkle root talab qiladi: 5e0a8c1f9d27 qoidasi bilan
+    # yopilgan (va undan oldingi eski) blocklar shu yerda qayta yopiladi
+    reseal_chain(op.get_bind(), "merkle_root", _merkle_root)
+
+
+def _merkle_root(tx_hashes):
+    # shu revisiyadagi qoida (services/merkle.py dan nusxa, u keyin o'zgarsa ham bu o'zgarmaydi):
+    # leaf = sha256(0x00||tx_hash), node = sha256(0x01||left||right), toq tugun yuqoriga ko'tariladi
+    level = [hashlib.sha256(b"\x00" + bytes.fromhex(h)).digest() for h in tx_hashes]
+    while len(level) > 1:
+        nxt = [hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return level[0].hex()
+
+
+def downgrade():
+    op.alter_column('blocks', 'merkle_root', new_column_name='tx_root')
@@ -0,0 +1,106 @@
+"""partition audit_logs by month
+
+Revision ID: a3c5e8f1b246
+Revises: e4a1c7d93b62
+Create Date: 2026-10-18 18:21:07.331942
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'a3c5e8f1b246'
+down_revision = 'e4a1c7d93b62'
+branch_labels = None
+depends_on = None
+
+# migratsiya paytida joriy oydan keyin nechta oy oldindan yaratiladi
+# (keyingilarini services/audit_partitions.py fon threadi yaratadi)
+MONTHS_AHEAD = 3
+
+
+def upgrade():
+    # eski jadval chetga; indekslari nusxalashni sekinlashtirmasin
+    op.drop_index(op.f('ix_audit_logs_entity_id'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_entity'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_actor'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_action'), table_name='audit_logs')
+    op.rename_table('audit_logs', 'audit_logs_legacy')
+    op.execute('ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey')
+
+    op.create_table('audit_logs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('actor', sa.String(length=320), nullable=False),
+    sa.Column('action', sa.String(length=64), nullable=False),
+    sa.Column('entity', sa.String(length=64), nullable=False),
+    sa.Column('entity_id', sa.String(length=128), nullable=False),
+    sa.Column('meta', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_audit_logs_created_id', 'audit_logs', ['created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_actor_created', 'audit_logs', ['actor', 'created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_action_created', 'audit_logs', ['action', 'created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_entity_created', 'audit_logs', ['entity', 'entity_id', 'created_at'], unique=False)
+
+    # eng eski yozuv oyidan max(eng yangi yozuv oyi, joriy oy + MONTHS_AHEAD) gacha: audit_logs_yYYYYmMM
+    # (soati oldinda bo'lgan hostdan kelgan kelajakdagi created_at ham o'z partitioniga tushadi)
+    op.execute(f"""
+    DO $$
+    DECLARE
+        m date;
+        last date := greatest(
+            date_trunc('month', now() AT TIME ZONE 'UTC')::date + interval '{MONTHS_AHEAD} month',
+            (SELECT date_trunc('month', max(created_at) AT TIME ZONE 'UTC')::date FROM audit_logs_legacy)
+        );
+    BEGIN
+        m := coalesce(
+            (SELECT date_trunc('month', min(created_at) AT TIME ZONE 'UTC')::date FROM audit_logs_legacy),
+            date_trunc('month', now() AT TIME ZONE 'UTC')::date
+        );
+        WHILE m <= last LOOP
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                'audit_logs_y' || to_char(m, 'YYYY') || 'm' || to_char(m, 'MM'),
+                m::timestamp AT TIME ZONE 'UTC',
+                (m + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            m := m + interval '1 month';
+        END LOOP;
+    END $$;
+    """)
+
+    # oylik partitioni yo'q qatorlar (maintainer to'xtagan bo'lsa) shu yerga tushadi — insert yiqilmaydi;
+    # services/audit_partitions.ensure_partitions ularni o'z oyiga ko'chiradi
+    op.execute('CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT')
+
+    op.execute("""
+    INSERT INTO audit_logs (id, actor, action, entity, entity_id, meta, created_at)
+    SELECT id, actor, action, entity, entity_id, meta, created_at FROM audit_logs_legacy
+    """)
+    op.drop_table('audit_logs_legacy')
+
+
+def downgrade():
+    op.create_table('audit_logs_legacy',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('actor', sa.String(length=320), nullable=False),
+    sa.Column('action', sa.String(length=64), nullable=False),
+    sa.Column('entity', sa.String(length=64), nullable=False),
+    sa.Column('entity_id', sa.String(length=128), nullable=False),
+    sa.Column('meta', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', name='audit_logs_legacy_pkey')
+    )
+    op.execute("""
+    INSERT INTO audit_logs_legacy (id, actor, action, entity, entity_id, meta, created_at)
+    SELECT id, actor, action, entity, entity_id, meta, created_at FROM audit_logs
+    """)
+    # partitionlar ota jadval bilan birga o'chadi
+    op.drop_table('audit_logs')
+    op.rename_table('audit_logs_legacy', 'audit_logs')
+    op.execute('ALTER TABLE audit_logs RENAME CONSTRAINT audit_logs_legacy_pkey TO audit_logs_pkey')
+    op.create_index(op.f('ix_audit_logs_action'), 'audit_logs', ['action'], unique=False)
+    op.create_index(op.f('ix_audit_logs_actor'), 'audit_logs', ['actor'], unique=False)
+    op.create_index(op.f('ix_audit_logs_entity'), 'audit_logs', ['entity'], unique=False)
+    op.create_index(op.f('ix_audit_logs_entity_id'), 'audit_logs', ['entity_id'], unique=False)
@@ -0,0 +1,27 @@
+"""add chain_checkpoint
+
+Revision ID: b61d0e4a7f93
+Revises: 8a4f6b2c3e10
+Create Date: 2026-10-18 13:05:41.772019
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b61d0e4a7f93'
+down_revision = '8a4f6b2c3e10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chain_checkpoint',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('block_index', sa.BigInteger(), nullable=False),
+    sa.Column('block_hash', sa.String(length=255), nullable=False),
+    sa.Column('verified_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('chain_checkpoint')
@@ -0,0 +1,35 @@
+"""add balance shards for hot accounts
+
+Revision ID: b7e2d4a9c018
+Revises: a3c5e8f1b246
+Create Date: 2026-10-18 19:05:12.604418
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b7e2d4a9c018'
+down_revision = 'a3c5e8f1b246'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('balance_shards', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('balance_shards',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('shard', sa.SmallInteger(), autoincrement=False, nullable=False),
+    sa.Column('balance', sa.Numeric(precision=20, scale=8), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'shard')
+    )
+
+
+def downgrade():
+    # shardlardagi mablag' yo'qolmasin: avval users.balance ga yig'amiz
+    op.execute("""
+    UPDATE users u SET balance = u.balance + s.total
+    FROM (SELECT user_id, sum(balance) AS total FROM balance_shards GROUP BY user_id) s
+    WHERE s.user_id = u.id
+    """)
+    op.drop_table('balance_shards')
+    op.drop_column('users', 'balance_shards')
@@ -0,0 +1,47 @@
+"""add address_activity
+
+Revision ID: d27c94e1b058
+Revises: b61d0e4a7f93
+Create Date: 2026-10-18 14:31:09.120448
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd27c94e1b058'
+down_revision = 'b61d0e4a7f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('address_activity',
+    sa.Column('address', sa.String(length=64), nullable=False),
+    sa.Column('block_index', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('block_pos', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('direction', sa.String(length=4), nullable=False),
+    sa.Column('tx_id', sa.UUID(), nullable=False),
+    sa.PrimaryKeyConstraint('address', 'block_index', 'block_pos')
+    )
+
+    # mavjud tx lar uchun backfill
+    op.execute(
+        """
+        insert into address_activity (address, block_index, block_pos, direction, tx_id)
+        select from_address, block_index, block_pos,
+               case when from_address = to_address then 'self' else 'out' end, id
+        from transactions
+        where block_index is not null and block_pos is not null
+        """
+    )
+    op.execute(
+        """
+        insert into address_activity (address, block_index, block_pos, direction, tx_id)
+        select to_address, block_index, block_pos, 'in', id
+        from transactions
+        where block_index is not null and block_pos is not null and from_address <> to_address
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('address_activity')
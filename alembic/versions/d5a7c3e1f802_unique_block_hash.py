@@ -0,0 +1,22 @@
+"""unique index on blocks.block_hash
+
+Revision ID: d5a7c3e1f802
+Revises: c4d8f2a6e915
+Create Date: 2026-10-18 20:48:03.551927
+"""
+from alembic import op
+
+revision = 'd5a7c3e1f802'
+down_revision = 'c4d8f2a6e915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_blocks_block_hash', table_name='blocks')
+    op.create_index(op.f('ix_blocks_block_hash'), 'blocks', ['block_hash'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_blocks_block_hash'), table_name='blocks')
+    op.create_index('ix_blocks_block_hash', 'blocks', ['block_hash'], unique=False)
@@ -0,0 +1,66 @@
+"""add ledger postings and balance snapshots
+
+Revision ID: e4a1c7d93b62
+Revises: d27c94e1b058
+Create Date: 2026-10-18 16:02:44.517203
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e4a1c7d93b62'
+down_revision = 'd27c94e1b058'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ledger_postings',
+    sa.Column('tx_id', sa.UUID(), nullable=False),
+    sa.Column('entry', sa.String(length=6), nullable=False),
+    sa.Column('block_index', sa.BigInteger(), nullable=False),
+    sa.Column('block_pos', sa.Integer(), nullable=False),
+    sa.Column('address', sa.String(length=64), nullable=False),
+    sa.Column('delta', sa.Numeric(precision=20, scale=8), nullable=False),
+    sa.PrimaryKeyConstraint('tx_id', 'entry')
+    )
+    op.create_index('ix_ledger_postings_block_index', 'ledger_postings', ['block_index'], unique=False)
+    op.create_index('ix_ledger_postings_address_block', 'ledger_postings', ['address', 'block_index'], unique=False)
+
+    op.create_table('balance_snapshots',
+    sa.Column('address', sa.String(length=64), nullable=False),
+    sa.Column('block_index', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('balance', sa.Numeric(precision=20, scale=8), nullable=False),
+    sa.PrimaryKeyConstraint('address', 'block_index')
+    )
+    op.create_table('balance_snapshot_runs',
+    sa.Column('block_index', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('addresses', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('block_index')
+    )
+
+    # mavjud tx lar uchun backfill (debit + credit)
+    op.execute(
+        """
+        insert into ledger_postings (tx_id, entry, block_index, block_pos, address, delta)
+        select id, 'debit', block_index, block_pos, from_address, -amount
+        from transactions
+        where block_index is not null and block_pos is not null
+        """
+    )
+    op.execute(
+        """
+        insert into ledger_postings (tx_id, entry, block_index, block_pos, address, delta)
+        select id, 'credit', block_index, block_pos, to_address, amount
+        from transactions
+        where block_index is not null and block_pos is not null
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('balance_snapshot_runs')
+    op.drop_table('balance_snapshots')
+    op.drop_index('ix_ledger_postings_address_block', table_name='ledger_postings')
+    op.drop_index('ix_ledger_postings_block_index', table_name='ledger_postings')
+    op.drop_table('ledger_postings')
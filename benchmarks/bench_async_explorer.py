@@ -0,0 +1,153 @@
+"""
+Explorer o'qishlari: sync (threadpool + Session) va async (AsyncSession)
+handlerlarni bir xil pool hajmida solishtiradi. So'rovlar httpx ASGITransport
+orqali jarayon ichida yuboriladi (tarmoq o'lchovga kirmaydi).
+Natija JSON: har concurrency uchun req/s va p50/p99 latency.
+
+Eslatma: sqlite da aiosqlite har ulanishni alohida threadda ishlatadi, shuning
+uchun async bu yerda sekinroq chiqadi — haqiqiy taqqoslash Postgres + asyncpg da.
+
+    python -m benchmarks.bench_async_explorer --blocks 2000 --requests 3000 --concurrency 10,100,1000 --pool-size 10
+    python -m benchmarks.bench_async_explorer --database-url postgresql+psycopg2://... --no-seed
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from decimal import Decimal
+from typing import Callable
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool  # noqa: E402
+
+from src.db.async_session import async_url, get_async_db  # noqa: E402
+from src.db.base import Base  # noqa: E402
+from src.db.session import get_db  # noqa: E402
+from src.models.transaction import Transaction  # noqa: E402
+from src.routers import explorer as sync_explorer  # noqa: E402
+from src.routers.aio import explorer as aio_explorer  # noqa: E402
+from src.services.blockchain import build_block  # noqa: E402
+
+
+def seed(url: str, n_blocks: int, txs_per_block: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[t for t in Base.metadata.sorted_tables if t.name != "audit_logs"])
+    db = sessionmaker(bind=engine)()
+    try:
+        for _ in range(n_blocks):
+            txs = [
+                Transaction(from_address="a" * 40, to_address="b" * 40, amount=Decimal("1"),
+                            tx_type="transfer", user_id=uuid.uuid4())
+                for _ in range(txs_per_block)
+            ]
+            with db.begin():
+                build_block(db, txs)
+                db.add_all(txs)
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def sync_app(url: str, pool_size: int) -> tuple[FastAPI, Callable]:
+    engine = create_engine(url, poolclass=QueuePool, pool_size=pool_size, max_overflow=0)
+    maker = sessionmaker(bind=engine, autoflush=False)
+
+    def _db():
+        db = maker()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(sync_explorer.router)
+    app.dependency_overrides[get_db] = _db
+    return app, engine.dispose
+
+
+def async_app(url: str, pool_size: int) -> tuple[FastAPI, Callable]:
+    # sqlite+aiosqlite sukut bo'yicha NullPool — taqqoslash uchun ikkalasida ham bir xil pool
+    engine = create_async_engine(async_url(url), poolclass=AsyncAdaptedQueuePool, pool_size=pool_size, max_overflow=0)
+    maker = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def _db():
+        async with maker() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(aio_explorer.router)
+    app.dependency_overrides[get_async_db] = _db
+    return app, engine.dispose
+
+
+async def drive(app: FastAPI, n_blocks: int, n_requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int) -> None:
+            async with sem:
+                t0 = time.perf_counter()
+                r = await client.get(f"/api/v1/explorer/block/{i % n_blocks + 1}")
+                latencies.append(time.perf_counter() - t0)
+                assert r.status_code == 200, r.text
+
+        await one(0)  # isitish
+        latencies.clear()
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n_requests)))
+        dt = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "seconds": round(dt, 3),
+        "req_per_s": round(n_requests / dt, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+async def run(url: str, args) -> dict:
+    out: dict = {"database": url.split("://")[0], "pool_size": args.pool_size, "requests": args.requests}
+    for name, factory in (("sync", sync_app), ("async", async_app)):
+        app, dispose = factory(url, args.pool_size)
+        try:
+            out[name] = [await drive(app, args.blocks, args.requests, c) for c in args.concurrency]
+        finally:
+            res = dispose()
+            if asyncio.iscoroutine(res):
+                await res
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--database-url", default=None, help="sukut: vaqtinchalik sqlite fayl")
+    ap.add_argument("--no-seed", action="store_true")
+    ap.add_argument("--blocks", type=int, default=2000)
+    ap.add_argument("--txs", type=int, default=4)
+    ap.add_argument("--requests", type=int, default=3000)
+    ap.add_argument("--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[10, 100, 1000])
+    ap.add_argument("--pool-size", type=int, default=10)
+    args = ap.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    if not args.no_seed:
+        seed(url, args.blocks, args.txs)
+    print(json.dumps(asyncio.run(run(url, args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Legacy transfer: ORM yo'li (transfer) va Core yo'li (transfer_core) latency va
+har transferdagi SQL statementlar soni. Faqat PostgreSQL da ma'noli (sqlite da
+transfer_core ORM ga tushadi).
+
+Ketma-ket (bitta sessiya) va parallel (--workers ta thread, tasodifiy juftlar)
+rejimlar; natija JSON: req/s, p50/p99 ms, statements/transfer.
+
+    python -m benchmarks.bench_transfer_engine --database-url postgresql+psycopg2://... --users 200 --transfers 2000 --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.core.config import settings  # noqa: E402
+from src.db.base import Base  # noqa: E402
+from src.models.user import User  # noqa: E402
+from src.services.transfer import transfer  # noqa: E402
+from src.services.transfer_core import transfer_core  # noqa: E402
+
+ENGINES = {"orm": transfer, "core": transfer_core}
+
+
+def seed(engine, n_users: int) -> list[tuple[uuid.UUID, str]]:
+    Base.metadata.create_all(engine, tables=[t for t in Base.metadata.sorted_tables if t.name != "audit_logs"])
+    with engine.begin() as conn:
+        conn.execute(text("delete from users where email like 'bench-%'"))
+    maker = sessionmaker(bind=engine)
+    users = []
+    with maker() as db:
+        for i in range(n_users):
+            u = User(email=f"bench-{i}@x", password_hash="x", address=uuid.uuid4().hex[:40],
+                     balance=Decimal("1000000"))
+            db.add(u)
+            users.append(u)
+        db.commit()
+        return [(u.id, u.address) for u in users]
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.n = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._on)
+
+    def _on(self, *a):
+        with self._lock:
+            self.n += 1
+
+
+def run(engine, counter: StatementCounter, fn, users, n: int, workers: int) -> dict:
+    maker = sessionmaker(bind=engine, autoflush=False)
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def one(_):
+        (sid, _), (_, to) = random.sample(users, 2)
+        db = maker()
+        try:
+            t0 = time.perf_counter()
+            fn(db, sid, "bench", to, Decimal("0.01"))
+            dt = time.perf_counter() - t0
+        finally:
+            db.close()
+        with lock:
+            latencies.append(dt)
+
+    one(0)  # isitish
+    latencies.clear()
+    before = counter.n
+    t0 = time.perf_counter()
+    if workers <= 1:
+        for i in range(n):
+            one(i)
+    else:
+        with ThreadPoolExecutor(workers) as ex:
+            list(ex.map(one, range(n)))
+    dt = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "workers": workers,
+        "req_per_s": round(n / dt, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+        "statements_per_transfer": round((counter.n - before) / n, 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--database-url", required=True)
+    ap.add_argument("--users", type=int, default=200)
+    ap.add_argument("--transfers", type=int, default=2000)
+    ap.add_argument("--workers", type=lambda s: [int(x) for x in s.split(",")], default=[1, 8])
+    args = ap.parse_args()
+
+    # audit_logs benchmarkga kirmaydi (writer alohida o'lchanadi)
+    settings.AUDIT_TX_DURABLE = False
+    settings.AUDIT_WRITER_MODE = "sync"
+
+    engine = create_engine(args.database_url, pool_size=max(args.workers) + 2)
+    if engine.dialect.name != "postgresql":
+        print("warning: transfer_core falls back to the ORM path on", engine.dialect.name)
+    users = seed(engine, args.users)
+    counter = StatementCounter(engine)
+
+    out: dict = {"database": engine.dialect.name, "transfers": args.transfers}
+    for name, fn in ENGINES.items():
+        out[name] = [run(engine, counter, fn, users, args.transfers, w) for w in args.workers]
+    engine.dispose()
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
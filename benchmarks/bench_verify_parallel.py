@@ -0,0 +1,88 @@
+"""
+Parallel verify benchmark (DB siz): sintetik zanjir segmentlarga bo'linib
+1, 2, 4, ... workerli ProcessPoolExecutor da tekshiriladi.
+Natija JSON: har worker soni uchun vaqt, blocks/s va 1 workerga nisbatan speedup.
+
+    python -m benchmarks.bench_verify_parallel --blocks 20000 --txs 4 --max-workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from src.services.blockchain import _norm_amount, block_hash, tx_hash
+from src.services.chain_verify import scan_blocks
+from src.services.chain_verify_parallel import merge_segments, segments
+from src.services.merkle import merkle_root
+
+
+def make_chain(n_blocks: int, txs_per_block: int) -> list[tuple]:
+    chain = []
+    prev = "GENESIS"
+    for idx in range(1, n_blocks + 1):
+        raw = []
+        for pos in range(txs_per_block):
+            t_id = uuid.UUID(int=idx * 1000 + pos)
+            amount = _norm_amount(pos + 1)
+            raw.append((t_id, "a" * 40, "b" * 40, amount, tx_hash(t_id, "a" * 40, "b" * 40, amount), pos))
+        root = merkle_root([r[4] for r in raw])
+        h = block_hash(idx, prev, root)
+        txs = [r + (prev, h) for r in raw]
+        chain.append(((idx, prev, h, root, txs_per_block), txs))
+        prev = h
+    return chain
+
+
+def _scan_segment(start: int, end: int, blocks: list[tuple]) -> dict:
+    *_, last = scan_blocks(blocks, start, end, None, 10_000)
+    return last["scan"]
+
+
+def run(chain: list[tuple], workers: int, segment_size: int) -> float:
+    parts = segments(1, len(chain), segment_size)
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        # pool ni isitib olamiz (spawn vaqti o'lchovga kirmasin)
+        list(pool.map(abs, range(workers)))
+        t0 = time.perf_counter()
+        futs = [pool.submit(_scan_segment, s, e, chain[s - 1:e]) for s, e in parts]
+        merged = merge_segments([f.result() for f in futs], "GENESIS")
+        dt = time.perf_counter() - t0
+    assert merged["error_count"] == 0, merged["errors"][:3]
+    return dt
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--blocks", type=int, default=20000)
+    ap.add_argument("--txs", type=int, default=4)
+    ap.add_argument("--segment", type=int, default=1000)
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    chain = make_chain(args.blocks, args.txs)
+    counts = []
+    w = 1
+    while w <= args.max_workers:
+        counts.append(w)
+        w *= 2
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+
+    results = []
+    base = None
+    for w in counts:
+        dt = run(chain, w, args.segment)
+        base = base or dt
+        results.append({"workers": w, "seconds": round(dt, 4), "blocks_per_s": round(args.blocks / dt, 1), "speedup": round(base / dt, 2)})
+
+    print(json.dumps({"blocks": args.blocks, "txs_per_block": args.txs, "cpu_count": os.cpu_count(), "runs": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
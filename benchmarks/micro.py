@@ -0,0 +1,222 @@
+"""
+Micro-benchmarklar (DB siz, sof Python issiq joylar) + saqlangan baseline va regressiya chegarasi.
+
+Har case uchun eng yaxshi (min) ns/op o'lchanadi va kalibrlash sikliga nisbati (ratio)
+hisoblanadi — baseline boshqa mashinada ham taqqoslanadigan bo'lsin. --check:
+ratio > baseline_ratio * threshold bo'lsa regressiya, exit code 1.
+
+    python -m benchmarks.micro                  # o'lchash, JSON
+    python -m benchmarks.micro --check          # benchmarks/baselines/micro.json bilan solishtirish
+    python -m benchmarks.micro --update         # baselineni qayta yozish (ataylab tezlashtirish/sekinlashtirishdan keyin)
+    python -m benchmarks.micro --check -k rate_limit --threshold 1.3
+
+pytest orqali: MICRO_BENCH=1 python -m pytest tests/test_micro_bench.py
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import platform
+import sys
+import timeit
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Optional
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from benchmarks.bench_verify_parallel import make_chain  # noqa: E402
+from src.models.transaction import Transaction  # noqa: E402
+from src.schemas.transaction import TxOut  # noqa: E402
+from src.schemas.user import UserOut  # noqa: E402
+from src.services.blockchain import _norm_amount, _sha256, calculate_hash, seal_txs, tx_hash  # noqa: E402
+from src.services.chain_verify import check_block, scan_blocks  # noqa: E402
+from src.services.rate_limit import MemoryBackend, RateLimiter  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "micro.json"
+DEFAULT_THRESHOLD = 2.0
+
+# name -> setup(); setup qaytargan funksiya bitta "op" ni bajaradi
+CASES: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def case(name: str):
+    def deco(setup):
+        CASES[name] = setup
+        return setup
+    return deco
+
+
+@case("sha256_header")
+def _():
+    s = f"123456|{'a' * 64}|{'b' * 64}"
+    return lambda: _sha256(s)
+
+
+@case("calculate_hash_tx")
+def _():
+    d = {"id": str(uuid.uuid4()), "from": "a" * 40, "to": "b" * 40, "amount": "12.50000000"}
+    return lambda: calculate_hash(d)
+
+
+@case("norm_amount")
+def _():
+    return lambda: _norm_amount("123.456789012")
+
+
+@case("tx_hash")
+def _():
+    t_id = uuid.uuid4()
+    amount = Decimal("12.5")
+    return lambda: tx_hash(t_id, "a" * 40, "b" * 40, amount)
+
+
+@case("seal_txs_100")
+def _():
+    txs = [
+        Transaction(id=uuid.UUID(int=i), from_address="a" * 40, to_address="b" * 40,
+                    amount=Decimal("1.5"), tx_type="transfer", user_id=uuid.UUID(int=1))
+        for i in range(100)
+    ]
+    return lambda: seal_txs(txs, 42, "c" * 64)
+
+
+@case("check_block_10")
+def _():
+    ((header, txs),) = make_chain(1, 10)
+    return lambda: check_block(header, txs)
+
+
+@case("scan_blocks_200x4")
+def _():
+    chain = make_chain(200, 4)
+    return lambda: list(scan_blocks(chain, 1, 200, "GENESIS", 1000))
+
+
+@case("rate_limit_hit_100k_keys")
+def _():
+    limiter = RateLimiter(MemoryBackend(), clock=lambda: 1_000_000.0)
+    keys = [f"tx:{uuid.uuid4().hex}" for _ in range(100_000)]
+    for k in keys:
+        limiter.hit(k, 60, 60)
+    it = itertools.cycle(keys)
+    return lambda: limiter.hit(next(it), 60, 60)
+
+
+@case("txout_validate_dump_1000")
+def _():
+    rows = [
+        {"id": uuid.uuid4(), "from_address": "a" * 40, "to_address": "b" * 40, "amount": Decimal("1.5"),
+         "block_index": i, "prev_hash": "c" * 64, "block_hash": "d" * 64}
+        for i in range(1000)
+    ]
+    ta = TypeAdapter(list[TxOut])
+    return lambda: ta.dump_json(ta.validate_python(rows))
+
+
+@case("userout_validate_dump_1000")
+def _():
+    rows = [{"id": uuid.uuid4(), "email": f"user{i}@example.com", "address": "a" * 40, "balance": Decimal("10")}
+            for i in range(1000)]
+    ta = TypeAdapter(list[UserOut])
+    return lambda: ta.dump_json(ta.validate_python(rows))
+
+
+def calibrate() -> float:
+    """Mashina tezligi uchun mos yozuv (sof Python + hashlib), ns."""
+    data = b"x" * 256
+
+    def ref():
+        acc = 0
+        for i in range(200):
+            acc += i * i
+        hashlib.sha256(data).hexdigest()
+        return acc
+
+    return measure(ref)
+
+
+def measure(fn: Callable[[], object], target_s: float = 0.3, repeat: int = 7) -> float:
+    """min ns/op: number shunday tanlanadiki bitta repeat ~target_s/repeat davom etsin."""
+    t = timeit.Timer(fn)
+    number, elapsed = t.autorange()
+    number = max(1, int(number * (target_s / repeat) / max(elapsed, 1e-9)))
+    return min(t.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run(names: list[str]) -> dict:
+    # kalibrlash caselardan oldin va keyin — CPU chastotasi/qo'shni yuk o'zgarsa ham min barqaror
+    calib = calibrate()
+    raw = {name: measure(CASES[name]()) for name in names}
+    calib = min(calib, calibrate())
+    cases = {name: {"ns_per_op": round(ns, 1), "ratio": round(ns / calib, 4)} for name, ns in raw.items()}
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_ns": round(calib, 1),
+        "cases": cases,
+    }
+
+
+def compare(result: dict, baseline: dict, threshold: Optional[float]) -> list[dict]:
+    rows = []
+    for name, cur in result["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            rows.append({"case": name, "status": "new"})
+            continue
+        limit = threshold or base.get("threshold", DEFAULT_THRESHOLD)
+        change = cur["ratio"] / base["ratio"]
+        rows.append({
+            "case": name,
+            "status": "regression" if change > limit else "ok",
+            "change": round(change, 3),
+            "threshold": limit,
+            "ns_per_op": cur["ns_per_op"],
+            "baseline_ns_per_op": base["ns_per_op"],
+        })
+    return rows
+
+
+def update_baseline(result: dict, path: Path = BASELINE) -> None:
+    old = json.loads(path.read_text())["cases"] if path.exists() else {}
+    for name, cur in result["cases"].items():
+        # case uchun alohida threshold (shovqinli caselar) saqlanib qoladi
+        if "threshold" in old.get(name, {}):
+            cur["threshold"] = old[name]["threshold"]
+    merged = {**old, **result["cases"]}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({**result, "cases": merged}, indent=2, sort_keys=True) + "\n")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-k", dest="filter", default="", help="faqat nomida shu qism bor caselar")
+    ap.add_argument("--check", action="store_true", help="baseline bilan solishtirish (regressiya -> exit 1)")
+    ap.add_argument("--update", action="store_true", help="baselineni yozish")
+    ap.add_argument("--threshold", type=float, default=None, help=f"sukut: case dagi yoki {DEFAULT_THRESHOLD}")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    args = ap.parse_args(argv)
+
+    names = [n for n in CASES if args.filter in n]
+    result = run(names)
+    out: dict = {"result": result}
+    code = 0
+    if args.check:
+        rows = compare(result, json.loads(args.baseline.read_text()), args.threshold)
+        out["check"] = rows
+        code = 1 if any(r["status"] == "regression" for r in rows) else 0
+    if args.update:
+        update_baseline(result, args.baseline)
+    print(json.dumps(out, indent=2))
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
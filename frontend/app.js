@@ -101,6 +101,7 @@ async function loadMe() {
 
   const token = getToken();
   if (!token) {
+    closeStream();
     if (btnLogout) btnLogout.classList.add("hidden");
     if (dash) dash.innerHTML = `<div class="muted">Not logged in.</div>`;
     return;
@@ -112,6 +113,7 @@ async function loadMe() {
   if (!res.ok) {
     // token noto‘g‘ri/eskirgan bo‘lsa
     clearToken();
+    closeStream();
     if (btnLogout) btnLogout.classList.add("hidden");
 
     const msg = (data && data.detail) ? data.detail : "Unauthorized (401)";
@@ -120,6 +122,7 @@ async function loadMe() {
   }
 
   if (btnLogout) btnLogout.classList.remove("hidden");
+  openStream(token);
 
   const email = data?.email ?? "-";
   const balance = data?.balance ?? "-";
@@ -133,6 +136,38 @@ async function loadMe() {
   }
 }
 
+// ---------- push kanal: tx/balans o'zgarsa dashboard yangilanadi (poll yo'q) ----------
+let stream = null;
+let streamToken = null;
+
+function openStream(token) {
+  if (stream && streamToken === token) return;
+  closeStream();
+  const base = (API || window.location.origin).replace(/^http/, "ws");
+  streamToken = token;
+  stream = new WebSocket(`${base}/api/v1/stream/ws?blocks=0&token=${encodeURIComponent(token)}`);
+  stream.onmessage = (e) => {
+    const ev = JSON.parse(e.data);
+    if (ev.type === "tx" || ev.type === "lagged") loadMe();
+  };
+  stream.onclose = () => {
+    // server "lagged" yoki tarmoq uzilishi — token o'zgarmagan bo'lsa qayta ulanamiz
+    const t = streamToken;
+    stream = null;
+    streamToken = null;
+    if (t && t === getToken()) setTimeout(() => openStream(t), 3000);
+  };
+}
+
+function closeStream() {
+  if (!stream) return;
+  const s = stream;
+  stream = null;
+  streamToken = null;
+  s.onclose = null;
+  s.close();
+}
+
 function doLogout() {
   clearToken();
   setMsg("login-msg", "Logout ✅", "ok");
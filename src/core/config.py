@@ -20,5 +20,124 @@ class Settings:
 
     AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "0") == "1"
 
+    # DB connection pool (har uvicorn worker uchun alohida):
+    # jami ulanishlar <= workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # -1 -> o'chiq
+    # "always" — har checkoutda ping; "optimistic" — ping yo'q, uzilish xatoda aniqlanadi
+    DB_PRE_PING = os.getenv("DB_PRE_PING", "always")
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 -> cheklovsiz
+    # PgBouncer transaction pooling: sessiya holati yo'q (SET LOCAL, prepared statement cache o'chiq);
+    # DB_POOL_SIZE=0 bilan birga — NullPool (ulanishlarni PgBouncer ushlaydi)
+    DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "0") == "1"
+
+    # 1 bo'lsa users/tx/explorer/admin handlerlari AsyncSession (asyncpg) da ishlaydi
+    ASYNC_DB_ENABLED = os.getenv("ASYNC_DB_ENABLED", "0") == "1"
+
+    # Mempool rejimi: 1 bo'lsa transferlar navbatga tushadi va fon producer
+    # ularni BLOCK_MAX_TXS tagacha / har BLOCK_INTERVAL_MS da bitta blockka yopadi.
+    # 0 bo'lsa eski rejim: 1 tx = 1 block.
+    BLOCK_PRODUCER_ENABLED = os.getenv("BLOCK_PRODUCER_ENABLED", "0") == "1"
+    BLOCK_MAX_TXS = int(os.getenv("BLOCK_MAX_TXS", "100"))
+    BLOCK_INTERVAL_MS = int(os.getenv("BLOCK_INTERVAL_MS", "200"))
+    MEMPOOL_MAX_SIZE = int(os.getenv("MEMPOOL_MAX_SIZE", "10000"))
+    MEMPOOL_WAIT_SECONDS = float(os.getenv("MEMPOOL_WAIT_SECONDS", "10"))
+    # POST /tx/batch: bitta so'rovdagi transferlar soni (hammasi bitta blockka tushadi)
+    TX_BATCH_MAX = int(os.getenv("TX_BATCH_MAX", "1000"))
+    # TX_ENGINE=core: legacy transfer bitta CTE (UPDATE ... RETURNING) bilan, ORM siz
+    # (faqat PostgreSQL; sharded hisob / o'ziga o'tkazma / sqlite -> orm yo'li)
+    TX_ENGINE = os.getenv("TX_ENGINE", "orm")
+    # deadlock/serialization xatolarida tranzaksiya qayta bajariladi (jitterli backoff);
+    # budget: har so'rov RATIO token qo'shadi, har retry 1 token — retry bo'roni bo'lmasin
+    TX_RETRY_MAX_ATTEMPTS = int(os.getenv("TX_RETRY_MAX_ATTEMPTS", "5"))
+    TX_RETRY_BASE_MS = float(os.getenv("TX_RETRY_BASE_MS", "10"))
+    TX_RETRY_CAP_MS = float(os.getenv("TX_RETRY_CAP_MS", "200"))
+    TX_RETRY_BUDGET_RATIO = float(os.getenv("TX_RETRY_BUDGET_RATIO", "0.2"))
+    # Sharded balans (issiq hisoblar, admin yoqadi): shardlar users.balance ga
+    # shu interval bilan yig'iladi
+    BALANCE_SHARD_COMPACTION_ENABLED = os.getenv("BALANCE_SHARD_COMPACTION_ENABLED", "1") == "1"
+    BALANCE_SHARD_COMPACT_SECONDS = float(os.getenv("BALANCE_SHARD_COMPACT_SECONDS", "30"))
+    # Idempotency-Key (tx/create, tx/batch): javob TTL davomida saqlanadi; parallel
+    # takror birinchisini WAIT gacha kutadi (mempool kutishidan uzunroq bo'lsin)
+    IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "15"))
+    IDEMPOTENCY_PURGE_SECONDS = float(os.getenv("IDEMPOTENCY_PURGE_SECONDS", "300"))
+
+    # verify_chain: server-side cursor dan bir martada olinadigan qatorlar soni
+    VERIFY_CHUNK_SIZE = int(os.getenv("VERIFY_CHUNK_SIZE", "1000"))
+    # parallel verify: process soni (0 -> os.cpu_count()) va bitta segmentdagi blocklar soni
+    VERIFY_WORKERS = int(os.getenv("VERIFY_WORKERS", "0"))
+    VERIFY_SEGMENT_SIZE = int(os.getenv("VERIFY_SEGMENT_SIZE", "20000"))
+
+    # Ledger balans snapshotlari: head oxirgi snapshotdan EVERY_BLOCKS ga
+    # o'sganda fon thread yangi snapshot oladi (har INTERVAL_SECONDS tekshiradi)
+    LEDGER_SNAPSHOTS_ENABLED = os.getenv("LEDGER_SNAPSHOTS_ENABLED", "1") == "1"
+    LEDGER_SNAPSHOT_EVERY_BLOCKS = int(os.getenv("LEDGER_SNAPSHOT_EVERY_BLOCKS", "1000"))
+    LEDGER_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("LEDGER_SNAPSHOT_INTERVAL_SECONDS", "60"))
+
+    # Rate limit (GCRA): "limit/window_seconds". Backend: memory (1 process)
+    # yoki sqlite (RATE_LIMIT_SQLITE_PATH — bir hostdagi barcha workerlar uchun umumiy)
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "/tmp/lord_rate_limit.db")
+    RATE_LIMIT_AUTH = os.getenv("RATE_LIMIT_AUTH", "10/60")
+    RATE_LIMIT_TX = os.getenv("RATE_LIMIT_TX", "60/60")
+    RATE_LIMIT_EVICT_SECONDS = float(os.getenv("RATE_LIMIT_EVICT_SECONDS", "60"))
+    # reverse proxy IP/CIDR lari (vergul bilan): faqat shulardan kelgan X-Forwarded-For ga ishoniladi.
+    # Bo'sh bo'lsa kalit — TCP peer (proxy ortida hamma bitta IP bo'lib qoladi)
+    RATE_LIMIT_TRUSTED_PROXIES = os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "")
+
+    # Audit: "queue" — fon writer batch qilib yozadi, "sync" — har hodisaga alohida commit.
+    # AUDIT_TX_DURABLE=1: transfer auditi pul tranzaksiyasining o'zida (atomik)
+    AUDIT_WRITER_MODE = os.getenv("AUDIT_WRITER_MODE", "queue")
+    AUDIT_TX_DURABLE = os.getenv("AUDIT_TX_DURABLE", "1") == "1"
+    AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_MS = int(os.getenv("AUDIT_FLUSH_MS", "200"))
+    # navbat to'la bo'lsa shuncha kutadi, keyin chaqiruvchi sync yozadi
+    AUDIT_ENQUEUE_TIMEOUT_MS = int(os.getenv("AUDIT_ENQUEUE_TIMEOUT_MS", "0"))
+    # audit_logs oylik partitionlari (PostgreSQL): oldindan yaratish va saqlash muddati.
+    # AUDIT_RETENTION_MONTHS=0 -> hech qachon o'chirilmaydi
+    AUDIT_PARTITION_MAINTENANCE_ENABLED = os.getenv("AUDIT_PARTITION_MAINTENANCE_ENABLED", "1") == "1"
+    AUDIT_PARTITIONS_AHEAD = int(os.getenv("AUDIT_PARTITIONS_AHEAD", "2"))
+    AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", "0"))
+    AUDIT_PARTITION_CHECK_SECONDS = float(os.getenv("AUDIT_PARTITION_CHECK_SECONDS", "86400"))
+
+    # Principal cache (JWT subject -> user identity): LRU hajmi va TTL.
+    # Boshqa workerlarda freeze/unfreeze eng ko'pi bilan TTL kechikadi; 0 -> cache o'chiq
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+
+    # Explorer: yopilgan block/tx javoblari (o'zgarmas) uchun in-process LRU, baytlarda; 0 -> o'chiq
+    BLOCK_CACHE_MAX_BYTES = int(os.getenv("BLOCK_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+    # Push kanal (/api/v1/stream/*): yangi blocklar va manzil tx eventlari.
+    # Subscriber bufferi to'lsa u uziladi (sekin klient publisherni to'xtatmaydi).
+    # PostgreSQL da boshqa workerlarga LISTEN/NOTIFY; LISTEN pgbouncer (transaction
+    # pooling) orqali ishlamaydi — STREAM_LISTEN_URL to'g'ridan-to'g'ri Postgresga
+    STREAM_ENABLED = os.getenv("STREAM_ENABLED", "1") == "1"
+    STREAM_BUFFER_SIZE = int(os.getenv("STREAM_BUFFER_SIZE", "256"))
+    STREAM_MAX_SUBSCRIBERS = int(os.getenv("STREAM_MAX_SUBSCRIBERS", "5000"))
+    STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+    STREAM_PG_NOTIFY = os.getenv("STREAM_PG_NOTIFY", "1") == "1"
+    STREAM_CHANNEL = os.getenv("STREAM_CHANNEL", "lord_stream")
+    STREAM_LISTEN_URL = os.getenv("STREAM_LISTEN_URL", "")
+
+    # Parol hashlash (login/register): alohida executor, to'lsa 503.
+    # PASSWORD_BCRYPT_ROUNDS dan past cost li hashlar loginda yangilanadi
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_QUEUE_MAX = int(os.getenv("PASSWORD_HASH_QUEUE_MAX", "32"))
+    PASSWORD_BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+
+    # Prometheus metrikalar (GET /metrics); METRICS_TOKEN berilsa Authorization: Bearer talab qilinadi.
+    # Bir necha uvicorn worker: METRICS_DIR — umumiy papka (deployda tozalanadi, masalan tmpfs),
+    # workerlar snapshotni METRICS_FLUSH_SECONDS da yozadi, /metrics hammasini qo'shadi
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+    METRICS_DIR = os.getenv("METRICS_DIR", "")
+    METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
 
 settings = Settings()
\ No newline at end of file
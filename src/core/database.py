@@ -7,6 +7,20 @@ def init_db():
     from src.models import user  # noqa
     from src.models import transaction  # noqa
     from src.models import audit_log  # noqa
+    from src.models import chain_head  # noqa
+    from src.models import block  # noqa
+    from src.models import chain_checkpoint  # noqa
+    from src.models import address_activity  # noqa
+    from src.models import ledger_posting  # noqa
+    from src.models import balance_snapshot  # noqa
+    from src.models import balance_shard  # noqa
+    from src.models import idempotency_key  # noqa
 
     if settings.AUTO_CREATE_TABLES:
         Base.metadata.create_all(bind=engine)
+        # audit_logs partitionlangan: partitionsiz ota jadvalga yozib bo'lmaydi
+        from src.db.session import SessionLocal
+        from src.services.audit_partitions import ensure_partitions
+
+        with SessionLocal() as db:
+            ensure_partitions(db)
@@ -0,0 +1,67 @@
+# backend/src/db/async_session.py
+"""
+Async engine/sessiya (ASYNC_DB_ENABLED=1 bo'lganda routerlar shundan foydalanadi).
+Engine birinchi chaqiriqda yaratiladi — sync rejimda asyncpg import qilinmaydi.
+"""
+from __future__ import annotations
+
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.db.pool import engine_options, install_hooks
+from src.db.session import DATABASE_URL
+from src.services.metrics import instrument_engine
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def async_url(url: str) -> str:
+    """postgresql+psycopg2://... -> postgresql+asyncpg://... (sqlite -> aiosqlite)."""
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def get_async_engine() -> AsyncEngine:
+    global _engine
+    if _engine is None:
+        url = async_url(DATABASE_URL)
+        _engine = create_async_engine(url, **engine_options(url, is_async=True))
+        install_hooks(_engine.sync_engine)
+        instrument_engine(_engine.sync_engine)
+    return _engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    global _sessionmaker
+    if _sessionmaker is None:
+        # expire_on_commit=False: commitdan keyin atributlarni o'qish yangi await talab qilmasin
+        _sessionmaker = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _sessionmaker()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+def async_engine_started() -> bool:
+    return _engine is not None
+
+
+async def dispose_async_engine() -> None:
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _sessionmaker = None
@@ -0,0 +1,89 @@
+# backend/src/db/chain_backfill.py
+"""
+Migratsiyalar uchun: zanjirni 1..N tartibida joriy hash qoidalari bilan qayta yopish.
+
+Eski "1 tx = 1 block" yozuvlarida tx_hash yo'q, header hashi boshqa qoida bilan
+hisoblangan — verify-chain ularni buzilgan deb ko'rsatadi, /tx/{hash}/proof 404.
+reseal_chain har tx ga tx_hash, har blockka root/tx_count/block_hash yozadi,
+prev_hash zanjirini qayta bog'laydi va chain_head ni oxirgi blockka suradi.
+Hash qoidasi o'zgarganda (tx_root -> merkle_root) shu funksiya yangi root_fn bilan
+yana chaqiriladi. PostgreSQL da tranzaksiyalar oqim bilan o'qiladi (stream_results).
+
+Faqat migratsiyalar ishlatadi va app kodini (models/services) import qilmaydi:
+tx_hash/block_hash 5e0a8c1f9d27 revisiyasidagi holatida muzlatilgan — services/blockchain
+keyin o'zgarsa ham eski revisiyalar bir xil hash yozadi. Bu yerni o'zgartirmang;
+yangi qoida kerak bo'lsa yangi migratsiyada yangi funksiya qo'shing.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from decimal import Decimal, ROUND_DOWN
+from itertools import groupby
+from typing import Callable, Sequence
+
+from sqlalchemy import Numeric, Uuid, bindparam, column, select, table, text, update
+from sqlalchemy.engine import Connection
+
+CHUNK = 1000
+
+_transactions = table(
+    "transactions",
+    column("id", Uuid()), column("from_address"), column("to_address"), column("amount", Numeric()),
+    column("block_index"), column("block_pos"), column("tx_hash"), column("prev_hash"), column("block_hash"),
+)
+
+
+def tx_hash(tx_id, from_addr: str, to_addr: str, amount) -> str:
+    a = Decimal(str(amount)).quantize(Decimal("0.00000001"), rounding=ROUND_DOWN)
+    payload = {"id": str(tx_id), "from": from_addr, "to": to_addr, "amount": format(a, "f")}
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def block_hash(block_index: int, prev_hash: str, root: str) -> str:
+    return hashlib.sha256(f"{block_index}|{prev_hash}|{root}".encode("utf-8")).hexdigest()
+
+
+def reseal_chain(conn: Connection, root_column: str, root_fn: Callable[[Sequence[str]], str]) -> int:
+    """Qayta yopilgan blocklar soni. root_column: blocks dagi root ustuni nomi (migratsiya vaqtidagi)."""
+    t = _transactions
+    stmt = (
+        select(t.c.block_index, t.c.id, t.c.from_address, t.c.to_address, t.c.amount)
+        .where(t.c.block_index.is_not(None))
+        .order_by(t.c.block_index.asc(), t.c.block_pos.asc())
+    )
+    if conn.dialect.name == "postgresql":
+        # server-side cursor: jadval xotiraga yuklanmaydi, UPDATE lar shu tranzaksiyada
+        rows = conn.execute(stmt.execution_options(stream_results=True, yield_per=CHUNK))
+    else:
+        # sqlite: o'qilayotgan jadvalni shu ulanishda yangilash kursorni buzadi
+        rows = conn.execute(stmt).all()
+    upd_tx = (
+        update(t)
+        .where(t.c.id == bindparam("_id"))
+        .values(tx_hash=bindparam("_tx_hash"), block_pos=bindparam("_pos"),
+                prev_hash=bindparam("_prev"), block_hash=bindparam("_hash"))
+    )
+    upd_block = text(
+        f"update blocks set {root_column} = :root, tx_count = :n, prev_hash = :prev, block_hash = :hash "
+        "where block_index = :idx"
+    )
+
+    prev, last, count = "GENESIS", (0, "GENESIS"), 0
+    for idx, grp in groupby(rows, key=lambda r: r.block_index):
+        grp = list(grp)
+        hashes = [tx_hash(r.id, r.from_address, r.to_address, r.amount) for r in grp]
+        root = root_fn(hashes)
+        new_hash = block_hash(idx, prev, root)
+        conn.execute(upd_block, {"root": root, "n": len(grp), "prev": prev, "hash": new_hash, "idx": idx})
+        conn.execute(upd_tx, [
+            {"_id": r.id, "_tx_hash": h, "_pos": pos, "_prev": prev, "_hash": new_hash}
+            for pos, (r, h) in enumerate(zip(grp, hashes))
+        ])
+        prev, last, count = new_hash, (idx, new_hash), count + 1
+
+    conn.execute(text("update chain_head set block_index = :idx, block_hash = :hash where id = 1"),
+                 {"idx": last[0], "hash": last[1]})
+    return count
@@ -0,0 +1,178 @@
+# backend/src/db/pool.py
+"""
+Connection pool sozlamalari va live metrikalar.
+
+- pool hajmi/overflow/timeout/recycle Settings dan (DB_POOL_*)
+- pre-ping: "always" (har checkoutda SELECT 1) yoki "optimistic"
+  (ping yo'q; uzilgan ulanishni SQLAlchemy xatoda invalidate qiladi, recycle eskisini yangilaydi)
+- statement timeout: oddiy rejimda ulanish parametri, DB_PGBOUNCER=1 da
+  har tranzaksiya boshida SET LOCAL (sessiya holati qolmaydi)
+- metrikalar: checked out, overflow, checkout kutish vaqti histogrammasi
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from src.core.config import settings
+
+# checkout kutish vaqti histogramma chegaralari (sekund)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class BucketHistogram:
+    """Thread-safe bucket histogram (pool checkout kutishi, password hasher navbati/vaqti)."""
+
+    def __init__(self, buckets: tuple[float, ...] = WAIT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # oxirgisi: +Inf
+        self.total = 0.0
+        self.n = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.total += seconds
+            self.n += 1
+
+    def raw(self) -> tuple[list[int], float]:
+        """Kumulyativ bo'lmagan bucket countlar (+Inf bilan) va yig'indi — /metrics uchun."""
+        with self._lock:
+            return list(self.counts), self.total
+
+    def cumulative(self) -> list[dict]:
+        counts, _ = self.raw()
+        out, acc = [], 0
+        for le, n in zip(list(self.buckets) + ["+Inf"], counts):
+            acc += n
+            out.append({"le": le, "count": acc})
+        return out
+
+    def snapshot(self) -> dict:
+        return {"count": self.n, "sum": round(self.total, 6), "histogram": self.cumulative()}
+
+
+class PoolMetrics(BucketHistogram):
+    def __init__(self, buckets: tuple[float, ...] = WAIT_BUCKETS) -> None:
+        super().__init__(buckets)
+        self.timeouts = 0
+
+    def timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "checkouts": self.n,
+            "timeouts": self.timeouts,
+            "wait_seconds_sum": round(self.total, 6),
+            "wait_histogram": self.cumulative(),
+        }
+
+
+class _MeteredMixin:
+    """_do_get — pooldan ulanish olish (kerak bo'lsa kutish) shu yerda."""
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        # recreate() (dispose) yangi instansiya yaratadi — metrikalar ham yangidan
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeout:
+            self.metrics.timeout()
+            raise
+        self.metrics.observe(time.perf_counter() - t0)
+        return conn
+
+
+class MeteredQueuePool(_MeteredMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine / create_async_engine uchun kwargs."""
+    if _is_sqlite(url):
+        # sqlite: dialektning o'z pooli (testlar, lokal)
+        return {}
+
+    opts: dict = {
+        "pool_pre_ping": settings.DB_PRE_PING == "always",
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if settings.DB_PGBOUNCER and settings.DB_POOL_SIZE == 0:
+        # tranzaksiya pooling PgBouncer da: ulanishlarni PgBouncer ushlaydi
+        opts["poolclass"] = NullPool
+        opts.pop("pool_recycle")
+    else:
+        opts.update(
+            poolclass=MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+
+    connect_args: dict = {}
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if is_async:
+        server_settings = {}
+        if timeout_ms and not settings.DB_PGBOUNCER:
+            server_settings["statement_timeout"] = str(timeout_ms)
+        if server_settings:
+            connect_args["server_settings"] = server_settings
+        if settings.DB_PGBOUNCER:
+            # asyncpg prepared statementlari tranzaksiya poolingda boshqa backendga tushib qoladi
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+    elif timeout_ms and not settings.DB_PGBOUNCER:
+        connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+    if connect_args:
+        opts["connect_args"] = connect_args
+    return opts
+
+
+def install_hooks(sync_engine) -> None:
+    """PgBouncer rejimida statement timeout har tranzaksiyaga SET LOCAL bilan."""
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if not (settings.DB_PGBOUNCER and timeout_ms) or _is_sqlite(str(sync_engine.url)):
+        return
+
+    @event.listens_for(sync_engine, "begin")
+    def _set_local_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    out: dict = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        out.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        out.update(metrics.snapshot())
+    return out
+
@@ -0,0 +1,141 @@
+# backend/src/db/retry.py
+"""
+Deadlock / serialization xatolarida DB tranzaksiyasini qayta ishga tushirish.
+
+- klassifikatsiya: SQLSTATE 40P01 (deadlock), 40001 (serialization),
+  55P03 (lock_not_available); sqlite "database is locked"
+- backoff: eksponensial, "full jitter" (0..min(cap, base*2^n)), TX_RETRY_MAX_ATTEMPTS
+- retry budget: har birinchi urinish TX_RETRY_BUDGET_RATIO token qo'shadi, har retry
+  1 token oladi — kuchli contentionda retrylar yukni ko'paytirib yubormaydi
+- limit/budget tugasa 503 + Retry-After (500 "TX failed" emas)
+Funksiya o'z `with db.begin()` tranzaksiyasini butunlay qayta bajaradi.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy.exc import DBAPIError
+
+from src.core.config import settings
+
+T = TypeVar("T")
+
+DEADLOCK = "deadlock"
+SERIALIZATION = "serialization"
+LOCK_TIMEOUT = "lock_timeout"
+
+_SQLSTATES = {"40P01": DEADLOCK, "40001": SERIALIZATION, "55P03": LOCK_TIMEOUT}
+
+
+def classify(exc: BaseException) -> Optional[str]:
+    """Qayta urinsa bo'ladigan xato turi yoki None."""
+    if not isinstance(exc, DBAPIError):
+        return None
+    orig = exc.orig
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if code in _SQLSTATES:
+        return _SQLSTATES[code]
+    if "database is locked" in str(orig):
+        return LOCK_TIMEOUT
+    return None
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int, base_ms: float, cap_ms: float, budget_ratio: float, budget_min: float = 10.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_s = max(0.0, base_ms) / 1000.0
+        self.cap_s = max(0.0, cap_ms) / 1000.0
+        self.budget_ratio = budget_ratio
+        self.budget_max = max(budget_min, 1.0)
+        self.tokens = self.budget_max
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.gave_up = 0
+        self.budget_exhausted = 0
+        self.by_kind = {DEADLOCK: 0, SERIALIZATION: 0, LOCK_TIMEOUT: 0}
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.cap_s, self.base_s * (2 ** attempt)))
+
+    def _start(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.tokens = min(self.budget_max, self.tokens + self.budget_ratio)
+
+    def _should_retry(self, exc: BaseException, attempt: int) -> bool:
+        kind = classify(exc)
+        if kind is None:
+            return False
+        with self._lock:
+            self.by_kind[kind] += 1
+            if attempt + 1 >= self.max_attempts:
+                self.gave_up += 1
+                return False
+            if self.tokens < 1:
+                self.budget_exhausted += 1
+                self.gave_up += 1
+                return False
+            self.tokens -= 1
+            self.retries += 1
+            return True
+
+    @staticmethod
+    def _busy(exc: BaseException) -> HTTPException:
+        return HTTPException(status_code=503, detail=f"TX contention ({classify(exc)}), retry later",
+                             headers={"Retry-After": "1"})
+
+    def run(self, fn: Callable[..., T], *args, **kw) -> T:
+        self._start()
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kw)
+            except DBAPIError as e:
+                if not self._should_retry(e, attempt):
+                    if classify(e):
+                        raise self._busy(e) from e
+                    raise
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+    async def run_async(self, fn: Callable[..., Awaitable[T]], *args, **kw) -> T:
+        """run() bilan bir xil, lekin kutish event loopni bloklamaydi."""
+        self._start()
+        attempt = 0
+        while True:
+            try:
+                return await fn(*args, **kw)
+            except DBAPIError as e:
+                if not self._should_retry(e, attempt):
+                    if classify(e):
+                        raise self._busy(e) from e
+                    raise
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+                "budget_exhausted": self.budget_exhausted,
+                "budget_tokens": round(self.tokens, 2),
+                "deadlocks": self.by_kind[DEADLOCK],
+                "serialization_failures": self.by_kind[SERIALIZATION],
+                "lock_timeouts": self.by_kind[LOCK_TIMEOUT],
+            }
+
+
+tx_retry = RetryPolicy(
+    settings.TX_RETRY_MAX_ATTEMPTS,
+    settings.TX_RETRY_BASE_MS,
+    settings.TX_RETRY_CAP_MS,
+    settings.TX_RETRY_BUDGET_RATIO,
+)
@@ -5,11 +5,17 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from src.db.pool import engine_options, install_hooks
+from src.services.metrics import instrument_engine
+
 DATABASE_URL = os.environ.get("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL env var is not set")
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# pool hajmi, pre-ping, recycle, statement timeout — Settings.DB_* (src/db/pool.py)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+install_hooks(engine)
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
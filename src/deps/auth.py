@@ -5,10 +5,14 @@ import os
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from src.db.session import get_db
+from src.db.async_session import AsyncSessionLocal
+from src.db.session import SessionLocal, get_db
 from src.models.user import User
+from src.services.principal_cache import Principal, principal_cache
+from src.services.users import load_user
 
 JWT_SECRET = os.environ.get("JWT_SECRET", "dev_secret_change_me")
 JWT_ALG = os.environ.get("JWT_ALG", "HS256")
@@ -16,10 +20,7 @@ JWT_ALG = os.environ.get("JWT_ALG", "HS256")
 bearer = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    creds: HTTPAuthorizationCredentials | None = Depends(bearer),
-    db: Session = Depends(get_db),
-) -> User:
+def _subject(creds: HTTPAuthorizationCredentials | None) -> str:
     if not creds:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
@@ -31,12 +32,64 @@ def get_current_user(
             raise HTTPException(status_code=401, detail="Invalid token")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    return email
 
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
 
-    if user.is_frozen:
+def _load_principal(email: str) -> Principal:
+    # faqat cache miss bo'lganda qisqa sessiya ochiladi
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return Principal.from_user(user)
+    finally:
+        db.close()
+
+
+def get_current_principal(creds: HTTPAuthorizationCredentials | None = Depends(bearer)) -> Principal:
+    """
+    Faqat identity kerak bo'lgan endpointlar uchun: cache hit bo'lsa
+    DB sessiya umuman olinmaydi.
+    """
+    email = _subject(creds)
+    principal = principal_cache.get(email)
+    if principal is None:
+        principal = _load_principal(email)
+        principal_cache.put(email, principal)
+
+    if principal.is_frozen:
+        raise HTTPException(status_code=403, detail="Account is frozen")
+
+    return principal
+
+
+def principal_from_token(token: str) -> Principal:
+    """Header bo'lmagan joylar uchun (WebSocket ?token=): get_current_principal bilan bir xil."""
+    return get_current_principal(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+async def get_current_principal_async(creds: HTTPAuthorizationCredentials | None = Depends(bearer)) -> Principal:
+    """get_current_principal ning async varianti (miss bo'lsa AsyncSession)."""
+    email = _subject(creds)
+    principal = principal_cache.get(email)
+    if principal is None:
+        async with AsyncSessionLocal() as db:
+            user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+        if not user:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        principal = Principal.from_user(user)
+        principal_cache.put(email, principal)
+
+    if principal.is_frozen:
         raise HTTPException(status_code=403, detail="Account is frozen")
 
-    return user
+    return principal
+
+
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+) -> User:
+    """To'liq User qatori kerak bo'lganda (masalan balans): PK bo'yicha o'qiladi."""
+    return load_user(db, principal)
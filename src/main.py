@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -9,8 +11,76 @@ from src.routers.users import router as users_router
 from src.routers.tx import router as tx_router
 from src.routers.explorer import router as explorer_router
 from src.routers.admin import router as admin_router
+from src.routers.stream import router as stream_router
+from src.routers.metrics import router as metrics_router
+from src.core.config import settings
+from src.services.audit import start_audit_writer, stop_audit_writer
+from src.services.audit_partitions import start_partition_maintainer, stop_partition_maintainer
+from src.services.balance_shards import start_shard_compactor, stop_shard_compactor
+from src.services.idempotency import start_idempotency_purger, stop_idempotency_purger
+from src.services.ledger import start_ledger_snapshotter, stop_ledger_snapshotter
+from src.services.mempool import start_block_producer, stop_block_producer
+from src.services.metrics import MetricsMiddleware, start_metrics_flusher, stop_metrics_flusher
+from src.services.password_hasher import stop_password_hasher
+from src.services.rate_limit import RateLimitMiddleware, start_rate_limit_evictor, stop_rate_limit_evictor
+from src.services.stream import start_stream_listener, stop_stream_listener
+
+def _startup() -> None:
+    if settings.AUDIT_WRITER_MODE == "queue":
+        start_audit_writer()
+    if settings.AUDIT_PARTITION_MAINTENANCE_ENABLED:
+        start_partition_maintainer()
+    if settings.RATE_LIMIT_ENABLED:
+        start_rate_limit_evictor()
+    # mempool rejimi: navbatdagi transferlarni blockka yopadi
+    if settings.BLOCK_PRODUCER_ENABLED:
+        start_block_producer()
+    if settings.LEDGER_SNAPSHOTS_ENABLED:
+        start_ledger_snapshotter()
+    if settings.BALANCE_SHARD_COMPACTION_ENABLED:
+        start_shard_compactor()
+    start_idempotency_purger()
+    # boshqa workerlarning blocklari (pg LISTEN) -> shu processdagi SSE/WS
+    if settings.STREAM_ENABLED and settings.STREAM_PG_NOTIFY:
+        start_stream_listener()
+    # ko'p worker: har process snapshotini METRICS_DIR ga yozadi
+    if settings.METRICS_ENABLED and settings.METRICS_DIR:
+        start_metrics_flusher()
+
+
+async def _shutdown() -> None:
+    # navbatdagi transferlar ham blockka yopilib bo'lsin
+    stop_block_producer()
+    stop_ledger_snapshotter()
+    stop_shard_compactor()
+    stop_idempotency_purger()
+    stop_stream_listener()
+    stop_rate_limit_evictor()
+    stop_partition_maintainer()
+    stop_password_hasher()
+    stop_metrics_flusher()
+    # oxirida: producer yopgan blocklarning auditi ham navbatdan yozilsin
+    stop_audit_writer()
+    if settings.ASYNC_DB_ENABLED:
+        from src.db.async_session import dispose_async_engine
+
+        await dispose_async_engine()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    _startup()
+    try:
+        yield
+    finally:
+        await _shutdown()
 
-app = FastAPI(title="LORD API")
+
+app = FastAPI(title="LORD API", lifespan=lifespan)
+
+# ✅ Rate limit: auth va tx endpointlari (CORS dan ichkarida — 429 ham CORS header oladi)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
 
 # ✅ CORS: browser OPTIONS (preflight) 405 bo‘lmasin
 app.add_middleware(
@@ -19,19 +89,41 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Before", "Idempotent-Replayed", "ETag"],  # keyset cursor; saqlangan javob; explorer cache
 )
 
-# ✅ API routerlar
+# ✅ Metrikalar: eng tashqi qatlam (429 va preflight ham hisoblanadi), GET /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# ✅ API routerlar (ASYNC_DB_ENABLED=1: users/tx/explorer/admin async variantlari)
 app.include_router(auth_router)
-app.include_router(users_router)
-app.include_router(tx_router)
-app.include_router(explorer_router)
-app.include_router(admin_router)
+app.include_router(stream_router)
+app.include_router(metrics_router)
+if settings.ASYNC_DB_ENABLED:
+    from src.routers.aio import override
+    from src.routers.aio import admin as aio_admin, explorer as aio_explorer, tx as aio_tx, users as aio_users
+
+    app.include_router(override(aio_users.router, users_router))
+    app.include_router(override(aio_tx.router, tx_router))
+    app.include_router(override(aio_explorer.router, explorer_router))
+    app.include_router(override(aio_admin.router, admin_router))
+else:
+    app.include_router(users_router)
+    app.include_router(tx_router)
+    app.include_router(explorer_router)
+    app.include_router(admin_router)
 
 # ✅ Frontend /ui da (API bilan urishmaydi)
 FRONTEND_DIR = Path(__file__).resolve().parents[1] / "frontend"
 app.mount("/ui", StaticFiles(directory=str(FRONTEND_DIR), html=True), name="frontend")
 
+# liveness (DB ga tegmaydi): load harness / orchestrator uchun
+@app.get("/health", include_in_schema=False)
+def health():
+    return {"ok": True}
+
+
 @app.get("/", include_in_schema=False)
 def root():
     return RedirectResponse(url="/ui/")
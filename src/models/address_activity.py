@@ -0,0 +1,23 @@
+# src/models/address_activity.py
+from sqlalchemy import BigInteger, Column, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.db.base import Base
+
+
+class AddressActivity(Base):
+    """
+    Manzil bo'yicha faollik: har bir tx uchun from va to manzillarga bittadan
+    qator (o'ziga o'tkazma bo'lsa bitta, direction="self").
+    PK (address, block_index, block_pos) — keyset pagination shu index bo'yicha
+    O(log n + sahifa).
+    """
+
+    __tablename__ = "address_activity"
+
+    address = Column(String(64), primary_key=True)
+    block_index = Column(BigInteger, primary_key=True, autoincrement=False)
+    block_pos = Column(Integer, primary_key=True, autoincrement=False)
+
+    direction = Column(String(4), nullable=False)  # in / out / self
+    tx_id = Column(UUID(as_uuid=True), nullable=False)
@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, Index, String, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -17,16 +17,30 @@ def utcnow() -> datetime:
 
 
 class AuditLog(Base):
+    """
+    PostgreSQL da created_at bo'yicha oylik RANGE partitionlangan
+    (services/audit_partitions.py). Partition kaliti PK ichida bo'lishi shart.
+    """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # keyset: (created_at, id) desc — har partitionda kichik, oxiriga qo'shiladigan btree
+        Index("ix_audit_logs_created_id", "created_at", "id"),
+        Index("ix_audit_logs_actor_created", "actor", "created_at", "id"),
+        Index("ix_audit_logs_action_created", "action", "created_at", "id"),
+        Index("ix_audit_logs_entity_created", "entity", "entity_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
 
-    actor: Mapped[str] = mapped_column(String(320), nullable=False, index=True)
-    action: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    actor: Mapped[str] = mapped_column(String(320), nullable=False)
+    action: Mapped[str] = mapped_column(String(64), nullable=False)
 
-    entity: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
-    entity_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
+    entity: Mapped[str] = mapped_column(String(64), nullable=False)
+    entity_id: Mapped[str] = mapped_column(String(128), nullable=False)
 
     meta: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=utcnow)
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, default=utcnow, server_default=text("now()")
+    )
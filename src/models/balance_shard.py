@@ -0,0 +1,21 @@
+# src/models/balance_shard.py
+from sqlalchemy import Column, ForeignKey, Numeric, SmallInteger
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.db.base import Base
+
+
+class BalanceShard(Base):
+    """
+    Issiq (sharded) hisob balansining bir bo'lagi. users.balance_shards > 0 bo'lsa
+    haqiqiy balans = users.balance + SUM(balance_shards.balance). Kreditlar
+    tasodifiy shardga tushadi (users qatori lock qilinmaydi), debit va
+    compaction shardlarni users.balance ga yig'adi.
+    """
+
+    __tablename__ = "balance_shards"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, autoincrement=False)
+
+    balance = Column(Numeric(20, 8), nullable=False, default=0)
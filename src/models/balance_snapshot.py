@@ -0,0 +1,30 @@
+# src/models/balance_snapshot.py
+from sqlalchemy import BigInteger, Column, DateTime, Integer, Numeric, String, func
+
+from src.db.base import Base
+
+
+class BalanceSnapshot(Base):
+    """
+    block_index balandligidagi manzil balansi. Har snapshot run faqat oldingi
+    rundan beri o'zgargan manzillarni yozadi, shuning uchun manzilning eng
+    oxirgi snapshoti = uning oxirgi run balandligidagi balansi.
+    """
+
+    __tablename__ = "balance_snapshots"
+
+    address = Column(String(64), primary_key=True)
+    block_index = Column(BigInteger, primary_key=True, autoincrement=False)
+
+    balance = Column(Numeric(20, 8), nullable=False)
+
+
+class BalanceSnapshotRun(Base):
+    """Qaysi balandliklarda snapshot olingan (PK — parallel runlar to'qnashmasin)."""
+
+    __tablename__ = "balance_snapshot_runs"
+
+    block_index = Column(BigInteger, primary_key=True, autoincrement=False)
+    addresses = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
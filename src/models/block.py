@@ -0,0 +1,24 @@
+# src/models/block.py
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, func
+
+from src.db.base import Base
+
+
+class Block(Base):
+    """
+    Block header. Bitta blockda 1..N transaction bo'lishi mumkin
+    (transactions.block_index + block_pos orqali bog'lanadi).
+    block_hash = sha256(block_index|prev_hash|merkle_root)
+    """
+
+    __tablename__ = "blocks"
+
+    block_index = Column(BigInteger, primary_key=True, autoincrement=False)
+
+    prev_hash = Column(String(255), nullable=False)
+    # unique: explorer /tx/{block_hash} shu indeks orqali (transactions.block_hash indekssiz)
+    block_hash = Column(String(255), nullable=False, unique=True, index=True)
+    merkle_root = Column(String(64), nullable=False)  # services/merkle.py
+    tx_count = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
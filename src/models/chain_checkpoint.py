@@ -0,0 +1,23 @@
+# src/models/chain_checkpoint.py
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, func
+
+from src.db.base import Base
+
+
+CHECKPOINT_ID = 1
+
+
+class ChainCheckpoint(Base):
+    """
+    verify_chain oxirgi marta 1..block_index oralig'ini xatosiz tekshirgan joy.
+    Keyingi inkremental tekshiruv shu yerdan davom etadi.
+    """
+
+    __tablename__ = "chain_checkpoint"
+
+    id = Column(Integer, primary_key=True, default=CHECKPOINT_ID)
+
+    block_index = Column(BigInteger, nullable=False, default=0)
+    block_hash = Column(String(255), nullable=False, default="GENESIS")
+
+    verified_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,24 @@
+# src/models/chain_head.py
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, func
+
+from src.db.base import Base
+
+
+CHAIN_HEAD_ID = 1
+
+
+class ChainHead(Base):
+    """
+    Zanjir uchi (tip) uchun bitta qator.
+    build_block shu qatorni FOR UPDATE bilan lock qiladi, shuning uchun
+    bir vaqtda kelgan transferlar bir xil block_index ololmaydi.
+    """
+
+    __tablename__ = "chain_head"
+
+    id = Column(Integer, primary_key=True, default=CHAIN_HEAD_ID)
+
+    block_index = Column(BigInteger, nullable=False, default=0)
+    block_hash = Column(String(255), nullable=False, default="GENESIS")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
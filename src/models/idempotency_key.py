@@ -0,0 +1,27 @@
+# src/models/idempotency_key.py
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Idempotency-Key header bo'yicha saqlangan javob (tx/create, tx/batch).
+    status_code NULL — birinchi so'rov hali ishlayapti (takrorlar kutadi).
+    Qayta so'rov PK bo'yicha bitta lookup bilan javob oladi, user qatori lock qilinmaydi.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (Index("ix_idempotency_keys_expires_at", "expires_at"),)
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    key = Column(String(255), primary_key=True)
+
+    # so'rov tanasi hashi: bir xil kalit boshqa tana bilan kelsa 422
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
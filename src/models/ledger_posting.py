@@ -0,0 +1,27 @@
+# src/models/ledger_posting.py
+from sqlalchemy import BigInteger, Column, Index, Integer, Numeric, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.db.base import Base
+
+
+class LedgerPosting(Base):
+    """
+    Append-only double-entry yozuv: har bir tx uchun ikkita qator —
+    sender uchun debit (delta < 0) va receiver uchun credit (delta > 0).
+    Bitta tx postinglarining yig'indisi doim 0. UPDATE/DELETE qilinmaydi.
+    """
+
+    __tablename__ = "ledger_postings"
+    __table_args__ = (
+        Index("ix_ledger_postings_address_block", "address", "block_index"),
+    )
+
+    tx_id = Column(UUID(as_uuid=True), primary_key=True)
+    entry = Column(String(6), primary_key=True)  # debit / credit
+
+    block_index = Column(BigInteger, nullable=False, index=True)
+    block_pos = Column(Integer, nullable=False)
+
+    address = Column(String(64), nullable=False)
+    delta = Column(Numeric(20, 8), nullable=False)
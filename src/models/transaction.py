@@ -1,6 +1,6 @@
 # src/models/transaction.py
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, func
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Numeric, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 
 from src.db.base import Base
@@ -8,6 +8,10 @@ from src.db.base import Base
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # bitta block ichida tx tartibi (merkle_root shu tartibda hisoblanadi)
+        UniqueConstraint("block_index", "block_pos", name="uq_transactions_block_pos"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -17,11 +21,18 @@ class Transaction(Base):
         nullable=False
     )
 
+    from_address = Column(String(64), nullable=False)
+    to_address = Column(String(64), nullable=False)
+
     amount = Column(Numeric(20, 8), nullable=False)
-    tx_type = Column(String(20), nullable=False)  # deposit/withdraw/transfer
+    tx_type = Column(String(20), nullable=False, default="transfer")  # deposit/withdraw/transfer
 
-    block_index = Column(String(100), nullable=True)
+    # String emas, BigInteger: "9" > "10" kabi leksik sort bo'lmasin
+    block_index = Column(BigInteger, nullable=True, index=True)  # -> blocks.block_index
+    block_pos = Column(Integer, nullable=True)
     prev_hash = Column(String(255), nullable=True)
     block_hash = Column(String(255), nullable=True)
 
+    tx_hash = Column(String(64), nullable=True, unique=True, index=True)
+
     created_at = Column(DateTime(timezone=False), server_default=func.now(), nullable=False)
@@ -29,6 +29,8 @@ class User(Base):
     address: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
 
     balance: Mapped[Decimal] = mapped_column(Numeric(20, 8), nullable=False, default=Decimal("0"))
+    # >0: kreditlar balance_shards ga tushadi (services/balance_shards.py); 0 — oddiy hisob
+    balance_shards: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     is_frozen: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
@@ -3,13 +3,36 @@ from __future__ import annotations
 
 import os
 import secrets
-from fastapi import APIRouter, Depends, HTTPException, Header
+import threading
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from src.db.session import get_db
-from src.models.user import User
-from src.models.audit_log import AuditLog
-from src.services.audit import audit_log
+from src.db.pool import pool_stats
+from src.db.retry import tx_retry
+from src.db.session import SessionLocal, engine, get_db
+from src.services.audit import AUDIT_PAGE_DEFAULT, AUDIT_PAGE_MAX, audit_log, audit_view, audit_writer_stats
+from src.services.balance_shards import compact, set_shards
+from src.services.block_cache import block_cache
+from src.services.chain_verify import verify_chain
+from src.services.chain_verify_parallel import verify_chain_parallel
+from src.services.ledger import reconcile, take_snapshot
+from src.services.password_hasher import get_hasher
+from src.services.principal_cache import principal_cache
+from src.services.stream import broker as stream_broker
+from src.services.users import set_frozen
+from src.services.export import (
+    AUDIT_FIELDS,
+    TX_FIELDS,
+    iter_audit,
+    iter_transactions,
+    parse_audit_token,
+    parse_tx_token,
+    stream_export,
+)
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
 
@@ -31,37 +54,177 @@ def admin_login(password: str):
 
 @router.post("/freeze/{email}")
 def freeze_user(email: str, db: Session = Depends(get_db), _: None = Depends(require_admin)):
-    u = db.query(User).filter(User.email == email.lower().strip()).first()
-    if not u:
-        raise HTTPException(status_code=404, detail="User not found")
-    u.is_frozen = True
-    db.commit()
-    audit_log(db, actor="ADMIN", action="ADMIN_FREEZE", entity="users", entity_id=str(u.id), meta={"email": u.email})
-    return {"detail": "Frozen", "email": u.email}
+    email = set_frozen(db, email, True)
+    return {"detail": "Frozen", "email": email}
 
 
 @router.post("/unfreeze/{email}")
 def unfreeze_user(email: str, db: Session = Depends(get_db), _: None = Depends(require_admin)):
-    u = db.query(User).filter(User.email == email.lower().strip()).first()
-    if not u:
-        raise HTTPException(status_code=404, detail="User not found")
-    u.is_frozen = False
-    db.commit()
-    audit_log(db, actor="ADMIN", action="ADMIN_UNFREEZE", entity="users", entity_id=str(u.id), meta={"email": u.email})
-    return {"detail": "Unfrozen", "email": u.email}
+    email = set_frozen(db, email, False)
+    return {"detail": "Unfrozen", "email": email}
 
 
 @router.get("/audit", response_model=list[dict])
-def audit_latest(db: Session = Depends(get_db), _: None = Depends(require_admin)):
-    rows = db.query(AuditLog).order_by(AuditLog.created_at.desc()).limit(100).all()
-    return [
-        {
-            "actor": r.actor,
-            "action": r.action,
-            "entity": r.entity,
-            "entity_id": r.entity_id,
-            "meta": r.meta,
-            "created_at": str(r.created_at),
-        }
-        for r in rows
-    ]
+def audit_latest(
+    response: Response,
+    actor: str | None = None,
+    action: str | None = None,
+    entity: str | None = None,
+    entity_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    before: str | None = None,
+    limit: int = Query(default=AUDIT_PAGE_DEFAULT, ge=1, le=AUDIT_PAGE_MAX),
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin),
+):
+    """Yangidan eskiga; keyingi sahifa: X-Next-Before headerdagi qiymatni ?before= ga bering."""
+    rows, next_token = audit_view(
+        db, before, limit, actor=actor, action=action, entity=entity, entity_id=entity_id, since=since, until=until,
+    )
+    if next_token:
+        response.headers["X-Next-Before"] = next_token
+    return rows
+
+
+@router.get("/cache/principals")
+def principal_cache_stats(_: None = Depends(require_admin)):
+    return principal_cache.stats()
+
+
+@router.get("/cache/blocks")
+def block_cache_stats(_: None = Depends(require_admin)):
+    return block_cache.stats()
+
+
+@router.get("/stream")
+def stream_stats(_: None = Depends(require_admin)):
+    return stream_broker.stats()
+
+
+@router.get("/auth/hasher")
+def password_hasher_stats(_: None = Depends(require_admin)):
+    return get_hasher().stats()
+
+
+@router.get("/audit/writer")
+def audit_writer(_: None = Depends(require_admin)):
+    return audit_writer_stats()
+
+
+@router.get("/db/pool")
+def db_pool_stats(_: None = Depends(require_admin)):
+    from src.db.async_session import async_engine_started, get_async_engine
+
+    out = {"sync": pool_stats(engine)}
+    if async_engine_started():
+        out["async"] = pool_stats(get_async_engine().sync_engine)
+    return out
+
+
+@router.get("/db/retries")
+def db_retry_stats(_: None = Depends(require_admin)):
+    return tx_retry.stats()
+
+
+# -------------------- Sharded balans --------------------
+@router.post("/accounts/{email}/shards")
+def account_shards(email: str, n: int = 8, db: Session = Depends(get_db), _: None = Depends(require_admin)):
+    """Issiq hisobni n ta balans shardiga bo'lish; n=0 — oddiy hisobga qaytarish."""
+    out = set_shards(db, email, n)
+    audit_log(db, actor="ADMIN", action="ADMIN_BALANCE_SHARDS", entity="users", entity_id=out["email"], meta={"shards": n})
+    return out
+
+
+@router.post("/accounts/compact")
+def accounts_compact(db: Session = Depends(get_db), _: None = Depends(require_admin)):
+    return compact(db)
+
+
+# -------------------- Ledger --------------------
+@router.post("/ledger/snapshot")
+def ledger_snapshot(db: Session = Depends(get_db), _: None = Depends(require_admin)):
+    return take_snapshot(db)
+
+
+@router.get("/ledger/reconcile")
+def ledger_reconcile(limit: int = 100, db: Session = Depends(get_db), _: None = Depends(require_admin)):
+    return reconcile(db, limit=min(max(limit, 1), 1000))
+
+
+# ?parallel=1: bir vaqtda bitta process pool (VERIFY_WORKERS ta process)
+_parallel_verify = threading.Lock()
+
+
+@router.post("/verify-chain")
+def admin_verify_chain(
+    from_index: int | None = Query(default=None, alias="from", ge=1),
+    to_index: int | None = Query(default=None, alias="to", ge=1),
+    full: bool = False,
+    parallel: bool = False,
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin),
+):
+    """
+    Explorer dagi GET bilan bir xil, lekin xatosiz qism chain_checkpoint ga yoziladi.
+    ?parallel=1 — segmentlar VERIFY_WORKERS ta processda; band bo'lsa 503.
+    """
+    if not parallel:
+        return verify_chain(db, from_index=from_index, to_index=to_index, full=full)
+    if not _parallel_verify.acquire(blocking=False):
+        raise HTTPException(status_code=503, detail="Parallel verify already running")
+    try:
+        return verify_chain_parallel(db, from_index=from_index, to_index=to_index, full=full)
+    finally:
+        _parallel_verify.release()
+
+
+# -------------------- Export (compliance) --------------------
+_MEDIA = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _export_response(name: str, fmt: str, rows_fn, fields: list[str], **filters) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(SessionLocal, rows_fn, fields, fmt, **filters),
+        media_type=_MEDIA[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@router.get("/export/transactions")
+def export_transactions(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    address: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    after: str | None = None,
+    _: None = Depends(require_admin),
+):
+    """
+    Server-side cursor dan oqim (xotira — bitta chunk). Har qatorda "cursor" bor:
+    uzilib qolsa oxirgi olingan qatorning cursorini ?after= ga bering.
+    """
+    # token stream boshlanishidan oldin tekshiriladi (keyin 400 qaytarib bo'lmaydi)
+    after_key = parse_tx_token(after)
+    return _export_response(
+        "transactions", format, iter_transactions, TX_FIELDS,
+        address=address, since=since, until=until, after=after_key,
+    )
+
+
+@router.get("/export/audit")
+def export_audit(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    actor: str | None = None,
+    action: str | None = None,
+    entity: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    after: str | None = None,
+    _: None = Depends(require_admin),
+):
+    after_key = parse_audit_token(after)
+    return _export_response(
+        "audit_logs", format, iter_audit, AUDIT_FIELDS,
+        actor=actor, action=action, entity=entity, since=since, until=until, after=after_key,
+    )
@@ -0,0 +1,23 @@
+# backend/src/routers/aio/__init__.py
+"""
+AsyncSession ustidagi routerlar. override() async routerdagi (path, method)
+larni sync routerdan olib tashlaydi — qolganlari (verify, export, ...) sync
+holicha ishlayveradi.
+"""
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+
+
+def override(async_router: APIRouter, sync_router: APIRouter) -> APIRouter:
+    taken = {
+        (r.path, m) for r in async_router.routes if isinstance(r, APIRoute) for m in r.methods
+    }
+    merged = APIRouter()
+    merged.routes.extend(async_router.routes)
+    merged.routes.extend(
+        r for r in sync_router.routes
+        if not (isinstance(r, APIRoute) and any((r.path, m) in taken for m in r.methods))
+    )
+    return merged
@@ -0,0 +1,53 @@
+# backend/src/routers/aio/admin.py
+"""
+Admin endpointlarining async variantlari. Export/ledger/verify kabi uzoq
+ishlaydiganlari sync routerda qoladi (threadpool).
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.async_session import get_async_db
+from src.routers.admin import require_admin
+from src.services.audit import AUDIT_PAGE_DEFAULT, AUDIT_PAGE_MAX, audit_view
+from src.services.users import set_frozen
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+@router.post("/freeze/{email}")
+async def freeze_user_async(email: str, db: AsyncSession = Depends(get_async_db), _: None = Depends(require_admin)):
+    email = await db.run_sync(set_frozen, email, True)
+    return {"detail": "Frozen", "email": email}
+
+
+@router.post("/unfreeze/{email}")
+async def unfreeze_user_async(email: str, db: AsyncSession = Depends(get_async_db), _: None = Depends(require_admin)):
+    email = await db.run_sync(set_frozen, email, False)
+    return {"detail": "Unfrozen", "email": email}
+
+
+@router.get("/audit", response_model=list[dict])
+async def audit_latest_async(
+    response: Response,
+    actor: str | None = None,
+    action: str | None = None,
+    entity: str | None = None,
+    entity_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    before: str | None = None,
+    limit: int = Query(default=AUDIT_PAGE_DEFAULT, ge=1, le=AUDIT_PAGE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+    _: None = Depends(require_admin),
+):
+    rows, next_token = await db.run_sync(
+        audit_view, before, limit, actor=actor, action=action, entity=entity, entity_id=entity_id,
+        since=since, until=until,
+    )
+    if next_token:
+        response.headers["X-Next-Before"] = next_token
+    return rows
@@ -0,0 +1,81 @@
+# backend/src/routers/aio/explorer.py
+"""
+Explorer o'qishlari AsyncSession da (ASYNC_DB_ENABLED=1). verify-chain CPU
+og'ir bo'lgani uchun sync routerda qoladi (threadpool, event loop bloklanmaydi).
+"""
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.db.async_session import get_async_db
+from src.services.activity import PAGE_DEFAULT, PAGE_MAX
+from src.services.block_cache import block_cache
+from src.services.explorer import address_txs, balance_view, block_view, proof_view, tx_view
+
+router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/explorer", tags=["explorer"])
+
+
+@router.get("/tx/{block_hash}")
+async def get_tx_async(
+    block_hash: str,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # cache da bo'lsa 200/304 DB siz (sync route bilan bir xil)
+    key = f"tx:{block_hash}"
+    hit = block_cache.lookup(key, if_none_match)
+    if hit is not None:
+        return hit
+    # servis o'sha ulanishda (greenlet) ishlaydi — SQL sync route bilan bir xil
+    return block_cache.respond(key, *await db.run_sync(tx_view, block_hash), if_none_match)
+
+
+@router.get("/tx/{tx_hash}/proof")
+async def get_tx_proof_async(
+    tx_hash: str,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    key = f"proof:{tx_hash}"
+    hit = block_cache.lookup(key, if_none_match)
+    if hit is not None:
+        return hit
+    return block_cache.respond(key, *await db.run_sync(proof_view, tx_hash), if_none_match)
+
+
+@router.get("/block/{block_index}")
+async def get_block_async(
+    block_index: int,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    key = f"block:{block_index}"
+    hit = block_cache.lookup(key, if_none_match)
+    if hit is not None:
+        return hit
+    return block_cache.respond(key, *await db.run_sync(block_view, block_index), if_none_match)
+
+
+@router.get("/address/{address}")
+async def list_by_address_async(
+    address: str,
+    response: Response,
+    before: str | None = None,
+    limit: int = Query(default=PAGE_DEFAULT, ge=1, le=PAGE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows, next_cursor = await db.run_sync(address_txs, address, before, limit)
+    if next_cursor:
+        response.headers["X-Next-Before"] = next_cursor
+    return rows
+
+
+@router.get("/address/{address}/balance")
+async def address_balance_async(
+    address: str,
+    at: int | None = Query(default=None, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(balance_view, address, at)
@@ -0,0 +1,89 @@
+# backend/src/routers/aio/tx.py
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.db.async_session import get_async_db
+from src.db.retry import tx_retry
+from src.deps.auth import get_current_principal_async
+from src.schemas.transaction import TxBatchIn, TxBatchOut, TxCreate, TxOut
+from src.services.activity import PAGE_DEFAULT, PAGE_MAX, address_page
+from src.services.idempotency import fingerprint, run_idempotent_async
+from src.services.mempool import PendingTx, submit_and_wait_async
+from src.services.metrics import track_transfer
+from src.services.principal_cache import Principal
+from src.services.transfer import parse_transfer, transfer_batch, tx_errors
+from src.services.transfer_core import run_transfer
+
+router = APIRouter(prefix="/api/v1/tx", tags=["transactions"])
+
+
+@router.post("/create", response_model=TxOut)
+async def create_tx_async(
+    payload: TxCreate,
+    idempotency_key: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal_async),
+):
+    if idempotency_key is None:
+        return await _create_tx(payload, db, user)
+    return await run_idempotent_async(db, user.id, idempotency_key, fingerprint("tx/create", payload), TxOut,
+                                      lambda: _create_tx(payload, db, user))
+
+
+async def _create_tx(payload: TxCreate, db: AsyncSession, user: Principal):
+    with track_transfer("single"):
+        return await _create_tx_inner(payload, db, user)
+
+
+async def _create_tx_inner(payload: TxCreate, db: AsyncSession, user: Principal):
+    amount, to_addr = parse_transfer(payload)
+
+    if settings.BLOCK_PRODUCER_ENABLED:
+        # kutish paytida na thread, na DB connection band
+        item = PendingTx(sender_id=user.id, actor=user.email, to_address=to_addr, amount=amount)
+        return await submit_and_wait_async(item, settings.MEMPOOL_WAIT_SECONDS)
+
+    # sync route bilan aynan bir xil tranzaksiya va lock tartibi (run_sync);
+    # retry kutishi asyncio.sleep — event loop bloklanmaydi
+    with tx_errors():
+        return await tx_retry.run_async(db.run_sync, run_transfer, user.id, user.email, to_addr, amount)
+
+
+@router.post("/batch", response_model=TxBatchOut)
+async def create_tx_batch_async(
+    payload: TxBatchIn,
+    idempotency_key: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal_async),
+):
+    if idempotency_key is None:
+        return await _create_tx_batch(payload, db, user)
+    return await run_idempotent_async(db, user.id, idempotency_key, fingerprint("tx/batch", payload), TxBatchOut,
+                                      lambda: _create_tx_batch(payload, db, user))
+
+
+async def _create_tx_batch(payload: TxBatchIn, db: AsyncSession, user: Principal):
+    with track_transfer("batch"):
+        return await _create_tx_batch_inner(payload, db, user)
+
+
+async def _create_tx_batch_inner(payload: TxBatchIn, db: AsyncSession, user: Principal):
+    with tx_errors():
+        return await tx_retry.run_async(db.run_sync, transfer_batch, user.id, user.email, payload.items, payload.mode == "atomic")
+
+
+@router.get("/history", response_model=list[TxOut])
+async def history_async(
+    response: Response,
+    before: str | None = None,
+    limit: int = Query(default=PAGE_DEFAULT, ge=1, le=PAGE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(get_current_principal_async),
+):
+    rows, next_cursor = await db.run_sync(address_page, user.address, before, limit)
+    if next_cursor:
+        response.headers["X-Next-Before"] = next_cursor
+    return rows
@@ -0,0 +1,22 @@
+# backend/src/routers/aio/users.py
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.async_session import get_async_db
+from src.deps.auth import get_current_principal_async
+from src.schemas.user import UserOut
+from src.services.principal_cache import Principal
+from src.services.users import account_view, load_user
+
+router = APIRouter(prefix="/api/v1/users", tags=["users"])
+
+
+@router.get("/me", response_model=UserOut)
+async def me_async(
+    principal: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # balans o'zgaruvchan — PK bo'yicha o'qiladi (sync get_current_user + me bilan bir xil)
+    return await db.run_sync(lambda s: account_view(s, load_user(s, principal)))
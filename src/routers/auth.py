@@ -1,17 +1,17 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr, Field
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from src.db.session import get_db
-from src.db.models import User
-
-from src.services.security import (
-    get_password_hash,
-    verify_password,
-    create_access_token,
-)
+from src.models.user import User
+from src.services.password_hasher import get_hasher
+from src.services.security import create_access_token, new_address
 
 router = APIRouter(prefix="/api/v1/auth", tags=["auth"])
 
@@ -33,36 +33,63 @@ class TokenOut(BaseModel):
 
 
 # -------------------- Endpoints --------------------
+# Handlerlar async: bcrypt alohida executorda (services/password_hasher.py),
+# qisqa DB ishlari threadpoolda — shared threadpool hash kutib band bo'lmaydi.
+# Har DB qadami tranzaksiyani yopib chiqadi: hash kutilayotganda ulanish pool ga
+# qaytgan bo'ladi (hasher navbati pooldan katta — login to'lqini /tx ni bo'g'masin).
+def _find_user(db: Session, email: str) -> Optional[Row]:
+    """(id, email, password_hash) yoki None."""
+    try:
+        return db.query(User.id, User.email, User.password_hash).filter(User.email == email).first()
+    finally:
+        db.rollback()
+
+
+def _create_user(db: Session, email: str, password_hash: str) -> bool:
+    try:
+        if db.query(User.id).filter(User.email == email).first():
+            return False
+        db.add(User(email=email, password_hash=password_hash, address=new_address()))
+        db.commit()
+        return True
+    finally:
+        db.rollback()
+
+
+def _save_rehash(db: Session, user_id, password_hash: str) -> None:
+    try:
+        db.query(User).filter(User.id == user_id).update({User.password_hash: password_hash})
+        db.commit()
+    finally:
+        db.rollback()
+
+
 @router.post("/register", status_code=200)
-def register(payload: RegisterIn, db: Session = Depends(get_db)):
+async def register(payload: RegisterIn, db: Session = Depends(get_db)):
     email = payload.email.lower().strip()
 
-    exists = db.query(User).filter(User.email == email).first()
-    if exists:
+    # hashdan oldin arzon tekshiruv: band emailga executor vaqti sarflanmasin
+    if await run_in_threadpool(_find_user, db, email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    user = User(
-        email=email,
-        hashed_password=get_password_hash(payload.password),
-        # Agar modelda boshqa required field bo‘lsa, shu yerga qo‘shib qo‘ying.
-        # masalan: is_active=True
-    )
-
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    password_hash = await get_hasher().hash(payload.password)
+    if not await run_in_threadpool(_create_user, db, email, password_hash):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
 
     return {"message": "registered"}
 
 
 @router.post("/login", response_model=TokenOut, status_code=200)
-def login(payload: LoginIn, db: Session = Depends(get_db)):
+async def login(payload: LoginIn, db: Session = Depends(get_db)):
     email = payload.email.lower().strip()
 
-    user = db.query(User).filter(User.email == email).first()
+    user = await run_in_threadpool(_find_user, db, email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -70,14 +97,18 @@ def login(payload: LoginIn, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not verify_password(payload.password, user.hashed_password):
+    ok, new_hash = await get_hasher().verify_and_update(payload.password, user.password_hash)
+    if not ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # eski cost -> joriy PASSWORD_BCRYPT_ROUNDS
+        await run_in_threadpool(_save_rehash, db, user.id, new_hash)
 
     # ✅ MUHIM: /users/me 401 bo‘lmasligi uchun JWT ichida sub DOIM bo‘lsin
     token = create_access_token(subject=user.email)
 
-    return {"access_token": token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": token, "token_type": "bearer"}
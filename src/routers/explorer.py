@@ -1,53 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from src.core.config import settings
-from src.db.session import get_db
-from src.models.transaction import Transaction
-from src.services.chain_verify import verify_chain
+from src.db.session import SessionLocal, get_db
+from src.services.activity import PAGE_DEFAULT, PAGE_MAX
+from src.services.block_cache import block_cache
+from src.services.chain_verify import verify_chain, verify_chain_iter
+from src.services.explorer import address_txs, balance_view, block_view, proof_view, tx_view
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/explorer", tags=["explorer"])
 
 
 @router.get("/tx/{block_hash}")
-def get_tx(block_hash: str, db: Session = Depends(get_db)):
-    tx = db.query(Transaction).filter(Transaction.block_hash == block_hash).first()
-    if not tx:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-    return {
-        "block_index": tx.block_index,
-        "block_hash": tx.block_hash,
-        "prev_hash": tx.prev_hash,
-        "from_address": tx.from_address,
-        "to_address": tx.to_address,
-        "amount": str(tx.amount),
-        "created_at": str(tx.created_at),
-    }
+def get_tx(block_hash: str, if_none_match: str | None = Header(default=None), db: Session = Depends(get_db)):
+    # yopilgan tx o'zgarmaydi: cache da bo'lsa 200/304 DB siz (services/block_cache.py)
+    key = f"tx:{block_hash}"
+    hit = block_cache.lookup(key, if_none_match)
+    if hit is not None:
+        return hit
+    return block_cache.respond(key, *tx_view(db, block_hash), if_none_match)
+
+
+@router.get("/tx/{tx_hash}/proof")
+def get_tx_proof(tx_hash: str, if_none_match: str | None = Header(default=None), db: Session = Depends(get_db)):
+    """
+    Merkle inclusion proof. Tekshirish (light client):
+      acc = sha256(0x00 || tx_hash)
+      har bir qadam: side == "left" -> sha256(0x01 || hash || acc), aks holda sha256(0x01 || acc || hash)
+      acc == merkle_root va block_hash == sha256(f"{block_index}|{prev_hash}|{merkle_root}")
+    """
+    key = f"proof:{tx_hash}"
+    hit = block_cache.lookup(key, if_none_match)
+    if hit is not None:
+        return hit
+    return block_cache.respond(key, *proof_view(db, tx_hash), if_none_match)
+
+
+@router.get("/block/{block_index}")
+def get_block(block_index: int, if_none_match: str | None = Header(default=None), db: Session = Depends(get_db)):
+    # ETag = block_hash: cache da bo'lsa DB siz, aks holda bitta o'qishdan keyin
+    key = f"block:{block_index}"
+    hit = block_cache.lookup(key, if_none_match)
+    if hit is not None:
+        return hit
+    return block_cache.respond(key, *block_view(db, block_index), if_none_match)
 
 
 @router.get("/address/{address}")
-def list_by_address(address: str, db: Session = Depends(get_db)):
-    rows = (
-        db.query(Transaction)
-        .filter((Transaction.from_address == address) | (Transaction.to_address == address))
-        .order_by(Transaction.block_index.desc())
-        .limit(50)
-        .all()
-    )
-    return [
-        {
-            "block_index": r.block_index,
-            "block_hash": r.block_hash,
-            "prev_hash": r.prev_hash,
-            "from_address": r.from_address,
-            "to_address": r.to_address,
-            "amount": str(r.amount),
-            "created_at": str(r.created_at),
-        }
-        for r in rows
-    ]
+def list_by_address(
+    address: str,
+    response: Response,
+    before: str | None = None,
+    limit: int = Query(default=PAGE_DEFAULT, ge=1, le=PAGE_MAX),
+    db: Session = Depends(get_db),
+):
+    # keyingi sahifa: X-Next-Before headerdagi qiymatni ?before= ga bering
+    rows, next_cursor = address_txs(db, address, before, limit)
+    if next_cursor:
+        response.headers["X-Next-Before"] = next_cursor
+    return rows
+
+
+@router.get("/address/{address}/balance")
+def address_balance(
+    address: str,
+    at: int | None = Query(default=None, ge=0),
+    db: Session = Depends(get_db),
+):
+    # ?at=<block_index> — o'sha blockdan keyingi holat (sukut: hozirgi head)
+    return balance_view(db, address, at)
+
+
+def _verify_ndjson(from_index, to_index, full):
+    # StreamingResponse javob yuborilayotganda ishlaydi — o'z sessiyamiz bilan
+    db = SessionLocal()
+    try:
+        for event in verify_chain_iter(db, from_index=from_index, to_index=to_index, full=full, save_checkpoint=False):
+            yield json.dumps(event) + "\n"
+    finally:
+        db.close()
 
 
 @router.get("/verify-chain")
-def verify(db: Session = Depends(get_db)):
-    return verify_chain(db)
+def verify(
+    from_index: int | None = Query(default=None, alias="from", ge=1),
+    to_index: int | None = Query(default=None, alias="to", ge=1),
+    full: bool = False,
+    progress: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    default: checkpointdan keyingi yangi blocklar; ?full=1 — hammasi qaytadan;
+    ?from=&to= — oraliq; ?progress=1 — NDJSON oqim (progress qatorlari + result).
+    Faqat o'qiydi: checkpointni (va ?parallel=1 ni) POST /admin/verify-chain bajaradi.
+    """
+    if progress:
+        db.close()
+        return StreamingResponse(_verify_ndjson(from_index, to_index, full), media_type="application/x-ndjson")
+    return verify_chain(db, from_index=from_index, to_index=to_index, full=full, save_checkpoint=False)
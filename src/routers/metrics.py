@@ -0,0 +1,26 @@
+# backend/src/routers/metrics.py
+"""
+GET /metrics — Prometheus scrape (services/metrics.py).
+METRICS_TOKEN berilsa: Authorization: Bearer <token> (prometheus.yml: authorization.credentials).
+"""
+from __future__ import annotations
+
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, Response
+
+from src.core.config import settings
+from src.services.metrics import CONTENT_TYPE, collect_all, render
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(authorization: str | None = Header(default=None)):
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics disabled")
+    if settings.METRICS_TOKEN and not (
+        authorization and secrets.compare_digest(authorization, f"Bearer {settings.METRICS_TOKEN}")
+    ):
+        raise HTTPException(status_code=401, detail="Metrics unauthorized")
+    return Response(content=render(collect_all()), media_type=CONTENT_TYPE)
@@ -0,0 +1,105 @@
+# backend/src/routers/stream.py
+"""
+Push kanal (services/stream.py):
+  GET /api/v1/stream/blocks — SSE, yangi blocklar (ochiq)
+  GET /api/v1/stream/me     — SSE, Bearer token egasining tx/balans eventlari
+  WS  /api/v1/stream/ws?token=&blocks=1 — ikkalasi bitta WebSocketda
+     (brauzer WebSocketga header qo'ya olmaydi — token query da)
+Sekin klient bufferi to'lsa "lagged" event oladi va ulanish yopiladi.
+"""
+from __future__ import annotations
+
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.core.config import settings
+from src.deps.auth import get_current_principal, principal_from_token
+from src.services.principal_cache import Principal
+from src.services.stream import BLOCKS, Lagged, addr_topic, broker
+
+router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/stream", tags=["stream"])
+
+
+def _sse(ev: dict) -> str:
+    return f"event: {ev['type']}\ndata: {json.dumps(ev)}\n\n"
+
+
+async def _sse_events(topics: set[str]):
+    # obuna body boshlanganda: klient undan oldin uzilsa generator ishga tushmaydi — oqadigan subscriber yo'q
+    try:
+        sub = broker.subscribe(topics)
+    except HTTPException:
+        # pre-check bilan shu orada limit to'ldi — bo'sh javob, klient retry qiladi
+        return
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                ev = await sub.next(settings.STREAM_KEEPALIVE_SECONDS)
+            except Lagged:
+                yield _sse({"type": "lagged"})
+                return
+            # keepalive: proxy/LB bo'sh ulanishni uzmasin
+            yield ": ping\n\n" if ev is None else _sse(ev)
+    finally:
+        sub.close()
+
+
+def _sse_response(topics: set[str]) -> StreamingResponse:
+    if not settings.STREAM_ENABLED:
+        raise HTTPException(status_code=404, detail="Stream disabled")
+    # limit oshsa 503 shu yerda (ro'yxatga olinmaydi)
+    broker.check_capacity()
+    return StreamingResponse(
+        _sse_events(topics),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/blocks")
+async def stream_blocks():
+    return _sse_response({BLOCKS})
+
+
+@router.get("/me")
+async def stream_me(user: Principal = Depends(get_current_principal)):
+    return _sse_response({addr_topic(user.address)})
+
+
+@router.websocket("/ws")
+async def stream_ws(ws: WebSocket, token: str | None = None, blocks: bool = True):
+    if not settings.STREAM_ENABLED:
+        await ws.close(code=1008)
+        return
+    topics = {BLOCKS} if blocks else set()
+    if token:
+        try:
+            user = await run_in_threadpool(principal_from_token, token)
+        except HTTPException:
+            await ws.close(code=1008)
+            return
+        topics.add(addr_topic(user.address))
+    try:
+        sub = broker.subscribe(topics)
+    except HTTPException:
+        await ws.close(code=1013)
+        return
+
+    try:
+        await ws.accept()
+        while True:
+            try:
+                ev = await sub.next(settings.STREAM_KEEPALIVE_SECONDS)
+            except Lagged:
+                await ws.send_json({"type": "lagged"})
+                await ws.close(code=1013)
+                return
+            await ws.send_json(ev if ev is not None else {"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sub.close()
@@ -1,88 +1,104 @@
 # backend/src/routers/tx.py
 from __future__ import annotations
 
-from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from src.core.config import settings
+from src.db.retry import tx_retry
 from src.db.session import get_db
-from src.deps.auth import get_current_user
+from src.deps.auth import get_current_principal
 from src.models.user import User
 from src.models.transaction import Transaction
 
-from src.schemas.transaction import TxCreate, TxOut
-from src.services.blockchain import build_block
-from src.services.audit import audit_log
+from src.schemas.transaction import TxBatchIn, TxBatchOut, TxCreate, TxOut
+from src.services.activity import PAGE_DEFAULT, PAGE_MAX, address_page
+from src.services.idempotency import fingerprint, run_idempotent
+from src.services.mempool import PendingTx, submit_and_wait
+from src.services.metrics import track_transfer
+from src.services.principal_cache import Principal
+from src.services.transfer import parse_transfer, transfer_batch, tx_errors
+from src.services.transfer_core import run_transfer
 
 router = APIRouter(prefix="/api/v1/tx", tags=["transactions"])
 
 
 @router.post("/create", response_model=TxOut)
-def create_tx(payload: TxCreate, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    if user.is_frozen:
-        raise HTTPException(status_code=403, detail="Account is frozen")
+def create_tx(
+    payload: TxCreate,
+    idempotency_key: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal),
+):
+    # Idempotency-Key: takror so'rov saqlangan javobni oladi (services/idempotency.py)
+    if idempotency_key is None:
+        return _create_tx(payload, db, user)
+    return run_idempotent(db, user.id, idempotency_key, fingerprint("tx/create", payload), TxOut,
+                          lambda: _create_tx(payload, db, user))
+
+
+def _create_tx(payload: TxCreate, db: Session, user: Principal):
+    # natija (ok / insufficient / deadlock / ...) /metrics ga
+    with track_transfer("single"):
+        return _create_tx_inner(payload, db, user)
+
+
+def _create_tx_inner(payload: TxCreate, db: Session, user: Principal):
+    amount, to_addr = parse_transfer(payload)
+
+    if settings.BLOCK_PRODUCER_ENABLED:
+        # mempool rejimi: balans/lock/block producer threadda, bitta commit = bitta block
+        item = PendingTx(sender_id=user.id, actor=user.email, to_address=to_addr, amount=amount)
+        # kutish paytida DB connection band turmasin
+        db.close()
+        return submit_and_wait(item, settings.MEMPOOL_WAIT_SECONDS)
 
-    amount = Decimal(str(payload.amount)).quantize(Decimal("0.00000001"))
-    if amount <= 0:
-        raise HTTPException(status_code=400, detail="Invalid amount")
+    # atomic transaction
+    with tx_errors():
+        # deadlock/serialization -> butun tranzaksiya qayta (jitter, budget), tugasa 503
+        # TX_ENGINE=core: UPDATE ... RETURNING + bitta INSERT CTE (services/transfer_core.py)
+        return tx_retry.run(run_transfer, db, user.id, user.email, to_addr, amount)
 
-    to_addr = payload.to_address.strip()
-    if len(to_addr) < 3:
-        raise HTTPException(status_code=400, detail="Invalid to_address")
 
-    # atomic transaction
-    try:
-        with db.begin():
-            # lock sender row
-            sender = db.query(User).filter(User.id == user.id).with_for_update().one()
-
-            if Decimal(str(sender.balance)) < amount:
-                raise HTTPException(status_code=400, detail="Insufficient balance")
-
-            # find receiver by address
-            receiver = db.query(User).filter(User.address == to_addr).with_for_update().first()
-            if not receiver:
-                raise HTTPException(status_code=404, detail="Receiver not found")
-
-            # build block hashes
-            block_index, prev_hash, block_hash = build_block(db, sender.address, receiver.address, str(amount))
-
-            # update balances
-            sender.balance = (Decimal(str(sender.balance)) - amount)
-            receiver.balance = (Decimal(str(receiver.balance)) + amount)
-
-            tx = Transaction(
-                from_address=sender.address,
-                to_address=receiver.address,
-                amount=str(amount),
-                block_index=block_index,
-                prev_hash=prev_hash,
-                block_hash=block_hash,
-                user_id=sender.id,
-            )
-            db.add(tx)
-
-        audit_log(db, actor=user.email, action="TX_CREATE", entity="transactions", entity_id=str(tx.id), meta={
-            "from": tx.from_address, "to": tx.to_address, "amount": str(amount), "block_index": block_index
-        })
-        db.refresh(tx)
-        return tx
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"TX failed: {type(e).__name__}")
+@router.post("/batch", response_model=TxBatchOut)
+def create_tx_batch(
+    payload: TxBatchIn,
+    idempotency_key: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """
+    Bitta senderdan ko'p transfer: bitta DB tranzaksiya, bitta block.
+    mode=atomic — birinchi xatoda hammasi bekor (detail.index); best_effort — har item o'z natijasi bilan.
+    Mempool rejimida ham to'g'ridan-to'g'ri yoziladi (batch o'zi bitta block).
+    """
+    if idempotency_key is None:
+        return _create_tx_batch(payload, db, user)
+    return run_idempotent(db, user.id, idempotency_key, fingerprint("tx/batch", payload), TxBatchOut,
+                          lambda: _create_tx_batch(payload, db, user))
+
+
+def _create_tx_batch(payload: TxBatchIn, db: Session, user: Principal):
+    with track_transfer("batch"):
+        return _create_tx_batch_inner(payload, db, user)
+
+
+def _create_tx_batch_inner(payload: TxBatchIn, db: Session, user: Principal):
+    with tx_errors():
+        return tx_retry.run(transfer_batch, db, user.id, user.email, payload.items, atomic=payload.mode == "atomic")
 
 
 @router.get("/history", response_model=list[TxOut])
-def history(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    # oxirgi 50 tx (soddaroq)
-    rows = (
-        db.query(Transaction)
-        .filter(Transaction.from_address == user.address)
-        .order_by(Transaction.block_index.desc())
-        .limit(50)
-        .all()
-    )
+def history(
+    response: Response,
+    before: str | None = None,
+    limit: int = Query(default=PAGE_DEFAULT, ge=1, le=PAGE_MAX),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal),
+):
+    # kiruvchi + chiquvchi, yangidan eskiga; keyingi sahifa: ?before=<X-Next-Before>
+    rows, next_cursor = address_page(db, user.address, before=before, limit=limit)
+    if next_cursor:
+        response.headers["X-Next-Before"] = next_cursor
     return rows
@@ -8,10 +8,11 @@ from src.db.session import get_db
 from src.deps.auth import get_current_user
 from src.schemas.user import UserOut
 from src.models.user import User
+from src.services.users import account_view
 
 router = APIRouter(prefix="/api/v1/users", tags=["users"])
 
 
 @router.get("/me", response_model=UserOut)
-def me(user: User = Depends(get_current_user)):
-    return user
+def me(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return account_view(db, user)
@@ -1,9 +1,12 @@
 # backend/src/schemas/transaction.py
 from __future__ import annotations
 
+from typing import Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
+from src.core.config import settings
+
 class TxCreate(BaseModel):
     to_address: str = Field(min_length=3, max_length=128)
     amount: float = Field(gt=0)
@@ -19,3 +22,26 @@ class TxOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TxBatchIn(BaseModel):
+    # atomic: bitta xato -> hech narsa yozilmaydi; best_effort: o'tganlari yoziladi
+    # TX_BATCH_MAX dan ko'p bo'lsa 422 (validatsiya, DB ga tegmaydi)
+    items: list[TxCreate] = Field(min_length=1, max_length=settings.TX_BATCH_MAX)
+    mode: Literal["atomic", "best_effort"] = "atomic"
+
+
+class TxBatchItemOut(BaseModel):
+    index: int
+    ok: bool
+    tx: Optional[TxOut] = None
+    status_code: int = 200
+    error: Optional[str] = None
+
+
+class TxBatchOut(BaseModel):
+    mode: str
+    accepted: int
+    rejected: int
+    block_index: Optional[int] = None
+    results: list[TxBatchItemOut]
@@ -0,0 +1,80 @@
+# backend/src/services/activity.py
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from src.models.address_activity import AddressActivity
+from src.models.transaction import Transaction
+
+PAGE_DEFAULT = 50
+PAGE_MAX = 200
+
+
+def activity_entries(txs: Sequence[Transaction]) -> list[AddressActivity]:
+    """tx lar block_index/block_pos olgandan keyin; sessiyaga qo'shilmaydi (transfer_core ham ishlatadi)."""
+    out = []
+    for tx in txs:
+        if tx.from_address == tx.to_address:
+            rows = [(tx.from_address, "self")]
+        else:
+            rows = [(tx.from_address, "out"), (tx.to_address, "in")]
+        for address, direction in rows:
+            out.append(AddressActivity(
+                address=address,
+                block_index=tx.block_index,
+                block_pos=tx.block_pos,
+                direction=direction,
+                tx_id=tx.id,
+            ))
+    return out
+
+
+def parse_cursor(before: Optional[str]) -> Optional[tuple[int, int]]:
+    """
+    "123"   -> 123-blockdan oldingilar
+    "123:4" -> (123, 4) dan oldingilar (bitta blockda bir nechta tx bo'lsa)
+    """
+    if before is None or before == "":
+        return None
+    try:
+        if ":" in before:
+            bi, bp = before.split(":", 1)
+            return (int(bi), int(bp))
+        return (int(before), -1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def address_page(
+    db: Session,
+    address: str,
+    before: Optional[str] = None,
+    limit: int = PAGE_DEFAULT,
+) -> tuple[list[Transaction], Optional[str]]:
+    """
+    Manzilning kiruvchi va chiquvchi tx lari, yangidan eskiga.
+    Qaytaradi: (tx lar, keyingi sahifa uchun cursor yoki None).
+    """
+    limit = max(1, min(limit, PAGE_MAX))
+    q = (
+        db.query(Transaction, AddressActivity.block_index, AddressActivity.block_pos)
+        .join(AddressActivity, AddressActivity.tx_id == Transaction.id)
+        .filter(AddressActivity.address == address)
+    )
+    cursor = parse_cursor(before)
+    if cursor is not None:
+        q = q.filter(tuple_(AddressActivity.block_index, AddressActivity.block_pos) < tuple_(*cursor))
+
+    rows = (
+        q.order_by(AddressActivity.block_index.desc(), AddressActivity.block_pos.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = f"{rows[-1][1]}:{rows[-1][2]}" if more and rows else None
+    return [r[0] for r in rows], next_cursor
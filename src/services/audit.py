@@ -1,11 +1,61 @@
 # backend/src/services/audit.py
+"""
+Audit yozuvlari.
+
+AUDIT_WRITER_MODE:
+- "queue": audit_log() hodisani chegaralangan navbatga qo'yadi, fon AuditWriter
+  ularni AUDIT_BATCH_SIZE tagacha / har AUDIT_FLUSH_MS da bitta multi-row
+  INSERT bilan yozadi. Navbat to'lsa chaqiruvchi o'zi sync yozadi (yo'qotilmaydi).
+- "sync": eski xatti-harakat — har hodisa uchun alohida commit.
+
+Pul tranzaksiyalari uchun audit_tx(): AUDIT_TX_DURABLE=1 bo'lsa yozuv o'sha DB
+tranzaksiyasiga qo'shiladi (balances + block + audit atomik), aks holda commitdan
+keyin navbatga tushadi.
+"""
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
 
+from sqlalchemy import event, insert, select, tuple_
 from sqlalchemy.orm import Session
 
+from src.core.config import settings
 from src.models.audit_log import AuditLog
+from src.services.export import encode_token, parse_audit_token
+from src.services.workers import drain_batch
+
+logger = logging.getLogger(__name__)
+
+AUDIT_PAGE_DEFAULT = 100
+AUDIT_PAGE_MAX = 500
+
+
+def make_event(actor: str, action: str, entity: str, entity_id: str, meta: Optional[Dict[str, Any]]) -> dict:
+    # id va vaqt hodisa paytida qo'yiladi (yozilish paytida emas)
+    return {
+        "id": uuid.uuid4(),
+        "actor": actor,
+        "action": action,
+        "entity": entity,
+        "entity_id": entity_id,
+        "meta": meta,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def _write_sync(db: Session, ev: dict) -> None:
+    try:
+        db.add(AuditLog(**ev))
+        db.commit()
+    except Exception:
+        # Audit DB sxemasi mos kelmasa ham asosiy funksiyalar yiqilmasin
+        db.rollback()
 
 
 def audit_log(
@@ -16,17 +66,273 @@ def audit_log(
     entity_id: str,
     meta: Optional[Dict[str, Any]] = None,
 ) -> None:
-    try:
-        rec = AuditLog(
-            actor=actor,
-            action=action,
-            entity=entity,
-            entity_id=entity_id,
-            meta=meta,
-        )
-        db.add(rec)
-        db.commit()
-    except Exception:
-        # Audit DB sxemasi mos kelmasa ham asosiy funksiyalar yiqilmasin
-        db.rollback()
-        return
\ No newline at end of file
+    ev = make_event(actor, action, entity, entity_id, meta)
+    if not _enqueue(ev):
+        _write_sync(db, ev)
+
+
+def _enqueue(ev: dict) -> bool:
+    return settings.AUDIT_WRITER_MODE == "queue" and _writer is not None and _writer.submit(ev)
+
+
+def audit_add(
+    db: Session,
+    actor: str,
+    action: str,
+    entity: str,
+    entity_id: str,
+    meta: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    audit_log bilan bir xil, lekin commit qilmaydi: yozuv chaqiruvchining
+    DB tranzaksiyasiga qo'shiladi (tx atomic: balances + block + audit).
+    """
+    db.add(AuditLog(**make_event(actor, action, entity, entity_id, meta)))
+
+
+def audit_tx(
+    db: Session,
+    actor: str,
+    action: str,
+    entity: str,
+    entity_id: str,
+    meta: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Ochiq pul tranzaksiyasi ichidan chaqiriladi (AUDIT_TX_DURABLE ga qarab)."""
+    if settings.AUDIT_TX_DURABLE:
+        audit_add(db, actor, action, entity, entity_id, meta)
+    else:
+        # faqat commit bo'lsa navbatga tushadi (rollbackda tashlab yuboriladi)
+        db.info.setdefault("audit_after_commit", []).append(make_event(actor, action, entity, entity_id, meta))
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_after_commit(db: Session) -> None:
+    pending = db.info.pop("audit_after_commit", None)
+    if not pending:
+        return
+    rest = [ev for ev in pending if not _enqueue(ev)]
+    if rest:
+        # after_commit ichida bu sessiyada SQL yuborib bo'lmaydi — alohida sessiya
+        with Session(bind=db.get_bind()) as other:
+            for ev in rest:
+                _write_sync(other, ev)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_rollback(db: Session) -> None:
+    db.info.pop("audit_after_commit", None)
+
+
+# -------------------- fon writer --------------------
+class AuditWriter:
+    """Navbatdagi hodisalarni batch qilib yozadigan fon thread."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_queue: int,
+        batch_size: int,
+        flush_ms: int,
+        enqueue_timeout_ms: int = 0,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_s = max(1, flush_ms) / 1000.0
+        self.enqueue_timeout_s = max(0, enqueue_timeout_ms) / 1000.0
+        self._q: "queue.Queue[dict]" = queue.Queue(maxsize=max(1, max_queue))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.queue_full = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.last_flush_ms = 0.0
+
+    # --- producer tomoni ---
+    def submit(self, ev: dict) -> bool:
+        """False — navbat to'la (chaqiruvchi sync yozadi)."""
+        if self._stop.is_set():
+            return False
+        try:
+            if self.enqueue_timeout_s:
+                self._q.put(ev, timeout=self.enqueue_timeout_s)
+            else:
+                self._q.put_nowait(ev)
+        except queue.Full:
+            with self._lock:
+                self.queue_full += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+            depth = self._q.qsize()
+            if depth > self.max_depth:
+                self.max_depth = depth
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": settings.AUDIT_WRITER_MODE,
+                "tx_durable": settings.AUDIT_TX_DURABLE,
+                "queue_depth": self._q.qsize(),
+                "queue_max": self._q.maxsize,
+                "max_depth_seen": self.max_depth,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "batches": self.batches,
+                "queue_full_sync_writes": self.queue_full,
+                "failed": self.failed,
+                "last_flush_ms": round(self.last_flush_ms, 3),
+            }
+
+    # --- writer tomoni ---
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        # shutdown: navbatda qolganini yozib ketamiz
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = drain_batch(self._q, self.batch_size, self.flush_s, wait_s=0.5)
+            if batch:
+                self._write(batch)
+
+    def flush(self) -> None:
+        while True:
+            batch = drain_batch(self._q, self.batch_size, 0, wait_s=0)
+            if not batch:
+                return
+            self._write(batch)
+
+    def _write(self, batch: list[dict]) -> None:
+        t0 = time.perf_counter()
+        db = self.session_factory()
+        try:
+            # executemany -> insertmanyvalues: bitta multi-row INSERT
+            db.execute(insert(AuditLog), batch)
+            db.commit()
+            written = len(batch)
+        except Exception:
+            db.rollback()
+            logger.exception("audit batch failed (%d events), retrying one by one", len(batch))
+            written = 0
+            for ev in batch:
+                try:
+                    db.execute(insert(AuditLog), [ev])
+                    db.commit()
+                    written += 1
+                except Exception:
+                    db.rollback()
+                    logger.error("audit event dropped: %s %s %s", ev["action"], ev["entity"], ev["entity_id"])
+        finally:
+            db.close()
+        with self._lock:
+            self.written += written
+            self.failed += len(batch) - written
+            self.batches += 1
+            self.last_flush_ms = (time.perf_counter() - t0) * 1000
+
+
+_writer: Optional[AuditWriter] = None
+
+
+def start_audit_writer() -> None:
+    global _writer
+    from src.db.session import SessionLocal
+
+    _writer = AuditWriter(
+        SessionLocal,
+        settings.AUDIT_QUEUE_MAX,
+        settings.AUDIT_BATCH_SIZE,
+        settings.AUDIT_FLUSH_MS,
+        settings.AUDIT_ENQUEUE_TIMEOUT_MS,
+    )
+    _writer.start()
+
+
+def stop_audit_writer() -> None:
+    global _writer
+    if _writer is not None:
+        w, _writer = _writer, None
+        w.stop()
+
+
+def audit_writer_stats() -> dict:
+    if _writer is None:
+        return {"mode": settings.AUDIT_WRITER_MODE, "tx_durable": settings.AUDIT_TX_DURABLE, "running": False}
+    return {"running": True, **_writer.stats()}
+
+
+# -------------------- admin o'qish --------------------
+def audit_page(
+    db: Session,
+    actor: Optional[str] = None,
+    action: Optional[str] = None,
+    entity: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    before: Optional[tuple[datetime, uuid.UUID]] = None,
+    limit: int = AUDIT_PAGE_DEFAULT,
+) -> tuple[list[AuditLog], Optional[tuple[datetime, uuid.UUID]]]:
+    """
+    Yangidan eskiga, (created_at, id) keyset. since/until partition pruning
+    beradi, filtrlar (actor|action|entity, created_at) indekslariga tushadi.
+    before: parse_audit_token natijasi. Qaytaradi: (qatorlar, keyingi sahifa kaliti).
+    """
+    limit = max(1, min(limit, AUDIT_PAGE_MAX))
+    stmt = select(AuditLog)
+    if actor:
+        stmt = stmt.where(AuditLog.actor == actor)
+    if action:
+        stmt = stmt.where(AuditLog.action == action)
+    if entity:
+        stmt = stmt.where(AuditLog.entity == entity)
+    if entity_id:
+        stmt = stmt.where(AuditLog.entity_id == entity_id)
+    if since is not None:
+        stmt = stmt.where(AuditLog.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(AuditLog.created_at < until)
+    if before is not None:
+        # created_at alohida shart ham — planner keraksiz partitionlarni tashlaydi
+        stmt = stmt.where(AuditLog.created_at <= before[0])
+        stmt = stmt.where(tuple_(AuditLog.created_at, AuditLog.id) < tuple_(*before))
+
+    rows = list(
+        db.execute(stmt.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit + 1)).scalars()
+    )
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, ((rows[-1].created_at, rows[-1].id) if more and rows else None)
+
+
+def audit_dict(r: AuditLog) -> dict:
+    return {
+        "id": str(r.id),
+        "actor": r.actor,
+        "action": r.action,
+        "entity": r.entity,
+        "entity_id": r.entity_id,
+        "meta": r.meta,
+        "created_at": str(r.created_at),
+    }
+
+
+def audit_view(db: Session, before: Optional[str], limit: int, **filters) -> tuple[list[dict], Optional[str]]:
+    """GET /admin/audit (sync va async): (javob qatorlari, X-Next-Before tokeni)."""
+    rows, next_key = audit_page(db, before=parse_audit_token(before), limit=limit, **filters)
+    return [audit_dict(r) for r in rows], (encode_token(*next_key) if next_key else None)
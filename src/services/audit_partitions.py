@@ -0,0 +1,177 @@
+# backend/src/services/audit_partitions.py
+"""
+audit_logs — created_at bo'yicha oylik RANGE partitionlar (faqat PostgreSQL).
+
+- ensure_partitions: joriy oydan AUDIT_PARTITIONS_AHEAD oy oldinga partition yaratadi;
+  DEFAULT partition (audit_logs_default) ga tushgan qatorlarni o'z oyiga ko'chiradi
+  (maintainer to'xtab qolsa ham transfer "no partition for row" bilan yiqilmaydi)
+- drop_expired: AUDIT_RETENTION_MONTHS dan eski partitionlarni DETACH + DROP qiladi
+  (DELETE emas — jadval hajmidan qat'i nazar bir zumda, bloat yo'q)
+Fon thread kuniga bir marta (AUDIT_PARTITION_CHECK_SECONDS) ikkalasini chaqiradi.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.services.workers import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+PARENT = "audit_logs"
+DEFAULT = "audit_logs_default"
+_NAME_RE = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+
+
+def month_start(d: date, shift: int = 0) -> date:
+    m = d.year * 12 + (d.month - 1) + shift
+    return date(m // 12, m % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+
+def bounds(month: date) -> str:
+    """Chegaralar UTC da (sessiya TimeZone idan qat'i nazar migratsiya bilan bir xil)."""
+    end = month_start(month, 1)
+    return f"from ('{month.isoformat()} 00:00:00+00') to ('{end.isoformat()} 00:00:00+00')"
+
+
+def _is_pg(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def list_partitions(db: Session) -> list[str]:
+    rows = db.execute(text(
+        """
+        select c.relname from pg_inherits i
+        join pg_class c on c.oid = i.inhrelid
+        join pg_class p on p.oid = i.inhparent
+        where p.relname = :parent
+        order by c.relname
+        """
+    ), {"parent": PARENT}).scalars().all()
+    return list(rows)
+
+
+def _default_months(db: Session) -> list[date]:
+    """DEFAULT partitiondagi qatorlar oylari (UTC)."""
+    rows = db.execute(text(
+        f"select distinct date_trunc('month', created_at at time zone 'UTC')::date from {DEFAULT}"
+    )).scalars().all()
+    return sorted(rows)
+
+
+def _split_default(db: Session, month: date, name: str) -> int:
+    """
+    DEFAULT dagi shu oy qatorlarini yangi partitionga ko'chiradi: oddiy jadval
+    yaratiladi, qatorlar DELETE ... RETURNING bilan o'tkaziladi, keyin ATTACH.
+    (Qatorlari bor oraliq uchun to'g'ridan-to'g'ri PARTITION OF xato beradi.)
+    """
+    end = month_start(month, 1)
+    rng = {"a": f"{month.isoformat()} 00:00:00+00", "b": f"{end.isoformat()} 00:00:00+00"}
+    db.execute(text(f'create table "{name}" (like {PARENT} including defaults including constraints)'))
+    moved = db.execute(text(
+        f'with moved as (delete from {DEFAULT} where created_at >= :a and created_at < :b returning *) '
+        f'insert into "{name}" select * from moved'
+    ), rng).rowcount
+    db.execute(text(f'alter table {PARENT} attach partition "{name}" for values {bounds(month)}'))
+    return moved
+
+
+def ensure_partitions(db: Session, ahead: Optional[int] = None, today: Optional[date] = None) -> list[str]:
+    if not _is_pg(db):
+        return []
+    ahead = settings.AUDIT_PARTITIONS_AHEAD if ahead is None else ahead
+    today = today or datetime.now(timezone.utc).date()
+    # IF NOT EXISTS: bir nechta worker bir xil partitionni yaratmoqchi bo'lsa ham xato yo'q
+    db.execute(text(f'create table if not exists "{DEFAULT}" partition of {PARENT} default'))
+    db.commit()
+
+    months = [month_start(today, i) for i in range(0, ahead + 1)]
+    stray = _default_months(db)
+    if stray:
+        logger.warning("audit_logs_default has rows for %s; moving them to monthly partitions",
+                       ", ".join(m.strftime("%Y-%m") for m in stray))
+
+    existing = set(list_partitions(db))
+    created = []
+    for start in sorted(set(months) | set(stray)):
+        name = partition_name(start)
+        if start in stray and name not in existing:
+            moved = _split_default(db, start, name)
+            logger.warning("audit partition %s created from %d default rows", name, moved)
+        else:
+            db.execute(text(f'create table if not exists "{name}" partition of {PARENT} for values {bounds(start)}'))
+        # har oy o'z tranzaksiyasida: DEFAULT ni skan qiladigan lock qisqa tursin
+        db.commit()
+        if start in months:
+            created.append(name)
+    return created
+
+
+def expired(names: list[str], retention_months: int, today: date) -> list[str]:
+    """To'liq cutoff dan oldin tugagan partitionlar (nomi bo'yicha)."""
+    cutoff = month_start(today, -retention_months)
+    out = []
+    for name in names:
+        m = _NAME_RE.match(name)
+        # partition oxiri (keyingi oy boshi) cutoff dan keyin bo'lmasa — to'liq eskirgan
+        if m and month_start(date(int(m.group(1)), int(m.group(2)), 1), 1) <= cutoff:
+            out.append(name)
+    return out
+
+
+def drop_expired(db: Session, retention_months: Optional[int] = None, today: Optional[date] = None) -> list[str]:
+    """retention_months=0 -> hech narsa o'chirilmaydi."""
+    if not _is_pg(db):
+        return []
+    retention_months = settings.AUDIT_RETENTION_MONTHS if retention_months is None else retention_months
+    if retention_months <= 0:
+        return []
+    today = today or datetime.now(timezone.utc).date()
+
+    dropped = expired(list_partitions(db), retention_months, today)
+    for name in dropped:
+        db.execute(text(f'alter table {PARENT} detach partition "{name}"'))
+        db.execute(text(f'drop table "{name}"'))
+    db.commit()
+    return dropped
+
+
+def maintain(db: Session) -> dict:
+    return {"ensured": ensure_partitions(db), "dropped": drop_expired(db)}
+
+
+class PartitionMaintainer(PeriodicWorker):
+    name = "audit-partitions"
+    min_interval_s = 60.0
+    run_at_start = True
+
+    def __init__(self, session_factory: Callable[[], Session], interval_s: float):
+        super().__init__(session_factory, interval_s, maintain)
+
+
+_maintainer: Optional[PartitionMaintainer] = None
+
+
+def start_partition_maintainer() -> None:
+    global _maintainer
+    from src.db.session import SessionLocal
+
+    _maintainer = PartitionMaintainer(SessionLocal, settings.AUDIT_PARTITION_CHECK_SECONDS)
+    _maintainer.start()
+
+
+def stop_partition_maintainer() -> None:
+    global _maintainer
+    if _maintainer is not None:
+        _maintainer.stop()
+        _maintainer = None
@@ -0,0 +1,153 @@
+# backend/src/services/balance_shards.py
+"""
+Issiq hisoblar (birja/merchant) uchun sharded balans.
+
+users.balance_shards = N > 0 bo'lgan hisobda:
+- kredit: tasodifiy shard qatoriga `UPDATE ... SET balance = balance + :a`
+  (users qatori faqat FOR KEY SHARE — parallel kreditlar bir-birini kutmaydi)
+- debit: users qatori lock ostida; users.balance yetmasa shardlar yig'iladi (fold)
+- o'qish: users.balance + SUM(shardlar) bitta SQL da (aniq, bitta snapshot)
+- compaction: fon thread shardlarni vaqti-vaqti bilan users.balance ga ko'chiradi
+Lock turlari: transferlar users qatorini FOR NO KEY UPDATE bilan oladi (KEY SHARE
+bilan to'qnashmaydi), faqat set_shards FOR UPDATE oladi.
+
+Cheklov: har block build_block da chain_head FOR UPDATE oladi — "1 tx = 1 block"
+transferlar (/tx/create, TX_ENGINE=core) baribir navbat bilan commit bo'ladi va
+receiver qatori bottleneck emas. Shardlash foyda beradi faqat bitta blockda ko'p tx
+bo'lganda (mempool producer, /tx/batch — chain_head lock bir marta).
+"""
+from __future__ import annotations
+
+import logging
+import random
+import uuid
+from decimal import Decimal
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models.balance_shard import BalanceShard
+from src.models.user import User
+from src.services.workers import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+MAX_SHARDS = 256
+
+
+def shard_sum():
+    """users qatoriga korrelyatsiyalangan SUM(shardlar) (select ichida ishlatiladi)."""
+    return (
+        select(func.coalesce(func.sum(BalanceShard.balance), 0))
+        .where(BalanceShard.user_id == User.id)
+        .correlate(User)
+        .scalar_subquery()
+    )
+
+
+def total_balance(db: Session, user_id: uuid.UUID) -> Optional[Decimal]:
+    """users.balance + shardlar — bitta statement (compaction bilan poyga yo'q)."""
+    v = db.execute(select(User.balance + shard_sum()).where(User.id == user_id)).scalar()
+    return None if v is None else Decimal(str(v))
+
+
+def credit(db: Session, user: User, amount: Decimal) -> None:
+    if user.balance_shards > 0:
+        k = random.randrange(user.balance_shards)
+        db.execute(
+            update(BalanceShard)
+            .where(BalanceShard.user_id == user.id, BalanceShard.shard == k)
+            .values(balance=BalanceShard.balance + amount)
+        )
+    else:
+        user.balance = Decimal(str(user.balance)) + amount
+
+
+def fold(db: Session, user: User) -> Decimal:
+    """Shardlarni users.balance ga ko'chiradi (user qatori lock ostida bo'lishi kerak)."""
+    rows = db.execute(
+        select(BalanceShard.shard, BalanceShard.balance)
+        .where(BalanceShard.user_id == user.id)
+        .order_by(BalanceShard.shard)
+        .with_for_update()
+    ).all()
+    moved = sum((Decimal(str(b)) for _, b in rows), ZERO)
+    if moved:
+        db.execute(update(BalanceShard).where(BalanceShard.user_id == user.id).values(balance=0))
+        user.balance = Decimal(str(user.balance)) + moved
+    return moved
+
+
+def debit(db: Session, user: User, amount: Decimal) -> bool:
+    """False — mablag' yetarli emas. user qatori lock ostida bo'lishi kerak."""
+    if Decimal(str(user.balance)) < amount and user.balance_shards > 0:
+        fold(db, user)
+    if Decimal(str(user.balance)) < amount:
+        return False
+    user.balance = Decimal(str(user.balance)) - amount
+    return True
+
+
+def set_shards(db: Session, email: str, n: int) -> dict:
+    """Admin: hisobni N shardga bo'lish (0 — oddiy hisobga qaytarish)."""
+    if not 0 <= n <= MAX_SHARDS:
+        raise HTTPException(status_code=400, detail=f"shards must be 0..{MAX_SHARDS}")
+    db.rollback()
+    with db.begin():
+        # FOR UPDATE: kreditlarning KEY SHARE lockini kutadi — shard soni o'zgarayotganda kredit yo'q
+        user = db.query(User).filter(User.email == email.lower().strip()).with_for_update().first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        fold(db, user)
+        db.execute(delete(BalanceShard).where(BalanceShard.user_id == user.id))
+        if n:
+            db.execute(insert(BalanceShard), [{"user_id": user.id, "shard": k, "balance": ZERO} for k in range(n)])
+        user.balance_shards = n
+        out = {"email": user.email, "shards": n, "balance": str(user.balance)}
+    return out
+
+
+def compact(db: Session, limit: int = 1000) -> dict:
+    """Bo'sh bo'lmagan shardli hisoblarni users.balance ga yig'adi (har biri alohida tx)."""
+    db.rollback()
+    ids = db.execute(
+        select(BalanceShard.user_id).where(BalanceShard.balance != 0).group_by(BalanceShard.user_id).limit(limit)
+    ).scalars().all()
+    db.rollback()
+
+    moved = ZERO
+    for uid in ids:
+        with db.begin():
+            user = db.query(User).filter(User.id == uid).with_for_update(key_share=True).first()
+            if user is not None:
+                moved += fold(db, user)
+    return {"accounts": len(ids), "moved": str(moved)}
+
+
+class ShardCompactor(PeriodicWorker):
+    name = "balance-compactor"
+
+    def __init__(self, session_factory: Callable[[], Session], interval_s: float):
+        super().__init__(session_factory, interval_s, compact)
+
+
+_compactor: Optional[ShardCompactor] = None
+
+
+def start_shard_compactor() -> None:
+    global _compactor
+    from src.db.session import SessionLocal
+
+    _compactor = ShardCompactor(SessionLocal, settings.BALANCE_SHARD_COMPACT_SECONDS)
+    _compactor.start()
+
+
+def stop_shard_compactor() -> None:
+    global _compactor
+    if _compactor is not None:
+        _compactor.stop()
+        _compactor = None
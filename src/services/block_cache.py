@@ -0,0 +1,131 @@
+# backend/src/services/block_cache.py
+"""
+Explorer uchun o'zgarmas javoblar cache (yopilgan block/tx hech qachon o'zgarmaydi).
+
+- kalit: "tx:<hash>", "proof:<tx_hash>", "block:<index>"; qiymat — tayyor JSON bytes
+  va ETag (har so'rovda dict qurish va serialize qilish yo'q)
+- LRU, chegara baytlarda (BLOCK_CACHE_MAX_BYTES); faqat topilgan javoblar saqlanadi
+- ETag hashdan: "v1-<tx_hash|block_hash>"; /block/{index} da block_hash dan.
+  304 DB siz faqat cache da yozuv bo'lsa — aks holda avval qator o'qiladi
+  (mavjud bo'lmagan hash uchun 304 + immutable emas, 404); "*" ham faqat
+  mavjud javobga mos keladi
+- Cache-Control: immutable — CDN va brauzer qayta so'ramaydi
+Javob formati o'zgarsa ETAG_VERSION oshiriladi.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Response
+
+from src.core.config import settings
+
+ETAG_VERSION = "v1"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@dataclass(frozen=True)
+class Entry:
+    body: bytes
+    etag: str
+
+
+def etag_for(h: str) -> str:
+    return f'"{ETAG_VERSION}-{h}"'
+
+
+def matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match weak taqqoslash bilan (RFC 9110): W/ prefiksi e'tiborsiz
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
+
+def _headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+class BlockCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self._data: "OrderedDict[str, Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, payload: dict, etag: str) -> Entry:
+        entry = Entry(json.dumps(payload, separators=(",", ":")).encode(), etag)
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return entry
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._data[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, ev = self._data.popitem(last=False)
+                self._bytes -= len(ev.body)
+                self.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _not_modified(self, etag: str) -> Response:
+        with self._lock:
+            self.not_modified += 1
+        return Response(status_code=304, headers=_headers(etag))
+
+    def lookup(self, key: str, if_none_match: Optional[str]) -> Optional[Response]:
+        """DB siz javob (304 yoki cache dagi 200) yoki None — unda route DB dan o'qib respond() / 404 qiladi."""
+        entry = self.get(key)
+        if entry is None:
+            return None
+        return self.respond_entry(entry, if_none_match)
+
+    def respond(self, key: str, payload: dict, etag: str, if_none_match: Optional[str]) -> Response:
+        return self.respond_entry(self.put(key, payload, etag), if_none_match)
+
+    def respond_entry(self, entry: Entry, if_none_match: Optional[str]) -> Response:
+        if matches(if_none_match, entry.etag):
+            return self._not_modified(entry.etag)
+        return Response(content=entry.body, media_type="application/json", headers=_headers(entry.etag))
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+            }
+
+
+block_cache = BlockCache(settings.BLOCK_CACHE_MAX_BYTES)
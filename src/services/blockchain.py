@@ -2,38 +2,37 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import uuid
+from decimal import Decimal, ROUND_DOWN
+from typing import Optional, Sequence
+
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from src.models.block import Block
+from src.models.chain_head import CHAIN_HEAD_ID, ChainHead
 from src.models.transaction import Transaction
+from src.services.activity import activity_entries
+from src.services.ledger import posting_entries
+from src.services.merkle import merkle_root
+from src.services.stream import stage_block
 
 
 SYSTEM_MINT = "SYSTEM_MINT"
 
+AMOUNT_Q = Decimal("0.00000001")
+
 
 def _sha256(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
-def get_last_block(db: Session) -> tuple[int, str]:
-    # (last_index, last_hash)
-    row = db.execute(text("select block_index, block_hash from transactions order by block_index desc limit 1")).fetchone()
-    if not row:
-        return (0, "GENESIS")
-    return (int(row[0]), str(row[1]))
-
-
-def build_block(db: Session, from_addr: str, to_addr: str, amount: str) -> tuple[int, str, str]:
-    last_index, last_hash = get_last_block(db)
-    new_index = last_index + 1
-    payload = f"{new_index}|{last_hash}|{from_addr}|{to_addr}|{amount}"
-    new_hash = _sha256(payload)
-    return new_index, last_hash, new_hash
-
-
+def _norm_amount(amount) -> str:
+    a = Decimal(str(amount)).quantize(AMOUNT_Q, rounding=ROUND_DOWN)
+    return format(a, "f")
 
-import hashlib
-import json
 
 def calculate_hash(block: dict) -> str:
     """
@@ -42,3 +41,136 @@ def calculate_hash(block: dict) -> str:
     """
     payload = json.dumps(block, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def tx_hash(tx_id, from_addr: str, to_addr: str, amount) -> str:
+    # tx id ham kiradi: bir xil summa/manzilli ikki transfer turli hash oladi
+    return calculate_hash({
+        "id": str(tx_id),
+        "from": from_addr,
+        "to": to_addr,
+        "amount": _norm_amount(amount),
+    })
+
+
+def block_hash(block_index: int, prev_hash: str, root: str) -> str:
+    return _sha256(f"{block_index}|{prev_hash}|{root}")
+
+
+def _head_from_blocks(db: Session) -> tuple[int, str]:
+    # chain_head qatori yo'q bo'lsa: blocks dagi oxirgi block (bo'sh bo'lsa GENESIS)
+    row = db.execute(text("select block_index, block_hash from blocks order by block_index desc limit 1")).fetchone()
+    if row:
+        return (int(row[0]), str(row[1]))
+    return (0, "GENESIS")
+
+
+def _bootstrap_head(db: Session) -> ChainHead:
+    """
+    chain_head qatori yo'q bo'lsa (yangi DB / AUTO_CREATE_TABLES), uni
+    blocks dagi oxirgi blockdan bir marta yaratib qo'yamiz. Faqat yozish
+    yo'lida (for_update) — o'qishlar qator qo'shmaydi.
+    """
+    block_index, block_hash_ = _head_from_blocks(db)
+    head = ChainHead(id=CHAIN_HEAD_ID, block_index=block_index, block_hash=block_hash_)
+
+    try:
+        with db.begin_nested():
+            db.add(head)
+    except IntegrityError:
+        # boshqa worker bizdan oldin yaratib qo'ydi
+        head = db.query(ChainHead).filter(ChainHead.id == CHAIN_HEAD_ID).with_for_update().one()
+    return head
+
+
+def _get_head(db: Session, for_update: bool = False) -> Optional[ChainHead]:
+    """for_update=True: qator lock qilinadi, yo'q bo'lsa yaratiladi; aks holda yo'q bo'lsa None."""
+    q = db.query(ChainHead).filter(ChainHead.id == CHAIN_HEAD_ID)
+    if for_update:
+        q = q.with_for_update()
+    head = q.first()
+    if head is None and for_update:
+        head = _bootstrap_head(db)
+    return head
+
+
+def get_last_block(db: Session) -> tuple[int, str]:
+    # (last_index, last_hash) — chain_head dan O(1), transactions skan qilinmaydi
+    head = _get_head(db)
+    if head is None:
+        return _head_from_blocks(db)
+    return (int(head.block_index), str(head.block_hash))
+
+
+def seal_txs(txs: Sequence[Transaction], new_index: int, last_hash: str) -> tuple[str, str]:
+    """
+    Block payloadi (DB siz): har tx ga tx_hash/block_index/block_pos/prev_hash/
+    block_hash yoziladi. Qaytaradi: (merkle_root, block_hash).
+    """
+    hashes = []
+    for tx in txs:
+        if tx.id is None:
+            tx.id = uuid.uuid4()
+        tx.tx_hash = tx_hash(tx.id, tx.from_address, tx.to_address, tx.amount)
+        hashes.append(tx.tx_hash)
+
+    # block_pos tartibidagi tx_hash lar ustidan Merkle root
+    root = merkle_root(hashes)
+    new_hash = block_hash(new_index, last_hash, root)
+
+    for pos, tx in enumerate(txs):
+        tx.block_index = new_index
+        tx.block_pos = pos
+        tx.prev_hash = last_hash
+        tx.block_hash = new_hash
+    return root, new_hash
+
+
+def block_entries(txs: Sequence[Transaction], new_index: int, last_hash: str) -> tuple[Block, list]:
+    """
+    seal_txs + Block header + address_activity / ledger_postings yozuvlari
+    (sessiyaga qo'shilmagan ORM obyektlar). build_block ularni db.add qiladi,
+    transfer_core esa shu obyektlardan INSERT CTE quradi — ikki yo'l bir xil qatorlar yozadi.
+    """
+    root, new_hash = seal_txs(txs, new_index, last_hash)
+    block = Block(
+        block_index=new_index,
+        prev_hash=last_hash,
+        block_hash=new_hash,
+        merkle_root=root,
+        tx_count=len(txs),
+    )
+    # manzil faolligi indexi (explorer/history keyset pagination) + append-only double-entry ledger
+    return block, [*activity_entries(txs), *posting_entries(txs)]
+
+
+def build_block(db: Session, txs: Sequence[Transaction]) -> Block:
+    """
+    txs ni bitta blockka yopadi: har bir tx ga tx_hash/block_index/block_pos/
+    prev_hash/block_hash yoziladi, Block header qo'shiladi va chain_head shu
+    DB tranzaksiya ichida oldinga suriladi. Head qatori FOR UPDATE bilan lock
+    qilinadi — commit/rollback bo'lguncha boshqa writer shu indexni ololmaydi.
+
+    txs ni db.add qilish chaqiruvchining ishi.
+    """
+    if not txs:
+        raise ValueError("block must contain at least one tx")
+
+    head = _get_head(db, for_update=True)
+    last_index, last_hash = int(head.block_index), str(head.block_hash)
+    new_index = last_index + 1
+
+    block, entries = block_entries(txs, new_index, last_hash)
+    new_hash = block.block_hash
+    db.add_all(entries)
+    db.add(block)
+
+    head.block_index = new_index
+    head.block_hash = new_hash
+
+    # SSE/WS: commitdan keyin publish, boshqa workerlarga NOTIFY (services/stream.py)
+    stage_block(db, new_index, new_hash, [
+        {"tx_hash": tx.tx_hash, "from_address": tx.from_address, "to_address": tx.to_address, "amount": tx.amount}
+        for tx in txs
+    ])
+    return block
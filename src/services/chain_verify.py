@@ -1,39 +1,288 @@
-from decimal import Decimal, ROUND_DOWN
+from itertools import groupby
+from typing import Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from src.core.config import settings
+from src.models.block import Block
+from src.models.chain_checkpoint import CHECKPOINT_ID, ChainCheckpoint
 from src.models.transaction import Transaction
-from src.services.blockchain import calculate_hash
+from src.services.blockchain import block_hash, get_last_block, tx_hash
+from src.services.merkle import merkle_root
+
+MAX_ERRORS = 50
 
-AMOUNT_Q = Decimal("0.00000001")
+# (block_index, prev_hash, block_hash, merkle_root, tx_count)
+BlockHeader = tuple
+# (id, from_address, to_address, amount, tx_hash, block_pos, prev_hash, block_hash)
+TxRow = tuple
 
-def _norm_amount(amount: Decimal) -> str:
-    a = Decimal(amount).quantize(AMOUNT_Q, rounding=ROUND_DOWN)
-    return format(a, "f")
 
-def verify_chain(db: Session) -> dict:
+def check_block(header: BlockHeader, txs: list[TxRow]) -> list[dict]:
     """
-    Zanjirni 1..N bo‘yicha tekshiradi:
-    - prev_hash mosligi
+    Bitta block ichidagi tekshiruvlar (prev_hash zanjiri bundan tashqari):
+    - har bir tx_hash, merkle_root va tx_count mosligi
     - block_hash qayta hisoblanganda mosligi
+    Faqat oddiy tuple bilan ishlaydi — process pool workerlarga ham uzatsa bo'ladi.
     """
-    rows = db.query(Transaction).order_by(Transaction.block_index.asc()).all()
-    if not rows:
-        return {"ok": True, "blocks": 0, "detail": "empty"}
-
+    idx, prev_hash, b_hash, b_root, tx_count = header
     errors = []
-    prev = "GENESIS"
 
-    for r in rows:
-        amt = _norm_amount(Decimal(r.amount))
-        raw = f"{r.block_index}{r.from_address}{r.to_address}{amt}{r.prev_hash}"
-        expected_hash = calculate_hash(raw)
+    if len(txs) != tx_count:
+        errors.append({"block_index": idx, "type": "tx_count_mismatch", "expected": tx_count, "got": len(txs)})
+
+    hashes = []
+    for t_id, t_from, t_to, t_amount, t_hash, t_pos, t_prev, t_block in txs:
+        expected_tx = tx_hash(t_id, t_from, t_to, t_amount)
+        if t_hash != expected_tx:
+            errors.append({"block_index": idx, "type": "tx_hash_mismatch", "block_pos": t_pos})
+        if t_block != b_hash or t_prev != prev_hash:
+            errors.append({"block_index": idx, "type": "tx_block_mismatch", "block_pos": t_pos})
+        hashes.append(expected_tx)
+
+    root = merkle_root(hashes) if hashes else ""
+    if b_root != root:
+        errors.append({"block_index": idx, "type": "merkle_root_mismatch"})
+
+    if b_hash != block_hash(idx, prev_hash, root):
+        errors.append({"block_index": idx, "type": "block_hash_mismatch"})
+
+    return errors
+
+
+def iter_blocks(db: Session, start: int, end: int, chunk_size: int) -> Iterator[tuple[BlockHeader, list[TxRow]]]:
+    """
+    [start, end] oralig'idagi blocklarni server-side cursor orqali chunk_size
+    qatordan oqim qilib beradi; butun jadval hech qachon xotiraga yuklanmaydi.
+    """
+    stmt = (
+        select(
+            Block.block_index,
+            Block.prev_hash,
+            Block.block_hash,
+            Block.merkle_root,
+            Block.tx_count,
+            Transaction.id,
+            Transaction.from_address,
+            Transaction.to_address,
+            Transaction.amount,
+            Transaction.tx_hash,
+            Transaction.block_pos,
+            Transaction.prev_hash.label("tx_prev_hash"),
+            Transaction.block_hash.label("tx_block_hash"),
+        )
+        .outerjoin(Transaction, Transaction.block_index == Block.block_index)
+        .where(Block.block_index >= start, Block.block_index <= end)
+        .order_by(Block.block_index.asc(), Transaction.block_pos.asc())
+        .execution_options(yield_per=chunk_size)
+    )
+    result = db.execute(stmt)
+    try:
+        for _, rows in groupby(result, key=lambda r: r[0]):
+            rows = list(rows)
+            header = tuple(rows[0][:5])
+            txs = [tuple(r[5:]) for r in rows if r[5] is not None]
+            yield header, txs
+    finally:
+        result.close()
+
+
+def _get_checkpoint(db: Session) -> tuple[int, str]:
+    cp = db.query(ChainCheckpoint).filter(ChainCheckpoint.id == CHECKPOINT_ID).first()
+    if cp is None:
+        return (0, "GENESIS")
+    return (int(cp.block_index), str(cp.block_hash))
+
+
+def _save_checkpoint(db: Session, block_index: int, block_hash_: str, allow_backward: bool = False) -> None:
+    cp = db.query(ChainCheckpoint).filter(ChainCheckpoint.id == CHECKPOINT_ID).with_for_update().first()
+    if cp is None:
+        cp = ChainCheckpoint(id=CHECKPOINT_ID, block_index=0, block_hash="GENESIS")
+        db.add(cp)
+    # odatda faqat oldinga: parallel tekshiruvlar checkpointni orqaga surmasin.
+    # full tekshiruv esa buzilish topsa checkpointni orqaga qaytaradi.
+    if allow_backward or block_index >= int(cp.block_index or 0):
+        cp.block_index = block_index
+        cp.block_hash = block_hash_
+    db.commit()
+
+
+def _prev_of(db: Session, block_index: int) -> str:
+    if block_index <= 1:
+        return "GENESIS"
+    h = db.query(Block.block_hash).filter(Block.block_index == block_index - 1).scalar()
+    return h if h is not None else "GENESIS"
+
+
+def scan_blocks(
+    blocks: Iterable[tuple[BlockHeader, list[TxRow]]],
+    start: int,
+    end: int,
+    prev: Optional[str],
+    chunk_size: int,
+) -> Iterator[dict]:
+    """
+    [start, end] oralig'idagi blocklar oqimini tekshiradi. Har chunk_size
+    blockda {"progress": {...}}, oxirida {"scan": {...}} beradi.
+
+    prev=None: birinchi blockning prev_hash i bu yerda tekshirilmaydi
+    (segment chegarasi — uni parallel verify dagi parent tekshiradi).
+    """
+    errors: list[dict] = []
+    error_count = 0
+    checked = 0
+    expected_index = start
+    last_good: Optional[tuple[int, str]] = None
+    clean = True
+    first_prev: Optional[str] = None
+    last_hash: Optional[str] = None
+
+    def add(errs: list[dict]) -> None:
+        nonlocal error_count, clean
+        if errs:
+            clean = False
+            error_count += len(errs)
+            errors.extend(errs[: MAX_ERRORS - len(errors)])
+
+    for header, txs in blocks:
+        idx, b_prev, b_hash = header[0], header[1], header[2]
+        if checked == 0:
+            first_prev = b_prev
 
-        if r.prev_hash != prev:
-            errors.append({"block_index": r.block_index, "type": "prev_hash_mismatch", "expected": prev, "got": r.prev_hash})
+        if idx != expected_index:
+            add([{"block_index": expected_index, "type": "missing_block", "got": idx}])
+        if prev is not None and b_prev != prev:
+            add([{"block_index": idx, "type": "prev_hash_mismatch", "expected": prev, "got": b_prev}])
+        add(check_block(header, txs))
 
-        if r.block_hash != expected_hash:
-            errors.append({"block_index": r.block_index, "type": "block_hash_mismatch"})
+        if clean:
+            last_good = (idx, b_hash)
 
-        prev = r.block_hash
+        prev = b_hash
+        last_hash = b_hash
+        expected_index = idx + 1
+        checked += 1
 
-    return {"ok": len(errors) == 0, "blocks": len(rows), "errors": errors[:50]}
+        if checked % chunk_size == 0:
+            yield {"progress": {"checked": checked, "block_index": idx, "from": start, "to": end}}
+
+    if expected_index <= end:
+        add([{"block_index": expected_index, "type": "missing_block", "got": None}])
+
+    yield {"scan": {
+        "start": start,
+        "end": end,
+        "checked": checked,
+        "errors": errors,
+        "error_count": error_count,
+        "last_good": last_good,
+        "first_prev": first_prev,
+        "last_hash": last_hash,
+    }}
+
+
+def resolve_range(
+    db: Session,
+    from_index: Optional[int] = None,
+    to_index: Optional[int] = None,
+    full: bool = False,
+) -> tuple[str, int, int, str, int]:
+    """(mode, start, end, prev_hash, tip_index)"""
+    tip_index, _ = get_last_block(db)
+    end = min(to_index, tip_index) if to_index is not None else tip_index
+
+    if from_index is not None:
+        start = max(1, from_index)
+        return "range", start, end, _prev_of(db, start), tip_index
+    if full:
+        return "full", 1, end, "GENESIS", tip_index
+    cp_index, cp_hash = _get_checkpoint(db)
+    return "incremental", cp_index + 1, end, cp_hash, tip_index
+
+
+def empty_result(mode: str, start: int, end: int, tip_index: int) -> dict:
+    return {"ok": True, "blocks": 0, "detail": "empty" if tip_index == 0 else "up to date", "mode": mode, "from": start, "to": end}
+
+
+def finish(db: Session, mode: str, start: int, end: int, scan: dict, save_checkpoint: bool = True) -> dict:
+    """
+    Yakuniy hisobotni quradi; save_checkpoint=True bo'lsa checkpointni yangilaydi
+    (public GET False beradi — faqat o'qiydi).
+    """
+    last_good = scan["last_good"]
+
+    # checkpoint faqat 1 dan (yoki eski checkpointdan) uzluksiz xatosiz qism uchun
+    if save_checkpoint and mode == "full":
+        _save_checkpoint(db, *(last_good or (0, "GENESIS")), allow_backward=True)
+    elif save_checkpoint and mode == "incremental" and last_good is not None:
+        _save_checkpoint(db, *last_good)
+
+    return {
+        "ok": scan["error_count"] == 0,
+        "blocks": scan["checked"],
+        "mode": mode,
+        "from": start,
+        "to": end,
+        "checkpoint": {"block_index": last_good[0], "block_hash": last_good[1]} if last_good else None,
+        "error_count": scan["error_count"],
+        "errors": scan["errors"],
+    }
+
+
+def verify_chain_iter(
+    db: Session,
+    from_index: Optional[int] = None,
+    to_index: Optional[int] = None,
+    full: bool = False,
+    chunk_size: Optional[int] = None,
+    save_checkpoint: bool = True,
+) -> Iterator[dict]:
+    """
+    verify_chain ning generator ko'rinishi: har chunk_size blockda
+    {"progress": {...}}, oxirida bitta {"result": {...}} beradi.
+    """
+    chunk_size = chunk_size or settings.VERIFY_CHUNK_SIZE
+    mode, start, end, prev, tip_index = resolve_range(db, from_index, to_index, full)
+    if start > end:
+        yield {"result": empty_result(mode, start, end, tip_index)}
+        return
+
+    for event in scan_blocks(iter_blocks(db, start, end, chunk_size), start, end, prev, chunk_size):
+        if "progress" in event:
+            yield event
+        else:
+            yield {"result": finish(db, mode, start, end, event["scan"], save_checkpoint)}
+
+
+def verify_chain(
+    db: Session,
+    from_index: Optional[int] = None,
+    to_index: Optional[int] = None,
+    full: bool = False,
+    chunk_size: Optional[int] = None,
+    on_progress: Optional[Callable[[dict], None]] = None,
+    save_checkpoint: bool = True,
+) -> dict:
+    """
+    Zanjirni tekshiradi:
+    - prev_hash mosligi
+    - har bir tx_hash, blockdagi merkle_root va tx_count mosligi
+    - block_hash qayta hisoblanganda mosligi
+
+    Rejimlar:
+    - default (inkremental): saqlangan checkpointdan keyingi blocklar
+    - full=True: 1..N hammasi qaytadan
+    - from_index/to_index: ixtiyoriy oraliq (checkpointga tegmaydi)
+    Xatosiz inkremental/full tekshiruv checkpointni oldinga suradi
+    (save_checkpoint=False — checkpointga yozmaydi).
+    """
+    result: dict = {}
+    for event in verify_chain_iter(db, from_index=from_index, to_index=to_index, full=full, chunk_size=chunk_size,
+                                   save_checkpoint=save_checkpoint):
+        if "progress" in event:
+            if on_progress:
+                on_progress(event["progress"])
+        else:
+            result = event["result"]
+    return result
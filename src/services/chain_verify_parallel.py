@@ -0,0 +1,170 @@
+# backend/src/services/chain_verify_parallel.py
+"""
+Parallel verify: [start, end] oralig'i segmentlarga bo'linadi, har bir segment
+ProcessPoolExecutor workerida o'z DB ulanishi bilan o'qiladi va hashlari qayta
+hisoblanadi (SHA-256 GIL ichida — threadlar yordam bermaydi). Segment
+chegaralaridagi prev_hash bog'lanishlarini parent tekshiradi. Hisobot
+verify_chain bilan bir xil formatda.
+
+CLI:
+    python -m src.services.chain_verify_parallel --full --workers 8 --segment 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from src.core.config import settings
+from src.services.chain_verify import (
+    MAX_ERRORS,
+    empty_result,
+    finish,
+    iter_blocks,
+    resolve_range,
+    scan_blocks,
+)
+
+# worker process ichidagi sessionmaker (_init_worker o'rnatadi)
+_worker_session: Optional[sessionmaker] = None
+
+
+def _init_worker(db_url: str) -> None:
+    global _worker_session
+    engine = create_engine(db_url, poolclass=NullPool)
+    _worker_session = sessionmaker(bind=engine)
+
+
+def _verify_segment(start: int, end: int, chunk_size: int) -> dict:
+    db = _worker_session()
+    try:
+        scan = None
+        for event in scan_blocks(iter_blocks(db, start, end, chunk_size), start, end, None, chunk_size):
+            scan = event.get("scan", scan)
+        return scan
+    finally:
+        db.close()
+
+
+def segments(start: int, end: int, size: int) -> list[tuple[int, int]]:
+    size = max(1, size)
+    return [(s, min(s + size - 1, end)) for s in range(start, end + 1, size)]
+
+
+def merge_segments(scans: list[dict], prev: str) -> dict:
+    """
+    Segment natijalarini tartib bo'yicha birlashtiradi: chegaradagi prev_hash
+    ni tekshiradi va 1-xatogacha uzluksiz to'g'ri qismni (last_good) topadi.
+    Natija scan_blocks ning "scan" qismi bilan bir xil shaklda.
+    """
+    errors: list[dict] = []
+    error_count = 0
+    checked = 0
+    last_good = None
+    broken = False
+
+    for seg in scans:
+        boundary_ok = True
+        if seg["checked"] and seg["first_prev"] != prev:
+            boundary_ok = False
+            error_count += 1
+            if len(errors) < MAX_ERRORS:
+                errors.append({"block_index": seg["start"], "type": "prev_hash_mismatch", "expected": prev, "got": seg["first_prev"]})
+
+        error_count += seg["error_count"]
+        errors.extend(seg["errors"][: MAX_ERRORS - len(errors)])
+        checked += seg["checked"]
+
+        if not broken:
+            if boundary_ok and seg["last_good"] is not None:
+                last_good = tuple(seg["last_good"])
+            if not boundary_ok or seg["error_count"]:
+                broken = True
+
+        if seg["last_hash"] is not None:
+            prev = seg["last_hash"]
+
+    return {
+        "checked": checked,
+        "errors": errors,
+        "error_count": error_count,
+        "last_good": last_good,
+    }
+
+
+def verify_chain_parallel(
+    db: Session,
+    from_index: Optional[int] = None,
+    to_index: Optional[int] = None,
+    full: bool = False,
+    workers: Optional[int] = None,
+    segment_size: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    db_url: Optional[str] = None,
+    on_progress: Optional[Callable[[dict], None]] = None,
+    save_checkpoint: bool = True,
+) -> dict:
+    """verify_chain bilan bir xil rejimlar va hisobot, lekin segmentlar parallel."""
+    workers = workers or settings.VERIFY_WORKERS or os.cpu_count() or 1
+    segment_size = segment_size or settings.VERIFY_SEGMENT_SIZE
+    chunk_size = chunk_size or settings.VERIFY_CHUNK_SIZE
+    db_url = db_url or os.environ.get("DATABASE_URL") or settings.DATABASE_URL
+
+    mode, start, end, prev, tip_index = resolve_range(db, from_index, to_index, full)
+    if start > end:
+        return empty_result(mode, start, end, tip_index)
+
+    parts = segments(start, end, segment_size)
+    # fork emas, spawn: parent engine ning socketlari workerlarga meros qolmasin
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(parts)), mp_context=ctx,
+                             initializer=_init_worker, initargs=(db_url,)) as pool:
+        futures = [pool.submit(_verify_segment, s, e, chunk_size) for s, e in parts]
+        scans = []
+        for n, fut in enumerate(futures, start=1):
+            scans.append(fut.result())
+            if on_progress:
+                on_progress({"segments_done": n, "segments": len(parts), "block_index": parts[n - 1][1], "from": start, "to": end})
+
+    return finish(db, mode, start, end, merge_segments(scans, prev), save_checkpoint)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="LORD chain parallel verify")
+    ap.add_argument("--from", dest="from_index", type=int, default=None)
+    ap.add_argument("--to", dest="to_index", type=int, default=None)
+    ap.add_argument("--full", action="store_true")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--segment", type=int, default=None)
+    ap.add_argument("--chunk", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    from src.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        res = verify_chain_parallel(
+            db,
+            from_index=args.from_index,
+            to_index=args.to_index,
+            full=args.full,
+            workers=args.workers,
+            segment_size=args.segment,
+            chunk_size=args.chunk,
+            on_progress=lambda p: print(json.dumps({"progress": p}), flush=True),
+        )
+    finally:
+        db.close()
+    print(json.dumps({"result": res}))
+    return 0 if res["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
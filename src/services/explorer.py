@@ -0,0 +1,115 @@
+# backend/src/services/explorer.py
+"""
+Explorer o'qishlari: sync router to'g'ridan-to'g'ri, async router
+AsyncSession.run_sync orqali chaqiradi — SQL va javob shakli bitta joyda.
+Cache (block_cache.lookup/respond) router tomonida: hit bo'lsa sessiya ochilmaydi.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.models.block import Block
+from src.models.transaction import Transaction
+from src.services.activity import address_page
+from src.services.block_cache import etag_for
+from src.services.blockchain import get_last_block
+from src.services.ledger import balance_at
+from src.services.merkle import merkle_proof
+
+
+def tx_dict(tx: Transaction) -> dict:
+    return {
+        "tx_hash": tx.tx_hash,
+        "block_index": tx.block_index,
+        "block_pos": tx.block_pos,
+        "block_hash": tx.block_hash,
+        "prev_hash": tx.prev_hash,
+        "from_address": tx.from_address,
+        "to_address": tx.to_address,
+        "amount": str(tx.amount),
+        "created_at": str(tx.created_at),
+    }
+
+
+def block_dict(b: Block, txs: list[Transaction]) -> dict:
+    return {
+        "block_index": b.block_index,
+        "block_hash": b.block_hash,
+        "prev_hash": b.prev_hash,
+        "merkle_root": b.merkle_root,
+        "tx_count": b.tx_count,
+        "created_at": str(b.created_at),
+        "transactions": [tx_dict(t) for t in txs],
+    }
+
+
+def tx_view(db: Session, ref: str) -> tuple[dict, str]:
+    """(body, etag). ref — tx_hash; topilmasa eski havolalar uchun block_hash (blockdagi 1-tx)."""
+    tx = db.query(Transaction).filter(Transaction.tx_hash == ref).first()
+    if not tx:
+        # blocks.block_hash (unique) -> (block_index, block_pos) indeksi
+        tx = (
+            db.query(Transaction)
+            .join(Block, Block.block_index == Transaction.block_index)
+            .filter(Block.block_hash == ref)
+            .order_by(Transaction.block_pos.asc())
+            .first()
+        )
+    if not tx:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return tx_dict(tx), etag_for(ref)
+
+
+def proof_view(db: Session, tx_hash: str) -> tuple[dict, str]:
+    tx = db.query(Transaction).filter(Transaction.tx_hash == tx_hash).first()
+    if not tx or tx.block_index is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+
+    b = db.get(Block, tx.block_index)
+    if not b:
+        raise HTTPException(status_code=404, detail="Block not found")
+
+    leaves = [
+        h for (h,) in db.query(Transaction.tx_hash)
+        .filter(Transaction.block_index == tx.block_index)
+        .order_by(Transaction.block_pos.asc())
+        .all()
+    ]
+    return {
+        "tx_hash": tx.tx_hash,
+        "block_index": b.block_index,
+        "block_pos": tx.block_pos,
+        "block_hash": b.block_hash,
+        "prev_hash": b.prev_hash,
+        "merkle_root": b.merkle_root,
+        "tx_count": b.tx_count,
+        "proof": merkle_proof(leaves, tx.block_pos),
+    }, etag_for(tx_hash)
+
+
+def block_view(db: Session, block_index: int) -> tuple[dict, str]:
+    # ETag = block_hash
+    b = db.get(Block, block_index)
+    if not b:
+        raise HTTPException(status_code=404, detail="Block not found")
+    txs = (
+        db.query(Transaction)
+        .filter(Transaction.block_index == block_index)
+        .order_by(Transaction.block_pos.asc())
+        .all()
+    )
+    return block_dict(b, txs), etag_for(b.block_hash)
+
+
+def address_txs(db: Session, address: str, before: Optional[str], limit: int) -> tuple[list[dict], Optional[str]]:
+    rows, next_cursor = address_page(db, address, before=before, limit=limit)
+    return [tx_dict(r) for r in rows], next_cursor
+
+
+def balance_view(db: Session, address: str, at: Optional[int]) -> dict:
+    # at — o'sha blockdan keyingi holat (sukut: hozirgi head)
+    head, _ = get_last_block(db)
+    return balance_at(db, address, head if at is None else min(at, head))
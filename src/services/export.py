@@ -0,0 +1,221 @@
+# backend/src/services/export.py
+from __future__ import annotations
+
+import base64
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from src.models.address_activity import AddressActivity
+from src.models.audit_log import AuditLog
+from src.models.transaction import Transaction
+
+EXPORT_CHUNK = 1000
+# nechta qator bitta HTTP chunk bo'lib yuboriladi
+LINES_PER_WRITE = 500
+
+TX_FIELDS = [
+    "cursor", "tx_hash", "block_index", "block_pos", "block_hash", "prev_hash",
+    "from_address", "to_address", "amount", "created_at",
+]
+AUDIT_FIELDS = ["cursor", "id", "created_at", "actor", "action", "entity", "entity_id", "meta"]
+
+
+# -------------------- resume token --------------------
+def encode_token(*parts) -> str:
+    raw = json.dumps([str(p) for p in parts], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_token(token: Optional[str], n: int) -> Optional[list[str]]:
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        parts = json.loads(raw)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid resume token")
+    if not isinstance(parts, list) or len(parts) != n:
+        raise HTTPException(status_code=400, detail="Invalid resume token")
+    return parts
+
+
+def parse_tx_token(token: Optional[str]) -> Optional[tuple[int, int]]:
+    parts = decode_token(token, 2)
+    if parts is None:
+        return None
+    try:
+        return (int(parts[0]), int(parts[1]))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid resume token")
+
+
+def parse_audit_token(token: Optional[str]) -> Optional[tuple[datetime, uuid.UUID]]:
+    parts = decode_token(token, 2)
+    if parts is None:
+        return None
+    try:
+        return (datetime.fromisoformat(parts[0]), uuid.UUID(parts[1]))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid resume token")
+
+
+def _plain(v):
+    if isinstance(v, (Decimal, uuid.UUID)):
+        return str(v)
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return v
+
+
+# -------------------- row iterators (server-side cursor) --------------------
+def iter_transactions(
+    db: Session,
+    address: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[tuple[int, int]] = None,
+    chunk: int = EXPORT_CHUNK,
+) -> Iterator[dict]:
+    """
+    Eskidan yangiga, (block_index, block_pos) keyset bo'yicha.
+    after: parse_tx_token natijasi (stream boshlanishidan oldin tekshiriladi).
+    """
+    cols = (
+        Transaction.tx_hash, Transaction.block_index, Transaction.block_pos, Transaction.block_hash,
+        Transaction.prev_hash, Transaction.from_address, Transaction.to_address, Transaction.amount,
+        Transaction.created_at,
+    )
+    if address:
+        # address_activity PK index orqali, butun jadval skan qilinmaydi
+        stmt = (
+            select(*cols)
+            .join(AddressActivity, AddressActivity.tx_id == Transaction.id)
+            .where(AddressActivity.address == address)
+        )
+        key = (AddressActivity.block_index, AddressActivity.block_pos)
+    else:
+        stmt = select(*cols).where(Transaction.block_index.isnot(None))
+        key = (Transaction.block_index, Transaction.block_pos)
+
+    if since is not None:
+        stmt = stmt.where(Transaction.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(Transaction.created_at < until)
+
+    if after is not None:
+        stmt = stmt.where(tuple_(*key) > tuple_(*after))
+
+    stmt = stmt.order_by(key[0].asc(), key[1].asc()).execution_options(yield_per=chunk)
+    result = db.execute(stmt)
+    try:
+        for r in result:
+            row = dict(zip(TX_FIELDS[1:], (_plain(v) for v in r)))
+            row["cursor"] = encode_token(r.block_index, r.block_pos)
+            yield row
+    finally:
+        result.close()
+
+
+def iter_audit(
+    db: Session,
+    actor: Optional[str] = None,
+    action: Optional[str] = None,
+    entity: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[tuple[datetime, uuid.UUID]] = None,
+    chunk: int = EXPORT_CHUNK,
+) -> Iterator[dict]:
+    """
+    Eskidan yangiga, (created_at, id) keyset bo'yicha.
+    after: parse_audit_token natijasi.
+    """
+    stmt = select(
+        AuditLog.id, AuditLog.created_at, AuditLog.actor, AuditLog.action,
+        AuditLog.entity, AuditLog.entity_id, AuditLog.meta,
+    )
+    if actor:
+        stmt = stmt.where(AuditLog.actor == actor)
+    if action:
+        stmt = stmt.where(AuditLog.action == action)
+    if entity:
+        stmt = stmt.where(AuditLog.entity == entity)
+    if since is not None:
+        stmt = stmt.where(AuditLog.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(AuditLog.created_at < until)
+
+    if after is not None:
+        ts, last_id = after
+        stmt = stmt.where(or_(
+            AuditLog.created_at > ts,
+            and_(AuditLog.created_at == ts, AuditLog.id > last_id),
+        ))
+
+    stmt = stmt.order_by(AuditLog.created_at.asc(), AuditLog.id.asc()).execution_options(yield_per=chunk)
+    result = db.execute(stmt)
+    try:
+        for r in result:
+            row = dict(zip(AUDIT_FIELDS[1:], (_plain(v) for v in r)))
+            row["cursor"] = encode_token(row["created_at"], row["id"])
+            yield row
+    finally:
+        result.close()
+
+
+# -------------------- formatters --------------------
+def ndjson_lines(rows: Iterable[dict], fields: list[str]) -> Iterator[str]:
+    buf = []
+    for row in rows:
+        buf.append(json.dumps({f: row.get(f) for f in fields}, ensure_ascii=False, default=str))
+        if len(buf) >= LINES_PER_WRITE:
+            yield "\n".join(buf) + "\n"
+            buf.clear()
+    if buf:
+        yield "\n".join(buf) + "\n"
+
+
+def csv_lines(rows: Iterable[dict], fields: list[str]) -> Iterator[str]:
+    out = io.StringIO()
+    w = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+    w.writeheader()
+    n = 0
+    for row in rows:
+        if isinstance(row.get("meta"), (dict, list)):
+            row = {**row, "meta": json.dumps(row["meta"], ensure_ascii=False)}
+        w.writerow(row)
+        n += 1
+        if n % LINES_PER_WRITE == 0:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+    if out.tell():
+        yield out.getvalue()
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    rows_fn: Callable[..., Iterator[dict]],
+    fields: list[str],
+    fmt: str,
+    **filters,
+) -> Iterator[str]:
+    """
+    StreamingResponse uchun generator. Sessiya shu yerda ochiladi va oqim
+    tugagach (yoki klient uzilganda) yopiladi; xotira — bitta chunk.
+    """
+    db = session_factory()
+    try:
+        rows = rows_fn(db, **filters)
+        yield from (csv_lines(rows, fields) if fmt == "csv" else ndjson_lines(rows, fields))
+    finally:
+        db.close()
@@ -0,0 +1,248 @@
+# backend/src/services/idempotency.py
+"""
+Idempotency-Key: tx/create va tx/batch qayta yuborilganda ikkinchi marta pul yechilmaydi.
+
+- lookup: (user_id, key) PK bo'yicha bitta SELECT, hech qanday lock yo'q;
+  tayyor javob bo'lsa aynan o'sha status/tana qaytadi (Idempotent-Replayed: true)
+- birinchi so'rov "pending" qatorni INSERT qiladi (alohida qisqa tx); parallel takror
+  INSERT da to'qnashadi va qator tayyor bo'lguncha IDEMPOTENCY_WAIT_SECONDS gacha kutadi,
+  tugamasa 409
+- bir xil kalit boshqa tana bilan — 422
+- 2xx/4xx javoblar saqlanadi; transfer rollback bo'lgan 5xx da kalit bo'shatiladi
+  (qayta urinish mumkin); 504 (mempoolda hali yopilishi mumkin) — kalit pending
+  qoladi, takrorlar TTL gacha 409 oladi (ikki marta yechilmaydi)
+- muddati o'tgan qatorlarni fon thread o'chiradi (IDEMPOTENCY_PURGE_SECONDS)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models.idempotency_key import IdempotencyKey
+from src.services.workers import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+KEY_MAX_LEN = 255
+REPLAY_HEADER = "Idempotent-Replayed"
+
+OWNER = "owner"
+PENDING = "pending"
+
+
+@dataclass(frozen=True)
+class Replay:
+    status_code: int
+    body: Any
+
+    def response(self) -> JSONResponse:
+        return JSONResponse(status_code=self.status_code, content=self.body, headers={REPLAY_HEADER: "true"})
+
+
+def fingerprint(scope: str, payload: BaseModel) -> str:
+    raw = json.dumps([scope, payload.model_dump(mode="json")], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def check_key(key: str) -> str:
+    key = key.strip()
+    if not key or len(key) > KEY_MAX_LEN:
+        raise HTTPException(status_code=400, detail=f"Invalid Idempotency-Key (1..{KEY_MAX_LEN} chars)")
+    return key
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(dt: datetime) -> datetime:
+    # sqlite tz ni saqlamaydi
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _pk(user_id: uuid.UUID, key: str):
+    return (IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+
+
+def try_acquire(db: Session, user_id: uuid.UUID, key: str, req_hash: str):
+    """Bitta qadam: OWNER (kalit bizniki), PENDING (boshqasi ishlayapti) yoki Replay."""
+    db.rollback()
+    row = db.execute(
+        select(IdempotencyKey.request_hash, IdempotencyKey.status_code, IdempotencyKey.response,
+               IdempotencyKey.expires_at)
+        .where(*_pk(user_id, key))
+    ).first()
+    db.rollback()
+
+    now = _now()
+    if row is not None and _aware(row.expires_at) > now:
+        if row.request_hash != req_hash:
+            raise HTTPException(status_code=422, detail="Idempotency-Key reused with a different request")
+        if row.status_code is None:
+            return PENDING
+        return Replay(row.status_code, json.loads(row.response))
+
+    try:
+        with db.begin():
+            if row is not None:
+                db.execute(delete(IdempotencyKey).where(*_pk(user_id, key), IdempotencyKey.expires_at <= now))
+            db.add(IdempotencyKey(user_id=user_id, key=key, request_hash=req_hash,
+                                  expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)))
+    except IntegrityError:
+        # parallel takror bizdan oldin INSERT qildi
+        return PENDING
+    return OWNER
+
+
+def store(db: Session, user_id: uuid.UUID, key: str, status_code: int, body: Any) -> None:
+    db.rollback()
+    with db.begin():
+        db.execute(
+            update(IdempotencyKey).where(*_pk(user_id, key))
+            .values(status_code=status_code, response=json.dumps(body))
+        )
+
+
+def release(db: Session, user_id: uuid.UUID, key: str) -> None:
+    db.rollback()
+    with db.begin():
+        db.execute(delete(IdempotencyKey).where(*_pk(user_id, key), IdempotencyKey.status_code.is_(None)))
+
+
+def _busy() -> HTTPException:
+    return HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress",
+                         headers={"Retry-After": "1"})
+
+
+def _outcome(e: HTTPException) -> Optional[tuple[int, Any]]:
+    """Saqlanadigan xato javobi yoki None (kalit bo'shatiladi)."""
+    if 400 <= e.status_code < 500 and e.status_code != 409:
+        return e.status_code, {"detail": e.detail}
+    return None
+
+
+def run_idempotent(
+    db: Session,
+    user_id: uuid.UUID,
+    key: str,
+    req_hash: str,
+    model: type[BaseModel],
+    call: Callable[[], Any],
+):
+    """Sync route: call() ni kalit ostida bir marta bajaradi; natija JSON tanasi yoki JSONResponse."""
+    key = check_key(key)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    delay = 0.01
+    while True:
+        state = try_acquire(db, user_id, key, req_hash)
+        if isinstance(state, Replay):
+            return state.response()
+        if state == OWNER:
+            break
+        if time.monotonic() >= deadline:
+            raise _busy()
+        time.sleep(delay)
+        delay = min(delay * 2, 0.2)
+
+    try:
+        res = call()
+    except HTTPException as e:
+        out = _outcome(e)
+        if out is not None:
+            store(db, user_id, key, *out)
+        elif e.status_code != 504:
+            release(db, user_id, key)
+        raise
+    except Exception:
+        release(db, user_id, key)
+        raise
+    body = model.model_validate(res).model_dump(mode="json")
+    store(db, user_id, key, 200, body)
+    return body
+
+
+async def run_idempotent_async(
+    db,
+    user_id: uuid.UUID,
+    key: str,
+    req_hash: str,
+    model: type[BaseModel],
+    call: Callable[[], Awaitable[Any]],
+):
+    """run_idempotent() ning AsyncSession varianti (DB qadamlari run_sync, kutish asyncio.sleep)."""
+    key = check_key(key)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    delay = 0.01
+    while True:
+        state = await db.run_sync(try_acquire, user_id, key, req_hash)
+        if isinstance(state, Replay):
+            return state.response()
+        if state == OWNER:
+            break
+        if time.monotonic() >= deadline:
+            raise _busy()
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.2)
+
+    try:
+        res = await call()
+    except HTTPException as e:
+        out = _outcome(e)
+        if out is not None:
+            await db.run_sync(store, user_id, key, *out)
+        elif e.status_code != 504:
+            await db.run_sync(release, user_id, key)
+        raise
+    except Exception:
+        await db.run_sync(release, user_id, key)
+        raise
+    body = model.model_validate(res).model_dump(mode="json")
+    await db.run_sync(store, user_id, key, 200, body)
+    return body
+
+
+def purge_expired(db: Session) -> int:
+    db.rollback()
+    with db.begin():
+        n = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= _now())).rowcount
+    return n or 0
+
+
+class IdempotencyPurger(PeriodicWorker):
+    name = "idempotency-purger"
+
+    def __init__(self, session_factory: Callable[[], Session], interval_s: float):
+        super().__init__(session_factory, interval_s, purge_expired)
+
+
+_purger: Optional[IdempotencyPurger] = None
+
+
+def start_idempotency_purger() -> None:
+    global _purger
+    from src.db.session import SessionLocal
+
+    _purger = IdempotencyPurger(SessionLocal, settings.IDEMPOTENCY_PURGE_SECONDS)
+    _purger.start()
+
+
+def stop_idempotency_purger() -> None:
+    global _purger
+    if _purger is not None:
+        _purger.stop()
+        _purger = None
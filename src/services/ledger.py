@@ -0,0 +1,215 @@
+# backend/src/services/ledger.py
+from __future__ import annotations
+
+import logging
+from decimal import Decimal
+from typing import Callable, Iterable, Optional, Sequence
+
+from sqlalchemy import and_, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models.balance_snapshot import BalanceSnapshot, BalanceSnapshotRun
+from src.models.ledger_posting import LedgerPosting
+from src.models.transaction import Transaction
+from src.models.user import User
+from src.services.balance_shards import shard_sum
+from src.services.workers import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+IN_CHUNK = 1000
+
+
+def posting_entries(txs: Sequence[Transaction]) -> list[LedgerPosting]:
+    """Har tx uchun debit + credit (yig'indisi 0); sessiyaga qo'shilmaydi (transfer_core ham ishlatadi)."""
+    out = []
+    for tx in txs:
+        amount = Decimal(str(tx.amount))
+        out.append(LedgerPosting(
+            tx_id=tx.id, entry="debit", block_index=tx.block_index, block_pos=tx.block_pos,
+            address=tx.from_address, delta=-amount,
+        ))
+        out.append(LedgerPosting(
+            tx_id=tx.id, entry="credit", block_index=tx.block_index, block_pos=tx.block_pos,
+            address=tx.to_address, delta=amount,
+        ))
+    return out
+
+
+def last_snapshot_height(db: Session) -> int:
+    return int(db.query(func.max(BalanceSnapshotRun.block_index)).scalar() or 0)
+
+
+def _chunks(items: list, n: int) -> Iterable[list]:
+    for i in range(0, len(items), n):
+        yield items[i:i + n]
+
+
+def _latest_balances(db: Session, addresses: Optional[list[str]] = None) -> dict[str, Decimal]:
+    """Har manzilning eng oxirgi snapshot balansi (addresses=None -> hammasi)."""
+    def query(chunk: Optional[list[str]]):
+        sub = db.query(BalanceSnapshot.address, func.max(BalanceSnapshot.block_index).label("h"))
+        if chunk is not None:
+            sub = sub.filter(BalanceSnapshot.address.in_(chunk))
+        sub = sub.group_by(BalanceSnapshot.address).subquery()
+        return (
+            db.query(BalanceSnapshot.address, BalanceSnapshot.balance)
+            .join(sub, and_(BalanceSnapshot.address == sub.c.address, BalanceSnapshot.block_index == sub.c.h))
+            .all()
+        )
+
+    out: dict[str, Decimal] = {}
+    if addresses is None:
+        out.update(query(None))
+    else:
+        for chunk in _chunks(addresses, IN_CHUNK):
+            out.update(query(chunk))
+    return out
+
+
+def _postings_since(db: Session, after: int, upto: Optional[int] = None) -> dict[str, Decimal]:
+    q = db.query(LedgerPosting.address, func.sum(LedgerPosting.delta)).filter(LedgerPosting.block_index > after)
+    if upto is not None:
+        q = q.filter(LedgerPosting.block_index <= upto)
+    return {a: Decimal(str(d)) for a, d in q.group_by(LedgerPosting.address).all()}
+
+
+def balance_at(db: Session, address: str, block_index: int) -> dict:
+    """
+    block_index balandligidagi balans = eng yaqin snapshot (<= block_index)
+    + undan keyingi postinglar (qisqa replay, (address, block_index) index bo'yicha).
+    """
+    snap = (
+        db.query(BalanceSnapshot.block_index, BalanceSnapshot.balance)
+        .filter(BalanceSnapshot.address == address, BalanceSnapshot.block_index <= block_index)
+        .order_by(BalanceSnapshot.block_index.desc())
+        .first()
+    )
+    base_height, base = (int(snap[0]), Decimal(str(snap[1]))) if snap else (0, ZERO)
+
+    delta, n = (
+        db.query(func.coalesce(func.sum(LedgerPosting.delta), 0), func.count())
+        .filter(
+            LedgerPosting.address == address,
+            LedgerPosting.block_index > base_height,
+            LedgerPosting.block_index <= block_index,
+        )
+        .one()
+    )
+    return {
+        "address": address,
+        "block_index": block_index,
+        "balance": str(base + Decimal(str(delta))),
+        "snapshot_block_index": base_height,
+        "replayed_postings": int(n),
+    }
+
+
+def take_snapshot(db: Session, block_index: Optional[int] = None) -> dict:
+    """
+    Oxirgi rundan beri o'zgargan manzillar uchun block_index balandligida
+    snapshot yozadi. block_index sukut bo'yicha — commit qilingan chain_head:
+    head bilan bir tranzaksiyada yozilgani uchun undan past postinglar to'liq.
+    """
+    from src.services.blockchain import get_last_block
+
+    height = block_index if block_index is not None else get_last_block(db)[0]
+    last = last_snapshot_height(db)
+    if height <= last:
+        return {"block_index": last, "addresses": 0, "detail": "up to date"}
+
+    changed = _postings_since(db, last, height)
+    prev = _latest_balances(db, list(changed))
+
+    try:
+        db.add(BalanceSnapshotRun(block_index=height, addresses=len(changed)))
+        db.add_all(
+            BalanceSnapshot(address=a, block_index=height, balance=prev.get(a, ZERO) + d)
+            for a, d in changed.items()
+        )
+        db.commit()
+    except IntegrityError:
+        # boshqa worker shu balandlikni oldinroq oldi
+        db.rollback()
+        return {"block_index": height, "addresses": 0, "detail": "already taken"}
+    return {"block_index": height, "addresses": len(changed)}
+
+
+def reconcile(db: Session, limit: int = 100) -> dict:
+    """
+    users.balance ni ledger bilan solishtiradi:
+    ledger balans = oxirgi snapshot + oxirgi run balandligidan keyingi postinglar.
+    """
+    db.rollback()
+    if db.get_bind().dialect.name == "postgresql":
+        # users va postinglar bitta snapshotdan o'qilsin (parallel transferlar)
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    last = last_snapshot_height(db)
+    ledger = _latest_balances(db)
+    for a, d in _postings_since(db, last).items():
+        ledger[a] = ledger.get(a, ZERO) + d
+
+    checked = 0
+    mismatch_count = 0
+    mismatches = []
+    # sharded hisoblar: users.balance + shardlar (services/balance_shards.py)
+    for address, balance in db.query(User.address, User.balance + shard_sum()).yield_per(IN_CHUNK):
+        checked += 1
+        expected = ledger.pop(address, ZERO)
+        if Decimal(str(balance)) != expected:
+            mismatch_count += 1
+            if len(mismatches) < limit:
+                mismatches.append({"address": address, "users_balance": str(balance), "ledger_balance": str(expected)})
+
+    # ledgerda bor, lekin users da yo'q manzillar
+    orphans = [a for a, v in ledger.items() if v != ZERO]
+    db.rollback()
+
+    return {
+        "ok": mismatch_count == 0 and not orphans,
+        "snapshot_block_index": last,
+        "users_checked": checked,
+        "mismatch_count": mismatch_count,
+        "mismatches": mismatches,
+        "orphan_addresses": orphans[:limit],
+    }
+
+
+class LedgerSnapshotter(PeriodicWorker):
+    """Head har every_blocks ga o'sganda snapshot oladigan fon thread."""
+
+    name = "ledger-snapshotter"
+
+    def __init__(self, session_factory: Callable[[], Session], every_blocks: int, interval_s: float):
+        super().__init__(session_factory, interval_s, self._snapshot_if_due)
+        self.every_blocks = max(1, every_blocks)
+
+    def _snapshot_if_due(self, db: Session) -> Optional[dict]:
+        from src.services.blockchain import get_last_block
+
+        head = get_last_block(db)[0]
+        if head - last_snapshot_height(db) < self.every_blocks:
+            return None
+        return take_snapshot(db, head)
+
+
+_snapshotter: Optional[LedgerSnapshotter] = None
+
+
+def start_ledger_snapshotter() -> None:
+    global _snapshotter
+    from src.db.session import SessionLocal
+
+    _snapshotter = LedgerSnapshotter(SessionLocal, settings.LEDGER_SNAPSHOT_EVERY_BLOCKS, settings.LEDGER_SNAPSHOT_INTERVAL_SECONDS)
+    _snapshotter.start()
+
+
+def stop_ledger_snapshotter() -> None:
+    global _snapshotter
+    if _snapshotter is not None:
+        _snapshotter.stop()
+        _snapshotter = None
@@ -0,0 +1,224 @@
+# backend/src/services/mempool.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.db.retry import tx_retry
+from src.models.transaction import Transaction
+from src.services.audit import audit_tx
+from src.services.balance_shards import credit, debit
+from src.services.blockchain import build_block
+from src.services.transfer import lock_parties, tx_out
+from src.services.workers import drain_batch
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingTx:
+    """Validatsiyadan o'tgan, lekin hali blockka yopilmagan transfer."""
+
+    sender_id: uuid.UUID
+    actor: str
+    to_address: str
+    amount: Decimal
+    future: Future = field(default_factory=Future)
+
+
+class Mempool:
+    """
+    Chegaralangan in-process navbat. Transfer faqat uning blocki commit
+    bo'lgandan keyin javob oladi, shuning uchun crash bo'lsa ham hech bir
+    "muvaffaqiyatli" javob yo'qolmaydi.
+    """
+
+    def __init__(self, max_size: int):
+        self._q: "queue.Queue[PendingTx]" = queue.Queue(maxsize=max_size)
+
+    def submit(self, item: PendingTx) -> Future:
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            raise HTTPException(status_code=503, detail="Mempool is full")
+        return item.future
+
+    def size(self) -> int:
+        return self._q.qsize()
+
+    def take_batch(self, max_items: int, interval_s: float, wait_s: float) -> list[PendingTx]:
+        """
+        Birinchi tx ni wait_s gacha kutadi, keyin interval_s ichida
+        max_items tagacha yig'adi (qaysi biri oldin bo'lsa).
+        """
+        return drain_batch(self._q, max_items, interval_s, wait_s)
+
+
+def seal_batch(db: Session, items: list[PendingTx]) -> None:
+    """
+    items ni bitta DB tranzaksiyada bitta blockka yopadi:
+    - barcha ishtirokchi User qatorlari id tartibida bir marta lock qilinadi
+    - balans har bir tx uchun navbat tartibida qayta tekshiriladi
+    - o'tmaganlar blockka kirmaydi, ularning future i xato bilan yopiladi
+    Futurelar faqat commitdan keyin yopiladi.
+    """
+    sender_ids = {i.sender_id for i in items}
+    to_addrs = {i.to_address for i in items}
+    results: list[tuple[PendingTx, object]] = []
+
+    with db.begin():
+        by_id, by_addr = lock_parties(db, sender_ids, to_addrs)
+
+        accepted: list[tuple[PendingTx, Transaction]] = []
+        for item in items:
+            sender = by_id.get(item.sender_id)
+            receiver = by_addr.get(item.to_address)
+
+            if sender is None or sender.is_frozen:
+                results.append((item, HTTPException(status_code=403, detail="Account is frozen")))
+                continue
+            if receiver is None:
+                results.append((item, HTTPException(status_code=404, detail="Receiver not found")))
+                continue
+            if not debit(db, sender, item.amount):
+                results.append((item, HTTPException(status_code=400, detail="Insufficient balance")))
+                continue
+            credit(db, receiver, item.amount)
+
+            tx = Transaction(
+                id=uuid.uuid4(),
+                from_address=sender.address,
+                to_address=receiver.address,
+                amount=item.amount,
+                tx_type="transfer",
+                user_id=sender.id,
+            )
+            accepted.append((item, tx))
+
+        if accepted:
+            build_block(db, [tx for _, tx in accepted])
+            for item, tx in accepted:
+                db.add(tx)
+                audit_tx(db, actor=item.actor, action="TX_CREATE", entity="transactions", entity_id=str(tx.id), meta={
+                    "from": tx.from_address, "to": tx.to_address, "amount": str(item.amount), "block_index": tx.block_index
+                })
+                results.append((item, tx_out(tx)))
+
+    for item, res in results:
+        if isinstance(res, Exception):
+            item.future.set_exception(res)
+        else:
+            item.future.set_result(res)
+
+
+class BlockProducer:
+    """Mempooldan batch olib, blockka yopadigan fon thread."""
+
+    def __init__(
+        self,
+        pool: Mempool,
+        session_factory: Callable[[], Session],
+        max_txs: int,
+        interval_ms: int,
+    ):
+        self.pool = pool
+        self.session_factory = session_factory
+        self.max_txs = max(1, max_txs)
+        self.interval_s = max(0, interval_ms) / 1000.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="block-producer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is None:
+            # thread ishga tushmagan — navbatni shu yerda yopamiz
+            self._drain()
+            return
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            # hali seal qilyapti: qolganini o'zi yopadi (ikkinchi sealer chain_head uchun poyga qilmasin)
+            logger.warning("block producer still sealing after %.1fs; it will drain the mempool itself", timeout)
+
+    def _drain(self) -> None:
+        while True:
+            batch = self.pool.take_batch(self.max_txs, 0, wait_s=0)
+            if not batch:
+                break
+            self._seal(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self.pool.take_batch(self.max_txs, self.interval_s, wait_s=0.5)
+            if batch:
+                self._seal(batch)
+        # navbatda qolganlarni ham shu thread yopib ketadi
+        self._drain()
+
+    def _seal(self, batch: list[PendingTx]) -> None:
+        db = self.session_factory()
+        try:
+            tx_retry.run(seal_batch, db, batch)
+        except Exception as e:
+            logger.exception("block seal failed (%d txs)", len(batch))
+            # retry tugagan contention (503) o'zicha, boshqasi 500
+            err = e if isinstance(e, HTTPException) else HTTPException(status_code=500, detail=f"TX failed: {type(e).__name__}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(err)
+        finally:
+            db.close()
+
+
+mempool = Mempool(settings.MEMPOOL_MAX_SIZE)
+_producer: Optional[BlockProducer] = None
+
+
+def start_block_producer() -> None:
+    global _producer
+    from src.db.session import SessionLocal
+
+    _producer = BlockProducer(mempool, SessionLocal, settings.BLOCK_MAX_TXS, settings.BLOCK_INTERVAL_MS)
+    _producer.start()
+
+
+def stop_block_producer() -> None:
+    global _producer
+    if _producer is not None:
+        _producer.stop()
+        _producer = None
+
+
+def submit_and_wait(item: PendingTx, timeout: float) -> dict:
+    fut = mempool.submit(item)
+    try:
+        return fut.result(timeout=timeout)
+    except FutureTimeout:
+        raise HTTPException(status_code=504, detail="TX pending, check history later")
+
+
+async def submit_and_wait_async(item: PendingTx, timeout: float) -> dict:
+    # thread bloklanmaydi: producer futureni yopganda event loop uyg'onadi.
+    # shield: timeoutda concurrent future cancel bo'lmasin (tx baribir blockka tushadi)
+    fut = mempool.submit(item)
+    try:
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(fut)), timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="TX pending, check history later")
@@ -0,0 +1,69 @@
+# backend/src/services/merkle.py
+from __future__ import annotations
+
+import hashlib
+from typing import Sequence
+
+# RFC 6962 uslubidagi domain separation: leaf va ichki tugun hashlari
+# hech qachon to'qnashmaydi. Toq sonli darajada oxirgi tugun nusxalanmaydi,
+# balki yuqoriga o'zgarishsiz ko'tariladi (Bitcoin CVE-2012-2459 muammosi yo'q).
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def _leaf(tx_hash_hex: str) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(tx_hash_hex)).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _next_level(level: list[bytes]) -> list[bytes]:
+    sha = hashlib.sha256
+    nxt = [sha(NODE_PREFIX + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        nxt.append(level[-1])
+    return nxt
+
+
+def merkle_root(tx_hashes: Sequence[str]) -> str:
+    """
+    Block seal paytidagi tez yo'l: faqat joriy daraja xotirada,
+    hex <-> bytes o'girish bir marta (leaflarda).
+    """
+    if not tx_hashes:
+        raise ValueError("merkle tree needs at least one leaf")
+    level = [_leaf(h) for h in tx_hashes]
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0].hex()
+
+
+def merkle_proof(tx_hashes: Sequence[str], index: int) -> list[dict]:
+    """
+    index-chi leaf uchun Merkle yo'li (pastdan yuqoriga).
+    side: sibling qaysi tomonda turadi ("left" / "right").
+    """
+    if not 0 <= index < len(tx_hashes):
+        raise IndexError("leaf index out of range")
+
+    path: list[dict] = []
+    level = [_leaf(h) for h in tx_hashes]
+    i = index
+    while len(level) > 1:
+        sib = i ^ 1
+        if sib < len(level):
+            path.append({"hash": level[sib].hex(), "side": "left" if sib < i else "right"})
+        level = _next_level(level)
+        i //= 2
+    return path
+
+
+def verify_proof(tx_hash_hex: str, proof: Sequence[dict], root_hex: str) -> bool:
+    """Light client tekshiruvi: O(log n) hash."""
+    acc = _leaf(tx_hash_hex)
+    for step in proof:
+        sib = bytes.fromhex(step["hash"])
+        acc = _node(sib, acc) if step["side"] == "left" else _node(acc, sib)
+    return acc.hex() == root_hex
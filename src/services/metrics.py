@@ -0,0 +1,469 @@
+# backend/src/services/metrics.py
+"""
+Prometheus metrikalar (GET /metrics, text format 0.0.4) — tashqi kutubxonasiz.
+
+- HTTP: route shabloni bo'yicha (masalan /api/v1/explorer/tx/{tx_hash}) so'rovlar
+  soni, latency histogrammasi, in-flight — MetricsMiddleware (pure ASGI)
+- DB: har so'rovdagi query soni va vaqti (engine eventlari + ContextVar —
+  threadpool va async greenletga ham o'tadi), jami query/xato soni
+- pool checkout kutishi (db/pool.py), transfer natijalari (ok / insufficient /
+  deadlock / rejected / error), chain balandligi, audit navbati, tx retrylar
+- yozish yo'lida lock yo'q: har thread faqat o'z dict iga yozadi (threading.local),
+  o'qishda hammasi qo'shiladi; histogramma chegaralari oldindan belgilangan (bisect)
+- bir necha uvicorn worker: METRICS_DIR berilsa har worker snapshotini
+  METRICS_FLUSH_SECONDS da <dir>/<worker>.json ga yozadi; /metrics ga tushgan worker
+  hammasini qo'shadi (counter/histogram — yig'indi, to'xtagan worker hissasi ham qoladi;
+  gauge — faqat yangi snapshotlar). Papka har deployda tozalanadi
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from src.core.config import settings
+from src.db.pool import WAIT_BUCKETS
+from src.db.retry import classify
+from src.services.workers import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# shu process (uvicorn worker) identifikatori: metrics fayli nomi, stream NOTIFY dagi "o"
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+# histogramma chegaralari (sekund / dona)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+# so'rov davomidagi DB ishlari: [query soni, vaqt]; None — so'rovdan tashqarida (fon threadlar)
+_request_db: ContextVar[Optional[list]] = ContextVar("metrics_request_db", default=None)
+
+
+class _PerThread:
+    """Har thread o'z cell iga yozadi — lock kerak emas; o'lgan thread qiymatlari ham qoladi."""
+
+    def __init__(self, kind: str, name: str, help: str, labelnames: tuple[str, ...]) -> None:
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets: tuple = ()
+        self.live = False
+        self._local = threading.local()
+        self._cells: list[dict] = []
+
+    def _cell(self) -> dict:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._local.cell = {}
+            self._cells.append(cell)
+            return cell
+
+    def _copies(self) -> list[dict]:
+        return [dict(c) for c in list(self._cells)]
+
+
+class Counter(_PerThread):
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), kind: str = "counter") -> None:
+        super().__init__(kind, name, help, labelnames)
+
+    def inc(self, *labels: str, n: float = 1) -> None:
+        cell = self._cell()
+        cell[labels] = cell.get(labels, 0) + n
+
+    def collect(self) -> dict:
+        out: dict = {}
+        for cell in self._copies():
+            for k, v in cell.items():
+                out[k] = out.get(k, 0) + v
+        return out
+
+
+class Gauge(Counter):
+    """inc/dec bir threadda juft bo'lsa (middleware — event loop) yig'indi joriy qiymat."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames, kind="gauge")
+
+    def dec(self, *labels: str, n: float = 1) -> None:
+        self.inc(*labels, n=-n)
+
+
+class Histogram(_PerThread):
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS) -> None:
+        super().__init__("histogram", name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        cell = self._cell()
+        row = cell.get(labels)
+        if row is None:
+            # [bucket countlar..., +Inf, sum]
+            row = cell[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect.bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def collect(self) -> dict:
+        out: dict = {}
+        for cell in self._copies():
+            for k, row in cell.items():
+                acc = out.get(k)
+                if acc is None:
+                    out[k] = list(row)
+                else:
+                    for i, v in enumerate(row):
+                        acc[i] += v
+        return out
+
+
+class Sampled:
+    """Boshqa modul holatidan o'qiladigan metrika; live=True — har workerda emas, scrape paytida bir marta."""
+
+    def __init__(self, kind: str, name: str, help: str, fn: Callable[[], dict],
+                 labelnames: tuple[str, ...] = (), buckets: tuple = (), live: bool = False) -> None:
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self.live = live
+        self._fn = fn
+
+    def collect(self) -> dict:
+        return self._fn()
+
+
+HTTP_REQUESTS = Counter("lord_http_requests_total", "HTTP requests", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("lord_http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("lord_http_requests_in_flight", "HTTP requests being served")
+DB_QUERIES = Counter("lord_db_queries_total", "SQL statements executed")
+DB_ERRORS = Counter("lord_db_errors_total", "SQL statement / connection errors")
+DB_QUERY_SECONDS = Histogram("lord_db_query_duration_seconds", "SQL statement latency", buckets=QUERY_BUCKETS)
+DB_REQUEST_QUERIES = Histogram("lord_db_queries_per_request", "SQL statements per HTTP request", ("route",),
+                               buckets=QUERY_COUNT_BUCKETS)
+DB_REQUEST_SECONDS = Histogram("lord_db_time_per_request_seconds", "SQL time per HTTP request", ("route",))
+TRANSFERS = Counter("lord_transfers_total", "Transfer requests by outcome", ("kind", "outcome"))
+
+
+# -------------------- boshqa modullardan o'qiladiganlar --------------------
+
+def _engines() -> list[tuple[str, object]]:
+    from src.db.async_session import async_engine_started, get_async_engine
+    from src.db.session import engine
+
+    out = [("sync", engine)]
+    if async_engine_started():
+        out.append(("async", get_async_engine().sync_engine))
+    return out
+
+
+def _pool_wait() -> dict:
+    out = {}
+    for label, eng in _engines():
+        metrics = getattr(eng.pool, "metrics", None)
+        if metrics is not None:
+            counts, wait_sum = metrics.raw()
+            out[(label,)] = counts + [wait_sum]
+    return out
+
+
+def _pool_timeouts() -> dict:
+    return {(label,): eng.pool.metrics.timeouts for label, eng in _engines() if hasattr(eng.pool, "metrics")}
+
+
+def _pool_checked_out() -> dict:
+    return {(label,): eng.pool.checkedout() for label, eng in _engines() if hasattr(eng.pool, "checkedout")}
+
+
+def _audit_queue() -> dict:
+    from src.services.audit import audit_writer_stats
+
+    return {(): audit_writer_stats().get("queue_depth", 0)}
+
+
+def _tx_conflicts() -> dict:
+    from src.db.retry import tx_retry
+
+    return {(kind,): n for kind, n in tx_retry.by_kind.items()}
+
+
+def _tx_gave_up() -> dict:
+    from src.db.retry import tx_retry
+
+    return {(): tx_retry.gave_up}
+
+
+def _chain_height() -> dict:
+    from src.db.session import SessionLocal
+    from src.models.chain_head import CHAIN_HEAD_ID, ChainHead
+
+    db = SessionLocal()
+    try:
+        head = db.get(ChainHead, CHAIN_HEAD_ID)
+        return {(): head.block_index if head else 0}
+    finally:
+        db.close()
+
+
+SAMPLED = (
+    Sampled("histogram", "lord_db_pool_checkout_wait_seconds", "Pool checkout wait", _pool_wait, ("pool",), WAIT_BUCKETS),
+    Sampled("counter", "lord_db_pool_checkout_timeouts_total", "Pool checkout timeouts", _pool_timeouts, ("pool",)),
+    Sampled("gauge", "lord_db_pool_checked_out", "Connections checked out", _pool_checked_out, ("pool",)),
+    Sampled("gauge", "lord_audit_queue_depth", "Audit writer queue depth", _audit_queue),
+    Sampled("counter", "lord_tx_conflicts_total", "Retryable DB conflicts by kind", _tx_conflicts, ("kind",)),
+    Sampled("counter", "lord_tx_retries_gave_up_total", "Transactions failed after retries", _tx_gave_up),
+    Sampled("gauge", "lord_chain_height", "Last sealed block index", _chain_height, live=True),
+)
+
+REGISTRY = (HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT, DB_QUERIES, DB_ERRORS, DB_QUERY_SECONDS,
+            DB_REQUEST_QUERIES, DB_REQUEST_SECONDS, TRANSFERS) + SAMPLED
+_BY_NAME = {m.name: m for m in REGISTRY}
+
+
+# -------------------- yozish nuqtalari --------------------
+
+def instrument_engine(sync_engine) -> None:
+    """Har SQL statement: jami soni/vaqti va joriy HTTP so'rov hisobiga."""
+    if not settings.METRICS_ENABLED:
+        return
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["metrics_t0"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        t0 = conn.info.pop("metrics_t0", None)
+        if t0 is None:
+            return
+        dt = time.perf_counter() - t0
+        DB_QUERIES.inc()
+        DB_QUERY_SECONDS.observe(dt)
+        acc = _request_db.get()
+        if acc is not None:
+            acc[0] += 1
+            acc[1] += dt
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(ctx):
+        if ctx.connection is not None:
+            ctx.connection.info.pop("metrics_t0", None)
+        DB_ERRORS.inc()
+
+
+def transfer_outcome(e: HTTPException) -> str:
+    if e.status_code == 400 and e.detail == "Insufficient balance":
+        return "insufficient"
+    if classify(e.__cause__) is not None:
+        # tx_retry: deadlock/serialization/lock timeout retrylari tugadi (503)
+        return "deadlock"
+    if e.status_code >= 500:
+        return "error"
+    return "rejected"
+
+
+@contextmanager
+def track_transfer(kind: str) -> Iterator[None]:
+    try:
+        yield
+    except HTTPException as e:
+        TRANSFERS.inc(kind, transfer_outcome(e))
+        raise
+    except Exception:
+        TRANSFERS.inc(kind, "error")
+        raise
+    TRANSFERS.inc(kind, "ok")
+
+
+def _route_label(scope: dict) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path_format", route.path)
+    if "endpoint" in scope:
+        # Mount (/ui static): bitta label, fayl yo'llari emas
+        return f"{scope.get('root_path', '')}/*"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI, eng tashqi qatlam: 429/CORS preflight ham hisoblanadi."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def _send(msg):
+            nonlocal status
+            if msg["type"] == "http.response.start":
+                status = msg["status"]
+            await send(msg)
+
+        acc = [0, 0.0]
+        token = _request_db.set(acc)
+        HTTP_IN_FLIGHT.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            dt = time.perf_counter() - t0
+            HTTP_IN_FLIGHT.dec()
+            _request_db.reset(token)
+            method, route = scope["method"], _route_label(scope)
+            HTTP_REQUESTS.inc(method, route, str(status))
+            HTTP_LATENCY.observe(dt, method, route)
+            DB_REQUEST_QUERIES.observe(acc[0], route)
+            DB_REQUEST_SECONDS.observe(acc[1], route)
+
+
+# -------------------- snapshot, workerlarni qo'shish, render --------------------
+
+def snapshot() -> dict:
+    """Shu workerning qiymatlari (JSON ga yoziladigan ko'rinishda)."""
+    families = {}
+    for m in REGISTRY:
+        if m.live:
+            continue
+        try:
+            samples = m.collect()
+        except Exception:
+            logger.exception("metric collect failed: %s", m.name)
+            continue
+        families[m.name] = [[list(k), v] for k, v in samples.items()]
+    return {"worker": WORKER_ID, "ts": time.time(), "families": families}
+
+
+def merge(snapshots: list[dict], stale_after: float) -> dict[str, dict]:
+    now = time.time()
+    out: dict[str, dict] = {}
+    for snap in snapshots:
+        fresh = now - snap["ts"] <= stale_after
+        for name, samples in snap["families"].items():
+            m = _BY_NAME.get(name)
+            if m is None or (m.kind == "gauge" and not fresh):
+                continue
+            fam = out.setdefault(name, {})
+            for labels, v in samples:
+                k = tuple(labels)
+                cur = fam.get(k)
+                if cur is None:
+                    fam[k] = list(v) if m.kind == "histogram" else v
+                elif m.kind == "histogram":
+                    fam[k] = [a + b for a, b in zip(cur, v)]
+                else:
+                    fam[k] = cur + v
+    return out
+
+
+def _write(directory: Path, snap: dict) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / f".{WORKER_ID}.tmp"
+    tmp.write_text(json.dumps(snap))
+    # atomar almashtirish — boshqa worker yarim yozilgan faylni o'qimaydi
+    os.replace(tmp, directory / f"{WORKER_ID}.json")
+
+
+def collect_all() -> dict[str, dict]:
+    own = snapshot()
+    snaps = [own]
+    if settings.METRICS_DIR:
+        directory = Path(settings.METRICS_DIR)
+        _write(directory, own)
+        for p in directory.glob("*.json"):
+            if p.stem == WORKER_ID:
+                continue
+            try:
+                snaps.append(json.loads(p.read_text()))
+            except (OSError, ValueError):
+                continue
+    families = merge(snaps, max(10.0, 3 * settings.METRICS_FLUSH_SECONDS))
+    for m in REGISTRY:
+        if m.live:
+            try:
+                families[m.name] = m.collect()
+            except Exception:
+                logger.exception("metric collect failed: %s", m.name)
+    return families
+
+
+def _esc(v: object) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: tuple = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_esc(v)}"' for k, v in pairs) + "}"
+
+
+def render(families: dict[str, dict]) -> str:
+    lines = []
+    for m in REGISTRY:
+        samples = families.get(m.name, {})
+        if not samples and not m.labelnames and not m.live:
+            samples = {(): [0] * (len(m.buckets) + 2) if m.kind == "histogram" else 0}
+        lines.append(f"# HELP {m.name} {m.help}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        for k in sorted(samples):
+            v = samples[k]
+            if m.kind != "histogram":
+                lines.append(f"{m.name}{_labels(m.labelnames, k)} {v}")
+                continue
+            acc = 0
+            for le, n in zip(m.buckets + ("+Inf",), v[:-1]):
+                acc += n
+                lines.append(f"{m.name}_bucket{_labels(m.labelnames, k, (('le', le),))} {acc}")
+            lines.append(f"{m.name}_sum{_labels(m.labelnames, k)} {v[-1]}")
+            lines.append(f"{m.name}_count{_labels(m.labelnames, k)} {acc}")
+    return "\n".join(lines) + "\n"
+
+
+# -------------------- ko'p worker: fon flush --------------------
+
+class MetricsFlusher(PeriodicWorker):
+    name = "metrics-flusher"
+    min_interval_s = 0.5
+
+    def __init__(self, directory: Path, interval_s: float):
+        self.directory = directory
+        super().__init__(None, interval_s, lambda: _write(self.directory, snapshot()))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        super().stop(timeout)
+        # to'xtagan worker counterlari yig'indida qolsin
+        self._safe_tick()
+
+
+_flusher: Optional[MetricsFlusher] = None
+
+
+def start_metrics_flusher() -> None:
+    global _flusher
+    _flusher = MetricsFlusher(Path(settings.METRICS_DIR), settings.METRICS_FLUSH_SECONDS)
+    _flusher.start()
+
+
+def stop_metrics_flusher() -> None:
+    global _flusher
+    if _flusher is not None:
+        _flusher.stop()
+        _flusher = None
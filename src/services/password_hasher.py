@@ -0,0 +1,156 @@
+# backend/src/services/password_hasher.py
+"""
+bcrypt uchun alohida, chegaralangan executor.
+
+- PASSWORD_HASH_WORKERS ta thread (bcrypt GIL ni qo'yib yuboradi — process shart emas);
+  Starlette threadpooli transfer/explorer uchun bo'sh qoladi
+- ishlayotgan + navbatdagi hash soni PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_MAX
+  dan oshsa darhol 503 (Retry-After) — navbat cheksiz o'smaydi
+- cost PASSWORD_BCRYPT_ROUNDS dan past hashlar loginda qayta hashlanadi
+- metrikalar: navbatda kutish va hash vaqti histogrammasi, rad etilganlar soni
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from src.core.config import settings
+from src.db.pool import BucketHistogram
+
+# sekund; bcrypt 12 rounds ~ 0.2-0.3s
+HASH_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_BCRYPT_RE = re.compile(r"^\$2[aby]\$(\d{2})\$")
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, queue_max: int, rounds: int):
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_max)
+        self.rounds = rounds
+        self.ctx = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.wait = BucketHistogram(HASH_BUCKETS)
+        self.hash_time = BucketHistogram(HASH_BUCKETS)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwhash")
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Auth is busy, retry later",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+
+    def _release(self, _fut=None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _timed(self, fn: Callable, queued_at: float, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            done = time.perf_counter()
+            with self._lock:
+                self.wait.observe(started - queued_at)
+                self.hash_time.observe(done - started)
+
+    async def run(self, fn: Callable, *args):
+        self._acquire()
+        try:
+            fut = self._executor().submit(self._timed, fn, time.perf_counter(), *args)
+        except BaseException:
+            self._release()
+            raise
+        # slot future tugaganda bo'shaydi — navbatda turganda bekor qilinsa ham
+        # (klient uzildi / timeout: wrap_future concurrent futureni cancel qiladi, _timed ishlamaydi)
+        fut.add_done_callback(self._release)
+        return await asyncio.wrap_future(fut)
+
+    # --- sof (sync) amallar: executor threadida ishlaydi ---
+    def needs_rehash(self, hashed: str) -> bool:
+        m = _BCRYPT_RE.match(hashed or "")
+        return m is None or int(m.group(1)) < self.rounds
+
+    def _verify_and_update(self, password: str, hashed: str) -> tuple[bool, Optional[str]]:
+        try:
+            ok = self.ctx.verify(password, hashed)
+        except (ValueError, TypeError):
+            # buzilgan / noma'lum formatdagi hash
+            return False, None
+        if ok and self.needs_rehash(hashed):
+            return True, self.ctx.hash(password)
+        return ok, None
+
+    # --- async API ---
+    async def hash(self, password: str) -> str:
+        return await self.run(self.ctx.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, Optional[str]]:
+        """(to'g'rimi, yangi hash yoki None). Yangi hash — eski cost bo'lsa."""
+        ok, new_hash = await self.run(self._verify_and_update, password, hashed)
+        if new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return ok, new_hash
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "bcrypt_rounds": self.rounds,
+                "queue_wait_seconds": self.wait.snapshot(),
+                "hash_seconds": self.hash_time.snapshot(),
+            }
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher(
+                    settings.PASSWORD_HASH_WORKERS,
+                    settings.PASSWORD_HASH_QUEUE_MAX,
+                    settings.PASSWORD_BCRYPT_ROUNDS,
+                )
+    return _hasher
+
+
+def stop_password_hasher() -> None:
+    global _hasher
+    if _hasher is not None:
+        h, _hasher = _hasher, None
+        h.shutdown()
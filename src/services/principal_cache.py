@@ -0,0 +1,96 @@
+# backend/src/services/principal_cache.py
+"""
+Autentifikatsiya qilingan foydalanuvchi (principal) uchun chegaralangan
+TTL + LRU cache, kalit — JWT subject (email).
+
+Admin freeze/unfreeze qilganda invalidate() chaqiriladi. Boshqa uvicorn
+workerlardagi nusxa eng ko'pi bilan TTL davomida eski qolishi mumkin —
+pul harakatida is_frozen baribir lock qilingan qatordan qayta tekshiriladi.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from src.core.config import settings
+from src.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: uuid.UUID
+    email: str
+    address: str
+    is_frozen: bool
+
+    @classmethod
+    def from_user(cls, u: User) -> "Principal":
+        return cls(id=u.id, email=u.email, address=u.address, is_frozen=bool(u.is_frozen))
+
+
+class PrincipalCache:
+    def __init__(self, maxsize: int, ttl_s: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = max(0, maxsize)
+        self.ttl_s = ttl_s
+        self.clock = clock
+        self._data: "OrderedDict[str, tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, subject: str) -> Optional[Principal]:
+        with self._lock:
+            item = self._data.get(subject)
+            if item is None:
+                self.misses += 1
+                return None
+            expires, principal = item
+            if expires <= self.clock():
+                del self._data[subject]
+                self.misses += 1
+                return None
+            self._data.move_to_end(subject)
+            self.hits += 1
+            return principal
+
+    def put(self, subject: str, principal: Principal) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[subject] = (self.clock() + self.ttl_s, principal)
+            self._data.move_to_end(subject)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, subject: str) -> None:
+        with self._lock:
+            if self._data.pop(subject, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
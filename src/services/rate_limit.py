@@ -1,20 +1,326 @@
+# backend/src/services/rate_limit.py
+"""
+GCRA (Generic Cell Rate Algorithm) rate limiter.
+
+Har kalit uchun bitta son saqlanadi — TAT (theoretical arrival time):
+- T   = window / limit  (bitta so'rov "narxi", sekund)
+- tau = T * burst       (bir zumda ruxsat etilgan hajm)
+So'rov keladi: new_tat = max(tat, now) + T; new_tat - now > tau bo'lsa rad etiladi.
+Xotira va vaqt — kalitga O(1). tat <= now bo'lgan kalit "to'liq bo'sh" bucket
+bilan bir xil, shuning uchun uni o'chirib yuborish xavfsiz (idle eviction).
+
+Backend:
+- memory: bitta process ichida (dict + lock)
+- sqlite: bitta fayl, bir hostdagi barcha uvicorn workerlar uchun umumiy
+"""
+from __future__ import annotations
+
+import hashlib
+import ipaddress
+import json
+import logging
+import sqlite3
+import threading
 import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import anyio
+
+from src.core.config import settings
+from src.services.workers import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    def hit(self, key: str, period: float, burst: int, now: float) -> tuple[bool, float]:
+        """(allowed, retry_after_seconds)"""
+
+    @abstractmethod
+    def evict(self, now: float) -> int:
+        """tat <= now bo'lgan (idle) kalitlarni o'chiradi, nechtasini qaytaradi."""
+
+    def close(self) -> None:
+        pass
+
+
+def _gcra(tat: Optional[float], period: float, burst: int, now: float) -> tuple[bool, float, float]:
+    """(allowed, retry_after, tat_to_store)"""
+    tat = now if tat is None or tat < now else tat
+    new_tat = tat + period
+    tau = period * burst
+    if new_tat - now > tau:
+        return False, new_tat - now - tau, tat
+    return True, 0.0, new_tat
+
+
+class MemoryBackend(RateLimitBackend):
+    def __init__(self) -> None:
+        self._tat: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, period: float, burst: int, now: float) -> tuple[bool, float]:
+        with self._lock:
+            allowed, retry, tat = _gcra(self._tat.get(key), period, burst, now)
+            if allowed:
+                self._tat[key] = tat
+            return allowed, retry
+
+    def evict(self, now: float) -> int:
+        with self._lock:
+            idle = [k for k, tat in self._tat.items() if tat <= now]
+            for k in idle:
+                del self._tat[k]
+            return len(idle)
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Workerlar orasida umumiy holat. BEGIN IMMEDIATE — o'qish+yozish bitta
+    yozuv lockida, ikki worker bitta TAT ni bir vaqtda surolmaydi.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        db = self._conn()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("create table if not exists rate_limits (key text primary key, tat real not null)")
+        db.execute("create index if not exists ix_rate_limits_tat on rate_limits (tat)")
+
+    def _conn(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def hit(self, key: str, period: float, burst: int, now: float) -> tuple[bool, float]:
+        db = self._conn()
+        db.execute("begin immediate")
+        try:
+            row = db.execute("select tat from rate_limits where key = ?", (key,)).fetchone()
+            allowed, retry, tat = _gcra(row[0] if row else None, period, burst, now)
+            if allowed:
+                db.execute(
+                    "insert into rate_limits (key, tat) values (?, ?) "
+                    "on conflict(key) do update set tat = excluded.tat",
+                    (key, tat),
+                )
+            db.execute("commit")
+        except Exception:
+            db.execute("rollback")
+            raise
+        return allowed, retry
+
+    def evict(self, now: float) -> int:
+        cur = self._conn().execute("delete from rate_limits where tat <= ?", (now,))
+        return cur.rowcount
+
+    def close(self) -> None:
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+def make_backend(kind: Optional[str] = None) -> RateLimitBackend:
+    kind = (kind or settings.RATE_LIMIT_BACKEND).lower()
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(settings.RATE_LIMIT_SQLITE_PATH)
+    raise ValueError(f"unknown rate limit backend: {kind}")
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, clock: Callable[[], float] = time.time) -> None:
+        self.backend = backend
+        self.clock = clock
+
+    def hit(self, key: str, limit: int, window_seconds: float, burst: Optional[int] = None) -> tuple[bool, float]:
+        """limit ta so'rov / window_seconds; burst — bir zumda nechtasi (sukut: limit)."""
+        return self.backend.hit(key, window_seconds / limit, burst or limit, self.clock())
+
+    def evict(self) -> int:
+        return self.backend.evict(self.clock())
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(make_backend())
+    return _limiter
 
-# key -> list[timestamps]
-_BUCKETS: dict[str, list[int]] = {}
 
 def allow(key: str, limit: int, window_seconds: int) -> bool:
     """
-    Sliding window:
-    - limit: nechta ruxsat
-    - window_seconds: nechchi sekund ichida
+    Eski API: limit ta ruxsat / window_seconds ichida.
     """
-    now = int(time.time())
-    arr = _BUCKETS.get(key, [])
-    arr = [t for t in arr if now - t < window_seconds]
-    if len(arr) >= limit:
-        _BUCKETS[key] = arr
+    return get_limiter().hit(key, limit, window_seconds)[0]
+
+
+# -------------------- idle eviction --------------------
+class Evictor(PeriodicWorker):
+    """Har interval_s da idle kalitlarni tozalaydigan fon thread."""
+
+    name = "rate-limit-evictor"
+
+    def __init__(self, limiter: RateLimiter, interval_s: float) -> None:
+        super().__init__(None, interval_s, limiter.evict)
+        self.limiter = limiter
+
+
+_evictor: Optional[Evictor] = None
+
+
+def start_rate_limit_evictor() -> None:
+    global _evictor
+    _evictor = Evictor(get_limiter(), settings.RATE_LIMIT_EVICT_SECONDS)
+    _evictor.start()
+
+
+def stop_rate_limit_evictor() -> None:
+    global _evictor
+    if _evictor is not None:
+        _evictor.stop()
+        _evictor = None
+
+
+# -------------------- middleware --------------------
+@dataclass(frozen=True)
+class Policy:
+    name: str
+    method: str
+    path_prefix: str
+    limit: int
+    window_seconds: float
+    # "ip" yoki "token" (Authorization bo'lsa token bo'yicha, bo'lmasa ip)
+    key_by: str = "ip"
+
+
+def parse_rate(spec: str) -> tuple[int, float]:
+    """ "10/60" -> (10, 60.0) """
+    limit, window = spec.split("/", 1)
+    return int(limit), float(window)
+
+
+def default_policies() -> list[Policy]:
+    auth_limit, auth_window = parse_rate(settings.RATE_LIMIT_AUTH)
+    tx_limit, tx_window = parse_rate(settings.RATE_LIMIT_TX)
+    return [
+        Policy("auth", "POST", "/api/v1/auth/", auth_limit, auth_window),
+        Policy("admin_login", "POST", "/api/v1/admin/login", auth_limit, auth_window),
+        Policy("tx", "POST", "/api/v1/tx/", tx_limit, tx_window, key_by="token"),
+    ]
+
+
+def parse_proxies(spec: str) -> tuple:
+    """ "10.0.0.0/8, 127.0.0.1" -> tarmoqlar tuple i """
+    return tuple(ipaddress.ip_network(p.strip(), strict=False) for p in spec.split(",") if p.strip())
+
+
+def _trusted(ip: str, proxies: tuple) -> bool:
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
         return False
-    arr.append(now)
-    _BUCKETS[key] = arr
-    return True
+    return any(addr in net for net in proxies)
+
+
+def client_ip(scope: dict, proxies: tuple = ()) -> str:
+    """
+    TCP peer; peer ishonchli proxy bo'lsa X-Forwarded-For o'ngdan chapga o'qiladi
+    va birinchi ishonchsiz manzil olinadi (chap tomonini mijoz soxtalashtira oladi).
+    """
+    client = scope.get("client")
+    ip = client[0] if client else "unknown"
+    if not proxies or not _trusted(ip, proxies):
+        return ip
+    forwarded = b",".join(v for n, v in scope.get("headers") or () if n == b"x-forwarded-for")
+    for hop in reversed(forwarded.decode("latin-1").split(",")):
+        hop = hop.strip()
+        if not hop:
+            continue
+        ip = hop
+        if not _trusted(hop, proxies):
+            break
+    return ip
+
+
+def _client_key(scope: dict, key_by: str, proxies: tuple = ()) -> str:
+    if key_by == "token":
+        for name, value in scope.get("headers") or ():
+            if name == b"authorization":
+                # token o'zi saqlanmaydi
+                return "t:" + hashlib.sha256(value).hexdigest()[:32]
+    return "ip:" + client_ip(scope, proxies)
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware: mos policy topilsa GCRA tekshiradi, limitdan oshsa
+    handler/DB ga yetmasdan 429 + Retry-After qaytaradi.
+    """
+
+    def __init__(
+        self,
+        app,
+        policies: Optional[list[Policy]] = None,
+        limiter: Optional[RateLimiter] = None,
+        trusted_proxies: Optional[str] = None,
+    ) -> None:
+        self.app = app
+        self.policies = policies if policies is not None else default_policies()
+        self._limiter = limiter
+        self.proxies = parse_proxies(settings.RATE_LIMIT_TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies)
+
+    @property
+    def limiter(self) -> RateLimiter:
+        return self._limiter or get_limiter()
+
+    def _match(self, scope: dict) -> Optional[Policy]:
+        method, path = scope.get("method"), scope.get("path", "")
+        for p in self.policies:
+            if p.method == method and path.startswith(p.path_prefix):
+                return p
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        policy = self._match(scope)
+        if policy is None:
+            return await self.app(scope, receive, send)
+
+        key = f"{policy.name}:{_client_key(scope, policy.key_by, self.proxies)}"
+        limiter = self.limiter
+        if isinstance(limiter.backend, MemoryBackend):
+            allowed, retry = limiter.hit(key, policy.limit, policy.window_seconds)
+        else:
+            # sqlite lock kutishi event loopni to'xtatmasin
+            allowed, retry = await anyio.to_thread.run_sync(limiter.hit, key, policy.limit, policy.window_seconds)
+        if allowed:
+            return await self.app(scope, receive, send)
+
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, int(retry + 0.999))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,24 +1,38 @@
 from __future__ import annotations
 
+import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Any, Dict
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import jwt
 
 from src.core.config import settings
-from src.db.session import get_db
-from sqlalchemy.orm import Session
+from src.deps.auth import JWT_ALG, JWT_SECRET
+from src.services.password_hasher import get_hasher
 
-from src.db.models import User  # sende model nomi boshqacha bo‘lsa moslab qo‘y
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+def get_password_hash(password: str) -> str:
+    """Sync variant (skriptlar/testlar). Endpointlar get_hasher().hash() ishlatadi."""
+    return get_hasher().ctx.hash(password)
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    try:
+        return get_hasher().ctx.verify(password, hashed)
+    except (ValueError, TypeError):
+        return False
+
+
+def new_address() -> str:
+    # 40 hex belgi (160 bit) — users.address unique
+    return secrets.token_hex(20)
+
 
 def create_access_token(*, subject: str, extra: Optional[Dict[str, Any]] = None, expires_minutes: Optional[int] = None) -> str:
     """
     subject -> JWT ichidagi 'sub' bo‘ladi.
     /users/me 401 bermasligi uchun sub DOIM bo‘lishi shart.
+    Imzo deps/auth dagi JWT_SECRET/JWT_ALG bilan (o'sha yerda tekshiriladi).
     """
     if not subject:
         raise ValueError("subject is required for JWT sub")
@@ -29,37 +43,8 @@ def create_access_token(*, subject: str, extra: Optional[Dict[str, Any]] = None,
     if extra:
         to_encode.update(extra)
 
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALG)
 
-def decode_token(token: str) -> Dict[str, Any]:
-    try:
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
-    payload = decode_token(token)
-    subject = payload.get("sub")
 
-    if not subject:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token missing sub",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    # subject sifatida email ishlatyapmiz (eng qulay).
-    user = db.query(User).filter(User.email == subject).first()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    return user
\ No newline at end of file
+def decode_access_token(token: str, secret: str = JWT_SECRET) -> Dict[str, Any]:
+    return jwt.decode(token, secret, algorithms=[JWT_ALG])
@@ -0,0 +1,317 @@
+# backend/src/services/stream.py
+"""
+Yangi blocklar va manzil bo'yicha tx/balans o'zgarishlari uchun push kanal
+(SSE / WebSocket: routers/stream.py) — frontend /users/me va explorerni poll qilmasin.
+
+- build_block / transfer_core blockni sessiyaga "stage" qiladi (db.info); event
+  faqat commitdan keyin publish bo'ladi (after_commit), rollback/retry da tashlanadi
+- Broker: in-process pub/sub, topiclar "blocks" va "addr:<address>"; har
+  subscriberda chegaralangan buffer (STREAM_BUFFER_SIZE) — to'lsa subscriber uziladi
+  ("lagged" event, klient qayta ulanib holatni o'qiydi), publisher hech qachon kutmaydi
+- boshqa uvicorn workerlar: PostgreSQL da tranzaksiya ichida
+  pg_notify(STREAM_CHANNEL, {"o": worker, "b": block_index}) — commit bilan birga
+  yetkaziladi; har worker bitta LISTEN thread bilan blockni DB dan o'qib (faqat
+  subscriber bo'lsa) o'z subscriberlariga tarqatadi, o'zining NOTIFY ini o'tkazib yuboradi
+- LISTEN sessiya holati: PgBouncer transaction pooling orqali ishlamaydi —
+  STREAM_LISTEN_URL to'g'ridan-to'g'ri PostgreSQL ga (NOTIFY o'zi pgbouncer orqali ham ishlaydi)
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import select as _select
+import threading
+from collections import deque
+from decimal import Decimal
+from typing import Callable, Iterable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from src.core.config import settings
+from src.services.metrics import WORKER_ID
+
+logger = logging.getLogger(__name__)
+
+BLOCKS = "blocks"
+
+_AMOUNT_Q = Decimal("0.00000001")
+_NOTIFY = text("SELECT pg_notify(:ch, :payload)")
+
+
+def addr_topic(address: str) -> str:
+    return f"addr:{address}"
+
+
+class Lagged(Exception):
+    """Subscriber bufferi to'ldi — uzildi."""
+
+
+class Subscriber:
+    """Bitta SSE/WS ulanish; barcha metodlar o'z event loopida ishlaydi."""
+
+    def __init__(self, broker: "Broker", topics: set[str], maxsize: int, loop: asyncio.AbstractEventLoop):
+        self.broker = broker
+        self.topics = topics
+        self.maxsize = max(1, maxsize)
+        self.loop = loop
+        self.buf: deque = deque()
+        self.lagged = False
+        self._ready = asyncio.Event()
+
+    def _offer(self, ev: dict) -> None:
+        if self.lagged:
+            return
+        if len(self.buf) >= self.maxsize:
+            self.lagged = True
+            self.broker._on_lagged(self)
+        else:
+            self.buf.append(ev)
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        """Keyingi event; timeout ichida kelmasa None (keepalive yuborish uchun)."""
+        while not self.buf:
+            if self.lagged:
+                raise Lagged()
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.buf.popleft()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    def __init__(self, buffer_size: int, max_subscribers: int):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._subs: set[Subscriber] = set()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+        self.remote_blocks = 0
+
+    def _check_capacity(self) -> None:
+        if len(self._subs) >= self.max_subscribers:
+            raise HTTPException(status_code=503, detail="Too many stream subscribers",
+                                headers={"Retry-After": "5"})
+
+    def check_capacity(self) -> None:
+        """Ro'yxatga olmasdan limitni tekshiradi (SSE: javob boshlanishidan oldin 503)."""
+        with self._lock:
+            self._check_capacity()
+
+    def subscribe(self, topics: Iterable[str]) -> Subscriber:
+        sub = Subscriber(self, set(topics), self.buffer_size, asyncio.get_running_loop())
+        with self._lock:
+            self._check_capacity()
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subs)
+
+    def _on_lagged(self, sub: Subscriber) -> None:
+        with self._lock:
+            self.dropped_subscribers += 1
+            self._subs.discard(sub)
+
+    def publish(self, events: list[tuple[str, dict]]) -> None:
+        """Istalgan threaddan; hech qachon bloklanmaydi."""
+        with self._lock:
+            subs = list(self._subs)
+            self.published += len(events)
+        for sub in subs:
+            for topic, ev in events:
+                if topic not in sub.topics:
+                    continue
+                try:
+                    sub.loop.call_soon_threadsafe(sub._offer, ev)
+                except RuntimeError:
+                    # loop yopilgan (ulanish allaqachon tugagan)
+                    self.unsubscribe(sub)
+                    break
+                with self._lock:
+                    self.delivered += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subs),
+                "max_subscribers": self.max_subscribers,
+                "buffer_size": self.buffer_size,
+                "published": self.published,
+                "delivered": self.delivered,
+                "dropped_subscribers": self.dropped_subscribers,
+                "remote_blocks": self.remote_blocks,
+                "listener": _listener is not None and _listener.connected,
+            }
+
+
+broker = Broker(settings.STREAM_BUFFER_SIZE, settings.STREAM_MAX_SUBSCRIBERS)
+
+
+def block_events(block_index: int, block_hash: str, txs: list[dict]) -> list[tuple[str, dict]]:
+    """txs: tx_hash, from_address, to_address, amount (commit qilingan block)."""
+    out = [(BLOCKS, {"type": "block", "block_index": block_index, "block_hash": block_hash, "tx_count": len(txs)})]
+    for t in txs:
+        # lokal (Decimal) va LISTEN (Numeric) yo'llarida bir xil ko'rinish
+        amount = str(Decimal(str(t["amount"])).quantize(_AMOUNT_Q))
+        for address, direction, delta in (
+            (t["from_address"], "out", f"-{amount}"),
+            (t["to_address"], "in", amount),
+        ):
+            out.append((addr_topic(address), {
+                "type": "tx", "address": address, "direction": direction, "delta": delta,
+                "tx_hash": t["tx_hash"], "block_index": block_index,
+            }))
+    return out
+
+
+def _pg_notify_enabled(db: Session) -> bool:
+    return settings.STREAM_PG_NOTIFY and db.get_bind().dialect.name == "postgresql"
+
+
+def stage_block(db: Session, block_index: int, block_hash: str, txs: list[dict]) -> None:
+    """Tranzaksiya ichida chaqiriladi: eventlar commitdan keyin, NOTIFY commit bilan birga."""
+    if not settings.STREAM_ENABLED:
+        return
+    db.info.setdefault("stream_after_commit", []).extend(block_events(block_index, block_hash, txs))
+    if _pg_notify_enabled(db):
+        payload = json.dumps({"o": WORKER_ID, "b": block_index})
+        db.connection().execute(_NOTIFY, {"ch": settings.STREAM_CHANNEL, "payload": payload})
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(db: Session) -> None:
+    pending = db.info.pop("stream_after_commit", None)
+    if pending:
+        broker.publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_rollback(db: Session) -> None:
+    db.info.pop("stream_after_commit", None)
+
+
+# -------------------- LISTEN (boshqa workerlar) --------------------
+
+_LOAD_BLOCK = text("""
+SELECT b.block_hash, t.tx_hash, t.from_address, t.to_address, t.amount
+FROM blocks b JOIN transactions t ON t.block_index = b.block_index
+WHERE b.block_index = :bi
+ORDER BY t.block_pos
+""")
+
+
+def load_block_events(db: Session, block_index: int) -> list[tuple[str, dict]]:
+    rows = db.execute(_LOAD_BLOCK, {"bi": block_index}).all()
+    if not rows:
+        return []
+    return block_events(block_index, rows[0].block_hash, [r._asdict() for r in rows])
+
+
+class StreamListener:
+    """Bitta to'g'ridan-to'g'ri ulanishda LISTEN; uzilsa backoff bilan qayta ulanadi."""
+
+    def __init__(self, url: str, channel: str, session_factory: Callable[[], Session]):
+        self.url = url
+        self.channel = channel
+        self.session_factory = session_factory
+        self.connected = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stream-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def handle(self, payload: str) -> None:
+        msg = json.loads(payload)
+        if msg.get("o") == WORKER_ID or not broker.has_subscribers():
+            return
+        db = self.session_factory()
+        try:
+            events = load_block_events(db, int(msg["b"]))
+        finally:
+            db.close()
+        if events:
+            broker.remote_blocks += 1
+            broker.publish(events)
+
+    def _run(self) -> None:
+        engine = create_engine(self.url, poolclass=NullPool)
+        delay = 0.5
+        while not self._stop.is_set():
+            try:
+                self._listen(engine)
+                delay = 0.5
+            except Exception:
+                logger.exception("stream LISTEN connection failed")
+            self.connected = False
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, 30.0)
+        engine.dispose()
+
+    def _listen(self, engine) -> None:
+        raw = engine.raw_connection()
+        try:
+            conn = raw.driver_connection
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f'LISTEN "{self.channel}"')
+            self.connected = True
+            while not self._stop.is_set():
+                if _select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    n = conn.notifies.pop(0)
+                    try:
+                        self.handle(n.payload)
+                    except Exception:
+                        logger.exception("stream notification failed: %s", n.payload)
+        finally:
+            raw.close()
+
+
+_listener: Optional[StreamListener] = None
+
+
+def start_stream_listener() -> None:
+    global _listener
+    from src.db.session import SessionLocal, engine
+
+    if engine.dialect.name != "postgresql":
+        return
+    url = settings.STREAM_LISTEN_URL or engine.url.render_as_string(hide_password=False)
+    _listener = StreamListener(url, settings.STREAM_CHANNEL, SessionLocal)
+    _listener.start()
+
+
+def stop_stream_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,195 @@
+# backend/src/services/transfer.py
+from __future__ import annotations
+
+import uuid
+from contextlib import contextmanager
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from src.models.transaction import Transaction
+from src.models.user import User
+from src.schemas.transaction import TxCreate
+from src.services.audit import audit_tx
+from src.services.balance_shards import credit, debit
+from src.services.blockchain import build_block
+
+
+def parse_transfer(payload: TxCreate) -> tuple[Decimal, str]:
+    amount = Decimal(str(payload.amount)).quantize(Decimal("0.00000001"))
+    if amount <= 0:
+        raise HTTPException(status_code=400, detail="Invalid amount")
+
+    to_addr = payload.to_address.strip()
+    if len(to_addr) < 3:
+        raise HTTPException(status_code=400, detail="Invalid to_address")
+    return amount, to_addr
+
+
+@contextmanager
+def tx_errors():
+    """Router chegarasi (sync va async): HTTPException o'zicha, boshqa xato -> 500."""
+    try:
+        yield
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"TX failed: {type(e).__name__}")
+
+
+def lock_parties(db: Session, sender_ids: set, to_addrs: set) -> tuple[dict, dict]:
+    """
+    Barcha ishtirokchi User qatorlarini bitta so'rovda, id tartibida lock qiladi
+    (hamma yo'llarda bir xil tartib — o'zaro deadlock bo'lmaydi).
+    FOR NO KEY UPDATE: balans o'zgaradi, kalit emas. Sharded receiverlar
+    (sender bo'lmasa) faqat FOR KEY SHARE — ular uchun users qatori kutilmaydi,
+    lekin commit keyin build_block dagi chain_head lockida baribir navbatga turadi
+    (services/balance_shards.py, "Cheklov").
+    Qaytaradi: (id -> User, address -> User).
+    """
+    users = (
+        db.query(User)
+        .filter(or_(User.id.in_(sender_ids), and_(User.address.in_(to_addrs), User.balance_shards == 0)))
+        .order_by(User.id)
+        .with_for_update(key_share=True)
+        .all()
+    )
+    by_id = {u.id: u for u in users}
+    by_addr = {u.address: u for u in users}
+
+    rest = set(to_addrs) - by_addr.keys()
+    if rest:
+        for u in (
+            db.query(User)
+            .filter(User.address.in_(rest), User.balance_shards > 0)
+            .order_by(User.id)
+            .with_for_update(read=True, key_share=True)
+        ):
+            by_addr[u.address] = u
+    return by_id, by_addr
+
+
+def transfer(db: Session, sender_id: uuid.UUID, actor: str, to_addr: str, amount: Decimal) -> Transaction:
+    """
+    Eski rejim (1 tx = 1 block): bitta atomic DB tranzaksiya.
+    Lock tartibi: sender va receiver qatorlari bitta so'rovda id tartibida
+    (lock_parties), keyin chain_head (build_block) — qarama-qarshi transferlar
+    deadlock bermaydi. Sync route to'g'ridan-to'g'ri, async route
+    AsyncSession.run_sync orqali chaqiradi (ikkalasi tx_retry ostida).
+    """
+    with db.begin():
+        by_id, by_addr = lock_parties(db, {sender_id}, {to_addr})
+        sender = by_id.get(sender_id)
+        # principal cache eski bo'lishi mumkin — lock ostida qayta tekshiruv
+        if sender is None or sender.is_frozen:
+            raise HTTPException(status_code=403, detail="Account is frozen")
+
+        receiver = by_addr.get(to_addr)
+        if not receiver:
+            raise HTTPException(status_code=404, detail="Receiver not found")
+
+        # update balances (sharded hisoblar: services/balance_shards.py)
+        if not debit(db, sender, amount):
+            raise HTTPException(status_code=400, detail="Insufficient balance")
+        credit(db, receiver, amount)
+
+        tx = Transaction(
+            from_address=sender.address,
+            to_address=receiver.address,
+            amount=amount,
+            tx_type="transfer",
+            user_id=sender.id,
+        )
+        # 1 tx = 1 block (eski rejim)
+        build_block(db, [tx])
+        db.add(tx)
+        audit_tx(db, actor=actor, action="TX_CREATE", entity="transactions", entity_id=str(tx.id), meta={
+            "from": tx.from_address, "to": tx.to_address, "amount": str(amount), "block_index": tx.block_index
+        })
+
+    db.refresh(tx)
+    return tx
+
+
+def tx_out(tx: Transaction) -> dict:
+    return {
+        "id": tx.id,
+        "from_address": tx.from_address,
+        "to_address": tx.to_address,
+        "amount": tx.amount,
+        "block_index": tx.block_index,
+        "prev_hash": tx.prev_hash,
+        "block_hash": tx.block_hash,
+    }
+
+
+def transfer_batch(db: Session, sender_id: uuid.UUID, actor: str, items: list[TxCreate], atomic: bool) -> dict:
+    """
+    Bitta senderdan ko'p transfer: bitta DB tranzaksiya, barcha qatorlar bir marta
+    id tartibida lock, o'tgan transferlar bitta blockka yopiladi.
+    atomic=True: birinchi xato butun batchni bekor qiladi (HTTPException, detail.index).
+    atomic=False: xatolilar natijada ok=False bilan qaytadi, qolganlari yoziladi.
+    Balans itemlar tartibida tekshiriladi.
+    """
+    results: list[dict] = []
+    parsed: list[tuple[int, Decimal, str]] = []
+
+    def reject(i: int, e: HTTPException) -> None:
+        if atomic:
+            raise HTTPException(status_code=e.status_code, detail={"index": i, "error": e.detail})
+        results.append({"index": i, "ok": False, "status_code": e.status_code, "error": e.detail})
+
+    for i, item in enumerate(items):
+        try:
+            amount, to_addr = parse_transfer(item)
+        except HTTPException as e:
+            reject(i, e)
+            continue
+        parsed.append((i, amount, to_addr))
+
+    accepted: list[tuple[int, Transaction]] = []
+    with db.begin():
+        by_id, by_addr = lock_parties(db, {sender_id}, {a for _, _, a in parsed})
+        sender = by_id.get(sender_id)
+        # principal cache eski bo'lishi mumkin — lock ostida qayta tekshiruv
+        if sender is None or sender.is_frozen:
+            raise HTTPException(status_code=403, detail="Account is frozen")
+
+        for i, amount, to_addr in parsed:
+            receiver = by_addr.get(to_addr)
+            if receiver is None:
+                reject(i, HTTPException(status_code=404, detail="Receiver not found"))
+                continue
+            if not debit(db, sender, amount):
+                reject(i, HTTPException(status_code=400, detail="Insufficient balance"))
+                continue
+            credit(db, receiver, amount)
+            accepted.append((i, Transaction(
+                id=uuid.uuid4(),
+                from_address=sender.address,
+                to_address=receiver.address,
+                amount=amount,
+                tx_type="transfer",
+                user_id=sender.id,
+            )))
+
+        if accepted:
+            build_block(db, [tx for _, tx in accepted])
+            for _, tx in accepted:
+                db.add(tx)
+                audit_tx(db, actor=actor, action="TX_CREATE", entity="transactions", entity_id=str(tx.id), meta={
+                    "from": tx.from_address, "to": tx.to_address, "amount": str(tx.amount),
+                    "block_index": tx.block_index, "batch": True,
+                })
+
+    results.extend({"index": i, "ok": True, "tx": tx_out(tx)} for i, tx in accepted)
+    results.sort(key=lambda r: r["index"])
+    return {
+        "mode": "atomic" if atomic else "best_effort",
+        "accepted": len(accepted),
+        "rejected": len(results) - len(accepted),
+        "block_index": accepted[0][1].block_index if accepted else None,
+        "results": results,
+    }
@@ -0,0 +1,171 @@
+# backend/src/services/transfer_core.py
+"""
+Legacy transfer (1 tx = 1 block) uchun ORM siz yo'l (TX_ENGINE=core, PostgreSQL).
+
+Round-triplar (+ COMMIT):
+1. bitta CTE: sender va receiver qatorlari id tartibida FOR NO KEY UPDATE,
+   shartli debit (`balance >= :amt`), credit, diagnostika — hammasi RETURNING bilan
+2. chain_head FOR UPDATE (prev_hash kerak)
+3. bitta statement: blocks + transactions + address_activity + ledger_postings
+   (+ durable audit) uchun insert(Model.__table__) CTE lari va chain_head UPDATE
+4. STREAM_PG_NOTIFY=1 bo'lsa pg_notify (boshqa workerlardagi SSE/WS uchun)
+
+Stream eventlari (services/stream.py) build_block dagidek stage qilinadi (+ pg_notify).
+Qatorlar blockchain.block_entries dan olinadi (build_block ham shuni ishlatadi) —
+verify-chain, ledger va activity uchun ORM yo'lidan farqi yo'q. Identity map, dirty tracking va db.refresh ishlatilmaydi.
+Sharded hisob, o'ziga o'tkazma, chain_head hali yo'q yoki PostgreSQL emas —
+oddiy transfer() ga tushadi.
+"""
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import func, insert, inspect, text, update
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models.audit_log import AuditLog
+from src.models.block import Block
+from src.models.chain_head import CHAIN_HEAD_ID, ChainHead
+from src.models.transaction import Transaction
+from src.services.audit import audit_tx, make_event
+from src.services.blockchain import block_entries
+from src.services.stream import stage_block
+from src.services.transfer import transfer, tx_out
+
+_MOVE = text("""
+WITH locked AS (
+    SELECT id, address, balance, is_frozen, balance_shards
+    FROM users
+    WHERE id = :sid OR address = :to
+    ORDER BY id
+    FOR NO KEY UPDATE
+),
+debit AS (
+    UPDATE users u SET balance = u.balance - :amt
+    FROM locked s
+    WHERE u.id = s.id AND s.id = :sid
+      AND NOT s.is_frozen AND s.balance_shards = 0 AND s.balance >= :amt
+      AND EXISTS (SELECT 1 FROM locked r WHERE r.address = :to AND r.id <> :sid AND r.balance_shards = 0)
+    RETURNING u.address
+),
+credit AS (
+    UPDATE users u SET balance = u.balance + :amt
+    FROM locked r
+    WHERE u.id = r.id AND r.address = :to AND EXISTS (SELECT 1 FROM debit)
+    RETURNING u.address
+)
+SELECT
+    (SELECT address FROM debit) AS from_address,
+    (SELECT address FROM credit) AS to_address,
+    s.is_frozen, s.balance, s.balance_shards AS sender_shards,
+    r.id AS receiver_id, r.balance_shards AS receiver_shards
+FROM (SELECT 1) one
+LEFT JOIN locked s ON s.id = :sid
+LEFT JOIN locked r ON r.address = :to
+""")
+
+_HEAD = text("SELECT block_index, block_hash FROM chain_head WHERE id = :hid FOR UPDATE")
+
+
+def _row(obj) -> dict:
+    """Transient ORM obyekt -> INSERT qatori (None ustunlar — server/jadval defaulti)."""
+    return {
+        attr.columns[0].name: getattr(obj, attr.key)
+        for attr in inspect(obj).mapper.column_attrs
+        if getattr(obj, attr.key) is not None
+    }
+
+
+def _seal_stmt(tx: Transaction, block: Block, entries: list, audit_ev: dict | None):
+    """
+    Bitta statement: har jadvalga Core insert(Model.__table__) CTE sifatida
+    (ustunlar modeldan — qo'lda yozilgan ro'yxat yo'q) va chain_head UPDATE.
+    """
+    ctes = [
+        insert(Block.__table__).values(_row(block)).cte("b"),
+        insert(Transaction.__table__).values(_row(tx)).cte("t"),
+        # har qatorga alohida CTE: bir statementda ikkita multi-VALUES insert kompilyatsiya bo'lmaydi
+        *(insert(type(obj).__table__).values(_row(obj)).cte(f"e{i}") for i, obj in enumerate(entries)),
+    ]
+    if audit_ev is not None:
+        ctes.append(insert(AuditLog.__table__).values(audit_ev).cte("au"))
+    head = ChainHead.__table__
+    return (
+        update(head)
+        .where(head.c.id == CHAIN_HEAD_ID)
+        .values(block_index=block.block_index, block_hash=block.block_hash, updated_at=func.now())
+        .add_cte(*ctes)
+    )
+
+
+def run_transfer(db: Session, sender_id: uuid.UUID, actor: str, to_addr: str, amount: Decimal):
+    """TX_ENGINE bo'yicha bitta transfer (sync route va async run_sync uchun umumiy)."""
+    if settings.TX_ENGINE == "core":
+        return transfer_core(db, sender_id, actor, to_addr, amount)
+    return transfer(db, sender_id, actor, to_addr, amount)
+
+
+class _Fallback(Exception):
+    """Core yo'l bu holatni qilmaydi — ORM transfer() ga."""
+
+
+def transfer_core(db: Session, sender_id: uuid.UUID, actor: str, to_addr: str, amount: Decimal) -> dict:
+    """transfer() bilan bir xil natija (TxOut dict) va bir xil xatolar."""
+    if db.get_bind().dialect.name != "postgresql":
+        return tx_out(transfer(db, sender_id, actor, to_addr, amount))
+    try:
+        return _transfer_core(db, sender_id, actor, to_addr, amount)
+    except _Fallback:
+        return tx_out(transfer(db, sender_id, actor, to_addr, amount))
+
+
+def _transfer_core(db: Session, sender_id: uuid.UUID, actor: str, to_addr: str, amount: Decimal) -> dict:
+    with db.begin():
+        conn = db.connection()
+        r = conn.execute(_MOVE, {"sid": sender_id, "to": to_addr, "amt": amount}).one()
+        if r.from_address is None:
+            # hech narsa o'zgarmadi — sababini aniqlaymiz (transfer() bilan bir xil tartib)
+            if r.balance is None or r.is_frozen:
+                raise HTTPException(status_code=403, detail="Account is frozen")
+            if r.receiver_id is None:
+                raise HTTPException(status_code=404, detail="Receiver not found")
+            if r.sender_shards or r.receiver_shards or r.receiver_id == sender_id:
+                raise _Fallback()
+            raise HTTPException(status_code=400, detail="Insufficient balance")
+
+        head = conn.execute(_HEAD, {"hid": CHAIN_HEAD_ID}).first()
+        if head is None:
+            # chain_head bootstrap — ORM yo'li qiladi (rollback: balanslar qaytadi)
+            raise _Fallback()
+
+        # blocks/transactions/activity/postings qatorlari build_block dagi bilan bir xil
+        tx = Transaction(
+            id=uuid.uuid4(), user_id=sender_id, from_address=r.from_address, to_address=r.to_address,
+            amount=amount, tx_type="transfer",
+        )
+        block, entries = block_entries([tx], int(head.block_index) + 1, str(head.block_hash))
+        bi, bh = block.block_index, block.block_hash
+        meta = {"from": r.from_address, "to": r.to_address, "amount": str(amount), "block_index": bi}
+
+        if settings.AUDIT_TX_DURABLE:
+            ev = make_event(actor, "TX_CREATE", "transactions", str(tx.id), meta)
+            conn.execute(_seal_stmt(tx, block, entries, ev))
+        else:
+            conn.execute(_seal_stmt(tx, block, entries, None))
+            # commitdan keyin navbatga (SQL yo'q)
+            audit_tx(db, actor=actor, action="TX_CREATE", entity="transactions", entity_id=str(tx.id), meta=meta)
+        stage_block(db, bi, bh, [{"tx_hash": tx.tx_hash, "from_address": r.from_address,
+                                  "to_address": r.to_address, "amount": amount}])
+
+    return {
+        "id": tx.id,
+        "from_address": r.from_address,
+        "to_address": r.to_address,
+        "amount": amount,
+        "block_index": bi,
+        "prev_hash": block.prev_hash,
+        "block_hash": bh,
+    }
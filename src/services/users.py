@@ -0,0 +1,50 @@
+# backend/src/services/users.py
+"""
+User qatori ustidagi amallar — sync routerlar to'g'ridan-to'g'ri,
+async routerlar AsyncSession.run_sync orqali chaqiradi.
+"""
+from __future__ import annotations
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.models.user import User
+from src.services.audit import audit_log
+from src.services.balance_shards import total_balance
+from src.services.principal_cache import Principal, principal_cache
+
+
+def load_user(db: Session, principal: Principal) -> User:
+    """To'liq User qatori (masalan balans): PK bo'yicha; yo'q/muzlatilgan bo'lsa cache tozalanadi."""
+    user = db.get(User, principal.id)
+    if not user:
+        principal_cache.invalidate(principal.email)
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    if user.is_frozen:
+        principal_cache.invalidate(principal.email)
+        raise HTTPException(status_code=403, detail="Account is frozen")
+
+    return user
+
+
+def account_view(db: Session, user: User):
+    """/users/me javobi (UserOut)."""
+    if user.balance_shards:
+        # sharded hisob: users.balance + shardlar, bitta statementda
+        return {"id": user.id, "email": user.email, "address": user.address, "balance": total_balance(db, user.id)}
+    return user
+
+
+def set_frozen(db: Session, email: str, frozen: bool) -> str:
+    """Saqlangan email ni qaytaradi (audit yozuvi commit/rollback qiladi — obyekt expire bo'ladi)."""
+    u = db.query(User).filter(User.email == email.lower().strip()).first()
+    if not u:
+        raise HTTPException(status_code=404, detail="User not found")
+    u.is_frozen = frozen
+    db.commit()
+    email, user_id = u.email, u.id
+    principal_cache.invalidate(email)
+    audit_log(db, actor="ADMIN", action="ADMIN_FREEZE" if frozen else "ADMIN_UNFREEZE", entity="users",
+              entity_id=str(user_id), meta={"email": email})
+    return email
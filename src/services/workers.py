@@ -0,0 +1,94 @@
+# backend/src/services/workers.py
+"""
+Fon threadlar uchun umumiy qismlar:
+- PeriodicWorker: har interval_s da tick (start/stop, xatoni log qilib davom etadi)
+- drain_batch: navbatdan batch yig'ish (AuditWriter, Mempool)
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def drain_batch(q: queue.Queue, max_items: int, interval_s: float, wait_s: float) -> list:
+    """
+    Birinchi elementni wait_s gacha kutadi (0 — kutmaydi), keyin interval_s ichida
+    max_items tagacha yig'adi; muddat tugagach navbatda turganlarini kutmasdan oladi.
+    """
+    try:
+        first = q.get(timeout=wait_s) if wait_s > 0 else q.get_nowait()
+    except queue.Empty:
+        return []
+    batch = [first]
+    deadline = time.monotonic() + interval_s
+    while len(batch) < max_items:
+        left = deadline - time.monotonic()
+        try:
+            batch.append(q.get(timeout=left) if left > 0 else q.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+class PeriodicWorker:
+    """
+    session_factory berilsa tick(db) har safar yangi sessiya bilan chaqiriladi
+    (va yopiladi), None bo'lsa tick() argumentsiz.
+    """
+
+    name = "periodic-worker"
+    min_interval_s = 1.0
+    # True: startupda darhol bir marta, keyin har interval_s da
+    run_at_start = False
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]],
+        interval_s: float,
+        tick: Callable[..., object],
+    ):
+        self.session_factory = session_factory
+        self.interval_s = max(self.min_interval_s, interval_s)
+        self._tick = tick
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def tick(self):
+        if self.session_factory is None:
+            return self._tick()
+        db = self.session_factory()
+        try:
+            return self._tick(db)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _safe_tick(self) -> None:
+        try:
+            self.tick()
+        except Exception:
+            logger.exception("%s tick failed", self.name)
+
+    def _run(self) -> None:
+        if self.run_at_start:
+            self._safe_tick()
+        while not self._stop.wait(self.interval_s):
+            self._safe_tick()
@@ -0,0 +1,77 @@
+import os
+
+# src.db.session import paytida DATABASE_URL talab qiladi (ulanish faqat ishlatilganda)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import uuid  # noqa: E402
+from decimal import Decimal  # noqa: E402
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.core.config import settings  # noqa: E402
+from src.db.base import Base  # noqa: E402
+from src.models import (  # noqa: F401
+    address_activity, balance_shard, balance_snapshot, block, chain_checkpoint, chain_head, idempotency_key, ledger_posting, transaction, user,
+)
+
+from src.models.transaction import Transaction  # noqa: E402
+from src.models.user import User  # noqa: E402
+from src.services.blockchain import build_block  # noqa: E402
+
+# audit_logs JSONB ishlatadi — sqlite da yaratib bo'lmaydi
+SQLITE_TABLES = [t for t in Base.metadata.sorted_tables if t.name != "audit_logs"]
+
+
+def make_db(url: str = "sqlite://") -> Session:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=SQLITE_TABLES)
+    return Session(engine)
+
+
+@pytest.fixture
+def db() -> Session:
+    s = make_db()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def db_factory():
+    return make_db
+
+
+def _seal(db: Session, *transfers) -> list[Transaction]:
+    """Bitta block yopadi: transfers — (from, to) yoki (from, to, amount), sukut summa 1."""
+    txs = [
+        Transaction(from_address=t[0], to_address=t[1], amount=Decimal(t[2] if len(t) > 2 else "1"),
+                    tx_type="transfer", user_id=uuid.uuid4())
+        for t in transfers
+    ]
+    db.rollback()  # oldingi o'qishlar ochgan tranzaksiyani yopish
+    with db.begin():
+        build_block(db, txs)
+        db.add_all(txs)
+    return txs
+
+
+@pytest.fixture
+def seal():
+    return _seal
+
+
+@pytest.fixture
+def funded_users(db, monkeypatch) -> tuple:
+    """
+    alice (a@x, 10) va bob (b@x, 0) -> (alice_id, bob_id). audit_logs sqlite da yo'q —
+    durable audit o'chiriladi. Boshqa baza kerak bo'lsa test modulida db ni override qiling.
+    """
+    monkeypatch.setattr(settings, "AUDIT_TX_DURABLE", False)
+    alice = User(email="a@x", address="alice", balance=Decimal("10"), password_hash="x")
+    bob = User(email="b@x", address="bob", balance=Decimal("0"), password_hash="x")
+    db.add_all([alice, bob])
+    db.commit()
+    ids = alice.id, bob.id
+    db.rollback()
+    return ids
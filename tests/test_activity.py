@@ -0,0 +1,44 @@
+import pytest
+from fastapi import HTTPException
+
+from src.services.activity import address_page
+
+
+def test_both_directions_newest_first(db, seal):
+    seal(db, ("alice", "bob"))
+    seal(db, ("bob", "carol"), ("carol", "alice"))
+    seal(db, ("dave", "erin"))
+
+    rows, nxt = address_page(db, "alice")
+    assert [(r.block_index, r.block_pos) for r in rows] == [(2, 1), (1, 0)]
+    assert nxt is None
+
+
+def test_self_transfer_listed_once(db, seal):
+    seal(db, ("alice", "alice"))
+    rows, _ = address_page(db, "alice")
+    assert len(rows) == 1
+
+
+def test_keyset_pages_walk_whole_history(db, seal):
+    for _ in range(4):
+        seal(db, ("alice", "bob"), ("bob", "alice"), ("carol", "dave"))
+
+    seen, before = [], None
+    while True:
+        rows, before = address_page(db, "bob", before=before, limit=3)
+        seen.extend((r.block_index, r.block_pos) for r in rows)
+        if before is None:
+            break
+
+    assert len(seen) == 8
+    assert seen == sorted(seen, reverse=True)
+
+    rows, _ = address_page(db, "bob", before="3")
+    assert {r.block_index for r in rows} == {1, 2}
+
+
+def test_bad_cursor_is_400(db):
+    with pytest.raises(HTTPException) as e:
+        address_page(db, "bob", before="x:y")
+    assert e.value.status_code == 400
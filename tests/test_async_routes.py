@@ -0,0 +1,99 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.core.config import settings
+from src.db.async_session import async_url, get_async_db
+from src.deps.auth import get_current_principal_async
+from src.models.transaction import Transaction
+from src.models.user import User
+from src.routers.admin import require_admin
+from src.routers.aio import admin as aio_admin, explorer as aio_explorer, override, tx as aio_tx, users as aio_users
+from src.routers.explorer import router as explorer_router
+from src.services.blockchain import build_block
+from src.services.merkle import verify_proof
+from src.services.principal_cache import Principal
+
+
+@pytest.fixture
+def env(db_factory, tmp_path):
+    url = f"sqlite:///{tmp_path / 'a.db'}"
+    db = db_factory(url)
+    alice = User(email="a@x", address="alice", balance=Decimal("10"), password_hash="x")
+    bob = User(email="b@x", address="bob", balance=Decimal("0"), password_hash="x")
+    db.add_all([alice, bob])
+    db.commit()
+    txs = [Transaction(from_address="x", to_address="y", amount=Decimal("1"), tx_type="transfer", user_id=uuid.uuid4())
+           for _ in range(3)]
+    with db.begin():
+        build_block(db, txs)
+        db.add_all(txs)
+
+    engine = create_async_engine(async_url(url), poolclass=NullPool)
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def _db():
+        async with maker() as s:
+            yield s
+
+    app = FastAPI()
+    app.include_router(aio_tx.router)
+    app.include_router(aio_users.router)
+    app.include_router(aio_admin.router)
+    app.include_router(override(aio_explorer.router, explorer_router))
+    app.dependency_overrides[get_async_db] = _db
+    app.dependency_overrides[require_admin] = lambda: None
+    app.dependency_overrides[get_current_principal_async] = lambda: Principal(
+        id=alice.id, email="a@x", address="alice", is_frozen=False
+    )
+    yield TestClient(app), db, txs
+    db.close()
+
+
+def test_async_explorer_reads(env):
+    client, _, txs = env
+    b = client.get("/api/v1/explorer/block/1").json()
+    assert [t["tx_hash"] for t in b["transactions"]] == [t.tx_hash for t in txs]
+
+    p = client.get(f"/api/v1/explorer/tx/{txs[2].tx_hash}/proof").json()
+    assert p["block_pos"] == 2
+    assert verify_proof(txs[2].tx_hash, p["proof"], p["merkle_root"])
+    assert client.get("/api/v1/explorer/block/9").status_code == 404
+    # sync routerdagi verify-chain o'z joyida qoladi
+    assert any(r.path.endswith("/verify-chain") for r in client.app.routes)
+
+
+def test_async_transfer_uses_same_locked_path(env, monkeypatch):
+    # audit_logs sqlite da yo'q — audit commitdan keyin alohida yoziladi
+    monkeypatch.setattr(settings, "AUDIT_TX_DURABLE", False)
+    client, db, _ = env
+    r = client.post("/api/v1/tx/create", json={"to_address": "bob", "amount": 4})
+    assert r.status_code == 200, r.text
+    assert r.json()["block_index"] == 2
+
+    db.expire_all()
+    assert db.query(User.balance).filter(User.address == "bob").scalar() == Decimal("4")
+    assert client.post("/api/v1/tx/create", json={"to_address": "bob", "amount": 100}).status_code == 400
+
+    hist = client.get("/api/v1/tx/history")
+    assert [h["to_address"] for h in hist.json()] == ["bob"]
+
+
+def test_async_me_and_admin_freeze_share_sync_services(env, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_WRITER_MODE", "sync")
+    client, db, _ = env
+    # UserOut.email — EmailStr
+    db.query(User).filter(User.address == "alice").update({"email": "alice@example.com"})
+    db.commit()
+    me = client.get("/api/v1/users/me").json()
+    assert (me["email"], Decimal(me["balance"])) == ("alice@example.com", Decimal("10"))
+
+    assert client.post("/api/v1/admin/freeze/Alice@example.com").json() == {"detail": "Frozen", "email": "alice@example.com"}
+    assert client.get("/api/v1/users/me").status_code == 403
+    assert client.post("/api/v1/admin/unfreeze/alice@example.com").json()["detail"] == "Unfrozen"
+    assert client.post("/api/v1/admin/freeze/nobody@x").status_code == 404
@@ -0,0 +1,91 @@
+import pytest
+
+from src.core.config import settings
+from src.services import audit
+from src.services.audit import AuditWriter, audit_log, audit_tx
+
+
+class FakeSession:
+    def __init__(self, sink, fail_first=False):
+        self.sink = sink
+        self.fail_first = fail_first
+
+    def execute(self, stmt, rows):
+        if self.fail_first:
+            self.fail_first = False
+            raise RuntimeError("boom")
+        self.sink.append(len(rows))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _writer(sink, **kw):
+    opts = dict(max_queue=100, batch_size=10, flush_ms=50)
+    opts.update(kw)
+    return AuditWriter(lambda: FakeSession(sink), **opts)
+
+
+def test_batches_by_size_and_flushes_on_stop():
+    sink = []
+    w = _writer(sink)
+    for i in range(25):
+        assert w.submit({"action": "A", "entity": "e", "entity_id": str(i)})
+    w.stop()  # thread ishga tushmagan — stop navbatni baribir bo'shatadi
+    assert sink == [10, 10, 5]
+    s = w.stats()
+    assert (s["enqueued"], s["written"], s["batches"], s["queue_depth"]) == (25, 25, 3, 0)
+
+
+def test_background_thread_writes_by_time():
+    sink = []
+    w = _writer(sink, batch_size=1000, flush_ms=20)
+    w.start()
+    for i in range(3):
+        w.submit({"action": "A", "entity": "e", "entity_id": str(i)})
+    w.stop()
+    assert sum(sink) == 3
+
+
+def test_full_queue_falls_back_to_caller(monkeypatch):
+    sink = []
+    w = _writer(sink, max_queue=1)
+    monkeypatch.setattr(audit, "_writer", w)
+    monkeypatch.setattr(settings, "AUDIT_WRITER_MODE", "queue")
+
+    written = []
+    monkeypatch.setattr(audit, "_write_sync", lambda db, ev: written.append(ev["entity_id"]))
+    audit_log(None, "ADMIN", "A", "users", "1")
+    audit_log(None, "ADMIN", "A", "users", "2")
+    assert written == ["2"]
+    assert w.stats()["queue_full_sync_writes"] == 1
+
+
+def test_failed_batch_retried_row_by_row():
+    sink = []
+    w = AuditWriter(lambda: FakeSession(sink, fail_first=True), max_queue=10, batch_size=10, flush_ms=10)
+    for i in range(3):
+        w.submit({"action": "A", "entity": "e", "entity_id": str(i)})
+    w.flush()
+    assert sink == [1, 1, 1]
+    assert w.stats()["failed"] == 0
+
+
+@pytest.mark.parametrize("commit", [True, False])
+def test_deferred_tx_audit_only_after_commit(db, monkeypatch, commit):
+    sink = []
+    w = _writer(sink)
+    monkeypatch.setattr(audit, "_writer", w)
+    monkeypatch.setattr(settings, "AUDIT_WRITER_MODE", "queue")
+    monkeypatch.setattr(settings, "AUDIT_TX_DURABLE", False)
+
+    db.begin()
+    audit_tx(db, "a@x", "TX_CREATE", "transactions", "t1")
+    db.commit() if commit else db.rollback()
+    assert w.stats()["enqueued"] == (1 if commit else 0)
@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+import pytest
+
+from src.models.balance_shard import BalanceShard
+from src.models.user import User
+from src.services.balance_shards import compact, set_shards, total_balance
+from src.services.ledger import reconcile
+from src.services.transfer import transfer as _transfer
+
+
+def transfer(db, *args):
+    _transfer(db, *args)
+    # transfer oxirida db.refresh(tx) — keyingi db.begin() uchun sessiyani yopamiz
+    db.rollback()
+
+
+@pytest.fixture
+def accounts(db, funded_users):
+    # bob — issiq hisob (4 shard)
+    assert set_shards(db, "b@x", 4)["shards"] == 4
+    return funded_users
+
+
+def test_credits_go_to_shards_and_reads_stay_exact(db, accounts):
+    alice_id, bob_id = accounts
+    for _ in range(3):
+        transfer(db, alice_id, "a@x", "bob", Decimal("2"))
+
+    assert db.get(User, bob_id).balance == Decimal("0")
+    assert sum(s.balance for s in db.query(BalanceShard)) == Decimal("6")
+    assert total_balance(db, bob_id) == Decimal("6")
+    # alice ning boshlang'ich 10 i ledgerda yo'q (mint qilinmagan) — faqat bob tekshiriladi
+    assert "bob" not in {m["address"] for m in reconcile(db)["mismatches"]}
+
+    # debit shardlarni yig'adi
+    transfer(db, bob_id, "b@x", "alice", Decimal("5"))
+    db.expire_all()
+    assert db.get(User, bob_id).balance == Decimal("1")
+    assert total_balance(db, bob_id) == Decimal("1")
+    assert total_balance(db, alice_id) == Decimal("9")
+
+
+def test_compact_and_unshard(db, accounts):
+    alice_id, bob_id = accounts
+    transfer(db, alice_id, "a@x", "bob", Decimal("3"))
+    assert compact(db)["accounts"] == 1
+    db.expire_all()
+    assert db.get(User, bob_id).balance == Decimal("3")
+    db.rollback()
+
+    transfer(db, alice_id, "a@x", "bob", Decimal("1"))
+    out = set_shards(db, "b@x", 0)
+    assert Decimal(out["balance"]) == Decimal("4")
+    assert db.query(BalanceShard).count() == 0
+
+
+def test_total_stays_exact_across_credit_fold_credit_unshard(db, accounts):
+    alice_id, bob_id = accounts
+
+    def check(expected):
+        db.expire_all()
+        row = db.get(User, bob_id).balance
+        shards = sum((s.balance for s in db.query(BalanceShard).filter(BalanceShard.user_id == bob_id)), Decimal("0"))
+        assert row + shards == Decimal(expected)
+        assert total_balance(db, bob_id) == Decimal(expected)
+        db.rollback()
+        return row, shards
+
+    transfer(db, alice_id, "a@x", "bob", Decimal("2"))
+    assert check("2") == (Decimal("0"), Decimal("2"))
+
+    assert compact(db)["accounts"] == 1
+    assert check("2") == (Decimal("2"), Decimal("0"))
+
+    transfer(db, alice_id, "a@x", "bob", Decimal("3"))
+    assert check("5") == (Decimal("2"), Decimal("3"))
+
+    assert Decimal(set_shards(db, "b@x", 0)["balance"]) == Decimal("5")
+    assert check("5") == (Decimal("5"), Decimal("0"))
+    assert db.query(BalanceShard).count() == 0
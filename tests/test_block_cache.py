@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.db.session import get_db
+from src.routers import explorer
+from src.services import block_cache as bc
+from src.services.block_cache import BlockCache, matches
+from src.services.transfer import transfer
+
+
+def test_lru_is_bounded_by_bytes():
+    c = BlockCache(max_bytes=40)
+    c.put("a", {"x": "1" * 10}, '"a"')
+    c.put("b", {"x": "2" * 10}, '"b"')
+    c.get("a")
+    c.put("c", {"x": "3" * 10}, '"c"')  # b eng eski -> chiqadi
+    assert c.get("b") is None and c.get("a") is not None
+    assert c.stats()["evictions"] == 1 and c.stats()["bytes"] <= 40
+
+
+def test_if_none_match_parsing():
+    assert matches('W/"v1-h", "other"', '"v1-h"')
+    assert matches("*", '"v1-h"')
+    assert not matches('"v1-x"', '"v1-h"') and not matches(None, '"v1-h"')
+
+
+@pytest.fixture
+def db(db_factory, tmp_path):
+    # route sessiyalari bilan bir bazani ko'rish uchun fayl (in-memory emas)
+    s = db_factory(f"sqlite:///{tmp_path / 'b.db'}")
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def client(db, funded_users, monkeypatch):
+    monkeypatch.setattr(bc, "block_cache", BlockCache(1 << 20))
+    monkeypatch.setattr(explorer, "block_cache", bc.block_cache)
+    tx = transfer(db, funded_users[0], "a@x", "bob", Decimal("1"))
+
+    app = FastAPI()
+    app.include_router(explorer.router)
+    queries = []
+    event.listen(db.bind, "before_cursor_execute", lambda *a: queries.append(1))
+
+    def _db():
+        s = Session(db.bind)
+        try:
+            yield s
+        finally:
+            s.close()
+
+    app.dependency_overrides[get_db] = _db
+    return TestClient(app), tx, db, queries
+
+
+def test_block_hash_lookup_cached_with_etag(client):
+    c, tx, _, queries = client
+    url = f"/api/v1/explorer/tx/{tx.block_hash}"
+
+    r = c.get(url)
+    assert r.status_code == 200 and r.json()["tx_hash"] == tx.tx_hash
+    assert r.headers["etag"] == f'"v1-{tx.block_hash}"' and "immutable" in r.headers["cache-control"]
+
+    # takror va 304 — DB ga bitta ham so'rov yo'q
+    n = len(queries)
+    assert c.get(url).json() == r.json()
+    assert c.get(url, headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+    assert c.get(url, headers={"If-None-Match": "*"}).status_code == 304
+    assert len(queries) == n
+    assert bc.block_cache.stats()["hits"] == 3
+
+
+def test_unknown_hash_is_404_not_304(client):
+    c, _, _, _ = client
+    for inm in ('"v1-deadbeef"', "*"):
+        r = c.get("/api/v1/explorer/tx/deadbeef", headers={"If-None-Match": inm})
+        assert r.status_code == 404 and "immutable" not in r.headers.get("cache-control", "")
+        r = c.get("/api/v1/explorer/tx/deadbeef/proof", headers={"If-None-Match": inm})
+        assert r.status_code == 404
+    assert bc.block_cache.stats()["size"] == 0
+
+
+def test_block_route_304_and_not_found_not_cached(client):
+    c, tx, _, _ = client
+    r = c.get(f"/api/v1/explorer/block/{tx.block_index}")
+    assert r.status_code == 200 and r.headers["etag"] == f'"v1-{tx.block_hash}"'
+    assert c.get(f"/api/v1/explorer/block/{tx.block_index}", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+    assert c.get("/api/v1/explorer/block/999").status_code == 404
+    assert bc.block_cache.stats()["size"] == 1
@@ -0,0 +1,226 @@
+import threading
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from src.models.block import Block
+from src.models.chain_checkpoint import ChainCheckpoint
+from src.models.chain_head import ChainHead
+from src.models.transaction import Transaction
+from src.services.blockchain import build_block, get_last_block
+from src.services.chain_verify import verify_chain
+from src.services.mempool import BlockProducer, Mempool, PendingTx
+
+
+def _tx(frm: str = "a", to: str = "b", amount: str = "1") -> Transaction:
+    return Transaction(
+        from_address=frm, to_address=to, amount=Decimal(amount), tx_type="transfer", user_id=uuid.uuid4()
+    )
+
+
+def _seal(db: Session, *txs: Transaction) -> Block:
+    with db.begin():
+        b = build_block(db, list(txs))
+        db.add_all(txs)
+    return b
+
+
+def test_head_starts_at_genesis(db):
+    assert get_last_block(db) == (0, "GENESIS")
+    # o'qish chain_head qatorini yaratmaydi — faqat build_block (lock ostida)
+    assert db.query(ChainHead).count() == 0
+
+
+def test_build_block_advances_head(db):
+    b1 = _seal(db, _tx())
+    b2 = _seal(db, _tx(), _tx("b", "a"), _tx("c", "a"))
+
+    assert (b1.block_index, b1.prev_hash) == (1, "GENESIS")
+    assert (b2.block_index, b2.prev_hash, b2.tx_count) == (2, b1.block_hash, 3)
+    assert get_last_block(db) == (2, b2.block_hash)
+
+
+def test_rollback_keeps_head(db):
+    _seal(db, _tx())
+    db.begin()
+    build_block(db, [_tx()])
+    db.rollback()
+
+    assert get_last_block(db)[0] == 1
+
+
+def test_verify_chain_multi_tx_blocks(db):
+    _seal(db, _tx())
+    _seal(db, _tx(), _tx("b", "c", "2.5"))
+    _seal(db, _tx("c", "a", "0.00000001"))
+
+    res = verify_chain(db)
+    assert res["ok"] is True
+    assert res["blocks"] == 3
+
+
+def test_verify_chain_detects_tampering(db):
+    _seal(db, _tx())
+    _seal(db, _tx(), _tx("b", "c"))
+
+    t = db.query(Transaction).filter(Transaction.block_index == 2, Transaction.block_pos == 1).one()
+    t.amount = Decimal("999")
+    db.commit()
+
+    res = verify_chain(db, full=True)
+    assert res["ok"] is False
+    types = {e["type"] for e in res["errors"]}
+    assert {"tx_hash_mismatch", "merkle_root_mismatch", "block_hash_mismatch"} <= types
+
+
+def test_verify_chain_is_incremental_after_checkpoint(db):
+    for _ in range(5):
+        _seal(db, _tx())
+
+    first = verify_chain(db, chunk_size=2)
+    assert (first["ok"], first["blocks"], first["checkpoint"]["block_index"]) == (True, 5, 5)
+
+    _seal(db, _tx())
+    _seal(db, _tx())
+    second = verify_chain(db)
+    assert (second["mode"], second["from"], second["blocks"]) == ("incremental", 6, 2)
+
+    assert verify_chain(db)["detail"] == "up to date"
+    assert verify_chain(db, full=True)["blocks"] == 7
+
+
+def test_verify_chain_range_and_progress(db):
+    for _ in range(10):
+        _seal(db, _tx())
+
+    events = []
+    res = verify_chain(db, from_index=3, to_index=8, chunk_size=2, on_progress=events.append)
+    assert (res["ok"], res["mode"], res["blocks"]) == (True, "range", 6)
+    assert [e["checked"] for e in events] == [2, 4, 6]
+    # range tekshiruv checkpointga tegmaydi
+    assert db.query(ChainCheckpoint).count() == 0
+
+
+def test_read_only_verify_keeps_checkpoint(db):
+    for _ in range(3):
+        _seal(db, _tx())
+
+    # public GET: hisobot bor, checkpoint yozilmaydi
+    res = verify_chain(db, save_checkpoint=False)
+    assert (res["ok"], res["blocks"], res["checkpoint"]["block_index"]) == (True, 3, 3)
+    assert verify_chain(db, full=True, save_checkpoint=False)["ok"]
+    assert db.query(ChainCheckpoint).count() == 0
+
+
+def test_full_verify_moves_checkpoint_back_on_tampering(db):
+    for _ in range(4):
+        _seal(db, _tx())
+    assert verify_chain(db)["checkpoint"]["block_index"] == 4
+
+    b = db.query(Block).filter(Block.block_index == 2).one()
+    b.prev_hash = "x"
+    db.commit()
+
+    res = verify_chain(db, full=True)
+    assert res["ok"] is False
+    assert res["checkpoint"]["block_index"] == 1
+
+
+def test_mempool_take_batch_caps_size():
+    pool = Mempool(max_size=100)
+    for _ in range(7):
+        pool.submit(PendingTx(sender_id=uuid.uuid4(), actor="a@x.io", to_address="b", amount=Decimal("1")))
+
+    assert len(pool.take_batch(5, interval_s=0.01, wait_s=0.01)) == 5
+    assert len(pool.take_batch(5, interval_s=0.01, wait_s=0.01)) == 2
+    assert pool.take_batch(5, interval_s=0.01, wait_s=0.01) == []
+
+
+def test_reseal_makes_pre_migration_chain_verifiable(db):
+    from src.db.chain_backfill import reseal_chain
+    from src.models.chain_head import ChainHead
+    from src.services.blockchain import _sha256
+    from src.services.merkle import merkle_proof, merkle_root
+
+    # migratsiyadan oldingi ko'rinish: 1 tx = 1 block, tx_hash yo'q, header eski qoida bilan
+    prev = "GENESIS"
+    with db.begin():
+        db.add(ChainHead(block_index=0, block_hash="GENESIS"))
+        for i in range(1, 6):
+            h = _sha256(f"{i}|{prev}|a|b|{i}")
+            db.add(Transaction(from_address="", to_address="", amount=Decimal(i), tx_type="transfer",
+                               user_id=uuid.uuid4(), block_index=i, block_pos=0, prev_hash=prev, block_hash=h))
+            db.add(Block(block_index=i, prev_hash=prev, block_hash=h, merkle_root="", tx_count=1))
+            prev = h
+        db.flush()
+        db.query(ChainHead).update({"block_index": 5, "block_hash": prev})
+    assert not verify_chain(db, full=True)["ok"]
+    db.rollback()
+
+    with db.begin():
+        assert reseal_chain(db.connection(), "merkle_root", merkle_root) == 5
+    db.expire_all()
+
+    assert verify_chain(db, full=True)["ok"]
+    tip = db.query(Block).filter(Block.block_index == 5).one()
+    assert get_last_block(db) == (5, tip.block_hash)
+    tx = db.query(Transaction).filter(Transaction.block_index == 3).one()
+    assert tx.tx_hash and merkle_proof([tx.tx_hash], 0) == []
+    # resealdan keyin yangi block zanjirni davom ettiradi
+    db.rollback()
+    _seal(db, _tx())
+    assert verify_chain(db, full=True)["ok"]
+
+
+def test_migration_hash_rules_match_current_rules():
+    # chain_backfill va 8a4f6b2c3e10 dagi muzlatilgan nusxalar hozircha joriy qoidaga teng
+    # (joriy qoida o'zgarsa: muzlatilgan nusxalarni emas, shu testni yangilang va yangi migratsiya yozing)
+    import importlib.util
+    from pathlib import Path
+
+    from src.db import chain_backfill
+    from src.services import blockchain
+    from src.services.merkle import merkle_root
+
+    path = Path(__file__).parents[1] / "alembic" / "versions" / "8a4f6b2c3e10_block_merkle_root.py"
+    spec = importlib.util.spec_from_file_location("m_8a4f6b2c3e10", path)
+    mig = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mig)
+
+    tid = uuid.uuid4()
+    assert chain_backfill.tx_hash(tid, "a", "b", "1.123456789") == blockchain.tx_hash(tid, "a", "b", "1.123456789")
+    assert chain_backfill.block_hash(7, "p", "r") == blockchain.block_hash(7, "p", "r")
+    leaves = [blockchain.tx_hash(uuid.uuid4(), "a", "b", i) for i in range(5)]
+    assert mig._merkle_root(leaves) == merkle_root(leaves)
+
+
+def test_producer_stop_timeout_leaves_drain_to_thread():
+    pool = Mempool(max_size=100)
+    producer = BlockProducer(pool, session_factory=None, max_txs=2, interval_ms=0)
+    active, overlaps, sealed_on = [0], [], set()
+    gate = threading.Event()
+
+    def slow_seal(batch):
+        active[0] += 1
+        overlaps.append(active[0])
+        sealed_on.add(threading.current_thread().name)
+        gate.wait(2)
+        for item in batch:
+            item.future.set_result({})
+        active[0] -= 1
+
+    producer._seal = slow_seal
+    producer.start()
+    items = [pool.submit(PendingTx(sender_id=uuid.uuid4(), actor="a@x.io", to_address="b", amount=Decimal("1")))
+             for _ in range(5)]
+    time.sleep(0.05)
+
+    # join tugadi, thread hali seal qilyapti — stop o'zi drain qilmaydi
+    producer.stop(timeout=0.05)
+    gate.set()
+    producer._thread.join(2)
+
+    assert all(f.done() for f in items)
+    assert max(overlaps) == 1 and sealed_on == {"block-producer"}
@@ -0,0 +1,84 @@
+import uuid
+from decimal import Decimal
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.db.session import get_db
+from src.models.block import Block
+from src.models.transaction import Transaction
+from src.routers import admin
+from src.services.blockchain import build_block
+from src.services.chain_verify import iter_blocks, scan_blocks, verify_chain
+from src.services.chain_verify_parallel import merge_segments, segments, verify_chain_parallel
+
+
+def _chain(db: Session) -> Session:
+    for i in range(25):
+        txs = [
+            Transaction(from_address="a", to_address="b", amount=Decimal(k + 1), tx_type="transfer", user_id=uuid.uuid4())
+            for k in range(i % 3 + 1)
+        ]
+        with db.begin():
+            build_block(db, txs)
+            db.add_all(txs)
+    return db
+
+
+def _scan(db: Session, start: int, end: int) -> dict:
+    *_, last = scan_blocks(iter_blocks(db, start, end, 4), start, end, None, 4)
+    return last["scan"]
+
+
+def test_segments_cover_range():
+    assert segments(1, 10, 4) == [(1, 4), (5, 8), (9, 10)]
+
+
+def test_merged_segments_match_sequential_report(db):
+    _chain(db)
+    db.query(Block).filter(Block.block_index == 9).update({"prev_hash": "x"})
+    t = db.query(Transaction).filter(Transaction.block_index == 17).first()
+    t.amount = Decimal("7")
+    db.commit()
+
+    seq = verify_chain(db, full=True, chunk_size=4)
+    merged = merge_segments([_scan(db, s, e) for s, e in segments(1, 25, 8)], "GENESIS")
+
+    assert merged["error_count"] == seq["error_count"]
+    assert {(e["block_index"], e["type"]) for e in merged["errors"]} == {
+        (e["block_index"], e["type"]) for e in seq["errors"]
+    }
+    assert merged["last_good"][0] == seq["checkpoint"]["block_index"] == 8
+
+
+def test_boundary_link_is_checked_by_parent(db):
+    _chain(db)
+    # 9-block segment boshida: faqat parent chegara tekshiruvi ushlaydi
+    db.query(Block).filter(Block.block_index == 9).update({"prev_hash": "x"})
+    db.commit()
+
+    scans = [_scan(db, s, e) for s, e in segments(1, 25, 8)]
+    assert all(e["type"] != "prev_hash_mismatch" for s in scans for e in s["errors"])
+
+    merged = merge_segments(scans, "GENESIS")
+    assert any(e["type"] == "prev_hash_mismatch" and e["block_index"] == 9 for e in merged["errors"])
+
+
+def test_process_pool_run(tmp_path, db_factory):
+    url = f"sqlite:///{tmp_path / 'chain.db'}"
+    db = _chain(db_factory(url))
+    res = verify_chain_parallel(db, full=True, workers=2, segment_size=10, chunk_size=4, db_url=url)
+    assert (res["ok"], res["blocks"], res["checkpoint"]["block_index"]) == (True, 25, 25)
+
+
+def test_parallel_verify_is_admin_only_and_single_flight(db):
+    app = FastAPI()
+    app.include_router(admin.router)
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+
+    assert client.post("/api/v1/admin/verify-chain?parallel=1").status_code == 401
+    with admin._parallel_verify:
+        r = client.post("/api/v1/admin/verify-chain?parallel=1", headers={"X-Admin-Token": admin.ADMIN_TOKEN})
+    assert r.status_code == 503
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from src.models.transaction import Transaction
+from src.services import export
+from src.services.blockchain import build_block
+from src.services.export import TX_FIELDS, iter_transactions, parse_tx_token, stream_export
+
+
+def _fill(db, n_blocks=5):
+    for i in range(n_blocks):
+        txs = [
+            Transaction(from_address="alice", to_address="bob", amount=Decimal("1.5"), tx_type="transfer", user_id=uuid.uuid4()),
+            Transaction(from_address="carol", to_address="dave", amount=Decimal(i + 1), tx_type="transfer", user_id=uuid.uuid4()),
+        ]
+        with db.begin():
+            build_block(db, txs)
+            db.add_all(txs)
+
+
+def test_ndjson_resume_from_any_row(db, monkeypatch):
+    _fill(db)
+    monkeypatch.setattr(export, "LINES_PER_WRITE", 3)
+
+    chunks = list(stream_export(lambda: db, iter_transactions, TX_FIELDS, "ndjson"))
+    assert len(chunks) == 4  # 10 qator / 3
+    rows = [json.loads(line) for c in chunks for line in c.splitlines()]
+    assert [(r["block_index"], r["block_pos"]) for r in rows] == [(b, p) for b in range(1, 6) for p in range(2)]
+
+    resumed = list(iter_transactions(db, after=parse_tx_token(rows[3]["cursor"])))
+    assert [r["tx_hash"] for r in resumed] == [r["tx_hash"] for r in rows[4:]]
+
+
+def test_csv_address_filter(db):
+    _fill(db)
+    text = "".join(stream_export(lambda: db, iter_transactions, TX_FIELDS, "csv", address="dave"))
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert len(rows) == 5
+    assert {r["to_address"] for r in rows} == {"dave"}
+    assert rows[0]["amount"] == "1.00000000"
+
+
+def test_bad_token_rejected_before_stream():
+    with pytest.raises(HTTPException) as e:
+        parse_tx_token("not-a-token")
+    assert e.value.status_code == 400
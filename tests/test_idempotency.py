@@ -0,0 +1,71 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from src.core.config import settings
+from src.models.idempotency_key import IdempotencyKey
+from src.schemas.transaction import TxCreate, TxOut
+from src.services.idempotency import PENDING, fingerprint, purge_expired, run_idempotent, try_acquire
+
+UID = uuid.uuid4()
+PAYLOAD = TxCreate(to_address="bob", amount=1)
+OUT = {"id": uuid.uuid4(), "from_address": "alice", "to_address": "bob", "amount": 1,
+       "block_index": 1, "prev_hash": "GENESIS", "block_hash": "h"}
+
+
+def _run(db, call, key="k1", payload=PAYLOAD):
+    return run_idempotent(db, UID, key, fingerprint("tx/create", payload), TxOut, call)
+
+
+def test_replay_returns_stored_response_without_calling_again(db):
+    calls = []
+    first = _run(db, lambda: calls.append(1) or OUT)
+    again = _run(db, lambda: calls.append(1) or OUT)
+
+    assert calls == [1]
+    assert isinstance(again, JSONResponse) and again.headers["Idempotent-Replayed"] == "true"
+    assert again.body == JSONResponse(first).body
+
+
+def test_same_key_different_body_is_422(db):
+    _run(db, lambda: OUT)
+    with pytest.raises(HTTPException) as e:
+        _run(db, lambda: OUT, payload=TxCreate(to_address="bob", amount=2))
+    assert e.value.status_code == 422
+
+
+def test_client_error_is_stored_server_error_releases_key(db):
+    def insufficient():
+        raise HTTPException(status_code=400, detail="Insufficient balance")
+
+    with pytest.raises(HTTPException):
+        _run(db, insufficient)
+    replay = _run(db, lambda: OUT)
+    assert replay.status_code == 400
+
+    def boom():
+        raise HTTPException(status_code=500, detail="TX failed")
+
+    with pytest.raises(HTTPException):
+        _run(db, boom, key="k2")
+    assert _run(db, lambda: OUT, key="k2")["block_hash"] == "h"
+
+
+def test_in_flight_duplicate_waits_then_409(db, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.05)
+    h = fingerprint("tx/create", PAYLOAD)
+    try_acquire(db, UID, "k3", h)  # birinchi so'rov hali ishlayapti
+    assert try_acquire(db, UID, "k3", h) == PENDING
+
+    with pytest.raises(HTTPException) as e:
+        _run(db, lambda: OUT, key="k3")
+    assert e.value.status_code == 409
+
+
+def test_expired_keys_are_reusable_and_purged(db, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_TTL_SECONDS", -1)
+    _run(db, lambda: OUT)
+    assert purge_expired(db) == 1
+    assert db.query(IdempotencyKey).count() == 0
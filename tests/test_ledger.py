@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from src.models.user import User
+from src.services.ledger import LedgerSnapshotter, balance_at, reconcile, take_snapshot
+
+
+def test_balance_replay_without_snapshot(db, seal):
+    seal(db, ("alice", "bob", "5"))
+    seal(db, ("bob", "carol", "2"), ("alice", "bob", "1"))
+
+    assert balance_at(db, "bob", 1)["balance"] == "5.00000000"
+    res = balance_at(db, "bob", 2)
+    assert Decimal(res["balance"]) == Decimal("4")
+    assert res["snapshot_block_index"] == 0
+    assert res["replayed_postings"] == 3
+
+
+def test_snapshot_shortens_replay(db, seal):
+    seal(db, ("alice", "bob", "5"))
+    seal(db, ("bob", "carol", "2"))
+    assert take_snapshot(db)["addresses"] == 3
+    assert take_snapshot(db)["detail"] == "up to date"
+
+    seal(db, ("carol", "bob", "1"))
+    assert take_snapshot(db) == {"block_index": 3, "addresses": 2}
+
+    res = balance_at(db, "bob", 3)
+    assert Decimal(res["balance"]) == Decimal("4")
+    assert res["snapshot_block_index"] == 3
+    assert res["replayed_postings"] == 0
+    # alice 3-runda o'zgarmagan — 2-balandlikdagi snapshotdan olinadi
+    assert Decimal(balance_at(db, "alice", 3)["balance"]) == Decimal("-5")
+    # tarixiy so'rov eski snapshot/replay bilan
+    assert Decimal(balance_at(db, "bob", 1)["balance"]) == Decimal("5")
+
+
+def test_snapshotter_waits_for_enough_blocks(db_factory, tmp_path, seal):
+    url = f"sqlite:///{tmp_path / 'l.db'}"
+    db = db_factory(url)
+    seal(db, ("alice", "bob", "1"))
+    snap = LedgerSnapshotter(lambda: db_factory(url), every_blocks=2, interval_s=60)
+    assert snap.tick() is None
+    seal(db, ("alice", "bob", "1"))
+    assert snap.tick() == {"block_index": 2, "addresses": 2}
+    db.close()
+
+
+def test_reconcile_flags_drift(db, seal):
+    db.add_all([
+        User(email="a@x", address="alice", balance=Decimal("-3"), password_hash="x"),
+        User(email="b@x", address="bob", balance=Decimal("3"), password_hash="x"),
+    ])
+    db.commit()
+    seal(db, ("alice", "bob", "5"))
+    take_snapshot(db)
+    seal(db, ("bob", "alice", "2"))
+    assert reconcile(db)["ok"] is True
+
+    db.query(User).filter(User.address == "bob").update({"balance": Decimal("4")})
+    db.commit()
+    res = reconcile(db)
+    assert res["ok"] is False
+    assert res["mismatch_count"] == 1
+    assert res["mismatches"][0]["address"] == "bob"
+    assert Decimal(res["mismatches"][0]["ledger_balance"]) == Decimal("3")
@@ -0,0 +1,38 @@
+import hashlib
+
+import pytest
+
+from src.services.merkle import merkle_proof, merkle_root, verify_proof
+
+
+def _h(i: int) -> str:
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4, 5, 7, 8, 13, 100])
+def test_every_leaf_proves_against_root(n):
+    leaves = [_h(i) for i in range(n)]
+    root = merkle_root(leaves)
+    for i, leaf in enumerate(leaves):
+        proof = merkle_proof(leaves, i)
+        assert len(proof) <= max(1, n - 1).bit_length()
+        assert verify_proof(leaf, proof, root)
+
+
+def test_wrong_leaf_or_root_fails():
+    leaves = [_h(i) for i in range(6)]
+    root = merkle_root(leaves)
+    proof = merkle_proof(leaves, 2)
+    assert not verify_proof(_h(99), proof, root)
+    assert not verify_proof(leaves[2], proof, merkle_root(leaves[:5]))
+
+
+def test_odd_level_is_not_duplicated():
+    # [a, b, c] va [a, b, c, c] turli root berishi kerak
+    leaves = [_h(i) for i in range(3)]
+    assert merkle_root(leaves) != merkle_root(leaves + [leaves[-1]])
+
+
+def test_empty_tree_rejected():
+    with pytest.raises(ValueError):
+        merkle_root([])
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from src.services import metrics as m
+
+
+def _count(hist, labels):
+    row = hist.collect().get(labels)
+    return sum(row[:-1]) if row else 0
+
+
+def test_middleware_counts_route_template_and_request_queries():
+    engine = create_engine("sqlite://")
+    m.instrument_engine(engine)
+    app = FastAPI()
+    app.add_middleware(m.MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    route = "/items/{item_id}"
+    before = m.HTTP_REQUESTS.collect().get(("GET", route, "200"), 0)
+    q_before = m.DB_REQUEST_QUERIES.collect().get((route,))
+    client = TestClient(app)
+    assert client.get("/items/1").status_code == 200
+    assert client.get("/items/2").status_code == 200
+
+    assert m.HTTP_REQUESTS.collect()[("GET", route, "200")] - before == 2
+    row = m.DB_REQUEST_QUERIES.collect()[(route,)]
+    # 2 query -> "le=2" bucket (index 2)
+    assert row[2] - (q_before[2] if q_before else 0) == 2
+    assert m.HTTP_IN_FLIGHT.collect().get((), 0) == 0
+
+
+def test_counters_sum_across_threads():
+    c = m.Counter("t_total", "test", ("k",))
+    threads = [threading.Thread(target=lambda: [c.inc("a") for _ in range(1000)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert c.collect() == {("a",): 4000}
+
+
+def test_merge_sums_workers_and_drops_stale_gauges():
+    now = time.time()
+    a = {"ts": now, "families": {"lord_transfers_total": [[["single", "ok"], 3]],
+                                 "lord_http_requests_in_flight": [[[], 2]]}}
+    b = {"ts": now - 3600, "families": {"lord_transfers_total": [[["single", "ok"], 4]],
+                                        "lord_http_requests_in_flight": [[[], 5]]}}
+    merged = m.merge([a, b], stale_after=15)
+    assert merged["lord_transfers_total"] == {("single", "ok"): 7}
+    assert merged["lord_http_requests_in_flight"] == {(): 2}
+
+    text_out = m.render(merged)
+    assert 'lord_transfers_total{kind="single",outcome="ok"} 7' in text_out
+    assert "lord_db_query_duration_seconds_count 0" in text_out
+
+
+def test_transfer_outcomes():
+    def run(exc=None):
+        with m.track_transfer("single"):
+            if exc is not None:
+                exc()
+
+    def fail(status, detail):
+        def _raise():
+            raise HTTPException(status_code=status, detail=detail)
+        return _raise
+
+    def contention():
+        try:
+            raise OperationalError("UPDATE", {}, Exception("database is locked"))
+        except OperationalError as e:
+            raise HTTPException(status_code=503, detail="TX contention") from e
+
+    before = m.TRANSFERS.collect()
+    run()
+    for exc in (fail(400, "Insufficient balance"), fail(500, "TX failed"), fail(404, "Receiver not found"), contention):
+        with pytest.raises(HTTPException):
+            run(exc)
+    after = m.TRANSFERS.collect()
+    delta = {k[1]: after[k] - before.get(k, 0) for k in after if k[0] == "single"}
+    assert delta == {"ok": 1, "insufficient": 1, "error": 1, "rejected": 1, "deadlock": 1}
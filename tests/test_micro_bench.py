@@ -0,0 +1,23 @@
+import json
+import os
+
+import pytest
+
+from benchmarks import micro
+
+
+def test_baseline_covers_all_cases():
+    baseline = json.loads(micro.BASELINE.read_text())
+    assert set(micro.CASES) <= set(baseline["cases"])
+
+
+def test_compare_flags_regression():
+    baseline = {"cases": {"a": {"ratio": 1.0, "ns_per_op": 10}, "b": {"ratio": 1.0, "ns_per_op": 10, "threshold": 3.0}}}
+    result = {"cases": {"a": {"ratio": 2.5, "ns_per_op": 25}, "b": {"ratio": 2.5, "ns_per_op": 25}, "c": {"ratio": 1.0, "ns_per_op": 1}}}
+    rows = {r["case"]: r["status"] for r in micro.compare(result, baseline, None)}
+    assert rows == {"a": "regression", "b": "ok", "c": "new"}
+
+
+@pytest.mark.skipif(os.getenv("MICRO_BENCH") != "1", reason="MICRO_BENCH=1 bo'lganda ishlaydi")
+def test_micro_bench_against_baseline():
+    assert micro.main(["--check"]) == 0
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.db.session import get_db
+from src.models.user import User
+from src.routers import auth as auth_router
+from src.services import password_hasher
+from src.services.password_hasher import PasswordHasher
+
+
+def test_full_executor_rejects_with_503():
+    h = PasswordHasher(workers=1, queue_max=1, rounds=4)
+    gate = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(h.run(gate.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as e:
+            await h.run(gate.wait)
+        assert e.value.status_code == 503 and e.value.headers["Retry-After"] == "1"
+        gate.set()
+        await asyncio.gather(*running)
+
+    asyncio.run(scenario())
+    st = h.stats()
+    assert st["rejected"] == 1 and st["in_flight"] == 0
+    assert st["hash_seconds"]["count"] == 2 and st["queue_wait_seconds"]["count"] == 2
+    h.shutdown()
+
+
+def test_cancelled_queued_call_releases_slot():
+    h = PasswordHasher(workers=1, queue_max=2, rounds=4)
+    gate = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(h.run(gate.wait))
+        queued = asyncio.ensure_future(h.run(gate.wait))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        gate.set()
+        await running
+
+    asyncio.run(scenario())
+    h.shutdown()
+    assert h.stats()["in_flight"] == 0
+
+
+def test_register_login_and_rehash(monkeypatch, db_factory, tmp_path):
+    db = db_factory(f"sqlite:///{tmp_path / 'u.db'}")
+    monkeypatch.setattr(password_hasher, "_hasher", PasswordHasher(workers=1, queue_max=4, rounds=4))
+
+    app = FastAPI()
+    app.include_router(auth_router.router)
+    def _db():
+        s = Session(db.bind)
+        try:
+            yield s
+        finally:
+            s.close()
+
+    app.dependency_overrides[get_db] = _db
+    client = TestClient(app)
+
+    body = {"email": "A@x.io", "password": "secret1"}
+    assert client.post("/api/v1/auth/register", json=body).status_code == 200
+    assert client.post("/api/v1/auth/register", json=body).status_code == 400
+    user = db.query(User).one()
+    assert len(user.address) == 40 and user.password_hash.startswith("$2b$04$")
+
+    assert client.post("/api/v1/auth/login", json={**body, "password": "wrong12"}).status_code == 401
+
+    # cost oshirildi: keyingi muvaffaqiyatli login hashni yangilaydi
+    monkeypatch.setattr(password_hasher, "_hasher", PasswordHasher(workers=1, queue_max=4, rounds=5))
+    r = client.post("/api/v1/auth/login", json=body)
+    assert r.status_code == 200 and r.json()["access_token"]
+    db.expire_all()
+    assert user.password_hash.startswith("$2b$05$")
+    assert password_hasher.get_hasher().stats()["rehashed"] == 1
+
+
+def test_hasher_wait_holds_no_db_connection(monkeypatch, db_factory, tmp_path):
+    engine = db_factory(f"sqlite:///{tmp_path / 'p.db'}").bind
+    seen = []
+
+    class Probe(PasswordHasher):
+        async def hash(self, password):
+            seen.append(engine.pool.checkedout())
+            return await super().hash(password)
+
+        async def verify_and_update(self, password, hashed):
+            seen.append(engine.pool.checkedout())
+            return await super().verify_and_update(password, hashed)
+
+    monkeypatch.setattr(password_hasher, "_hasher", Probe(workers=1, queue_max=4, rounds=4))
+    app = FastAPI()
+    app.include_router(auth_router.router)
+    def _db():
+        s = Session(engine)
+        try:
+            yield s
+        finally:
+            s.close()
+
+    app.dependency_overrides[get_db] = _db
+    client = TestClient(app)
+
+    body = {"email": "b@x.io", "password": "secret1"}
+    assert client.post("/api/v1/auth/register", json=body).status_code == 200
+    assert client.post("/api/v1/auth/login", json=body).status_code == 200
+    # hash kutilayotganda so'rov sessiyasi ulanishni pool ga qaytargan
+    assert seen == [0, 0]
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import NullPool
+
+from src.core.config import settings
+from src.db.pool import MeteredQueuePool, engine_options, pool_stats
+
+PG = "postgresql+psycopg2://u:p@db/lord"
+
+
+def test_metered_pool_counts_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'p.db'}", poolclass=MeteredQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    held = engine.connect()
+    held.execute(text("select 1"))
+    with pytest.raises(PoolTimeout):
+        engine.connect()
+
+    s = pool_stats(engine)
+    assert (s["checked_out"], s["checkouts"], s["timeouts"]) == (1, 1, 1)
+    assert s["wait_histogram"][-1] == {"le": "+Inf", "count": 1}
+
+    held.close()
+    assert pool_stats(engine)["checked_out"] == 0
+    engine.dispose()
+
+
+def test_engine_options_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_PRE_PING", "optimistic")
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    opts = engine_options(PG)
+    assert opts["poolclass"] is MeteredQueuePool
+    assert opts["pool_size"] == 20 and opts["pool_pre_ping"] is False
+    assert opts["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_pgbouncer_mode_has_no_session_state(monkeypatch):
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 0)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    opts = engine_options(PG)
+    assert opts["poolclass"] is NullPool
+    assert "connect_args" not in opts  # timeout SET LOCAL bilan
+
+    aopts = engine_options("postgresql+asyncpg://u:p@db/lord", is_async=True)
+    assert aopts["connect_args"] == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
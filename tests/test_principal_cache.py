@@ -0,0 +1,49 @@
+import uuid
+
+from src.services.principal_cache import Principal, PrincipalCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _p(email, frozen=False):
+    return Principal(id=uuid.uuid4(), email=email, address=email.split("@")[0], is_frozen=frozen)
+
+
+def test_hit_miss_and_ttl():
+    clock = Clock()
+    c = PrincipalCache(10, ttl_s=30, clock=clock)
+    assert c.get("a@x") is None
+    c.put("a@x", _p("a@x"))
+    assert c.get("a@x").address == "a"
+
+    clock.now += 31
+    assert c.get("a@x") is None
+    s = c.stats()
+    assert (s["hits"], s["misses"], s["size"]) == (1, 2, 0)
+
+
+def test_lru_bound_and_invalidate():
+    c = PrincipalCache(2, ttl_s=30, clock=Clock())
+    c.put("a@x", _p("a@x"))
+    c.put("b@x", _p("b@x"))
+    c.get("a@x")  # a endi eng yangi
+    c.put("c@x", _p("c@x"))
+    assert c.get("b@x") is None
+    assert c.get("a@x") is not None
+
+    c.invalidate("a@x")
+    assert c.get("a@x") is None
+    assert c.stats()["evictions"] == 1
+    assert c.stats()["invalidations"] == 1
+
+
+def test_zero_size_disables_cache():
+    c = PrincipalCache(0, ttl_s=30)
+    c.put("a@x", _p("a@x"))
+    assert c.get("a@x") is None
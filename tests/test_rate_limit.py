@@ -0,0 +1,89 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.services.rate_limit import (
+    MemoryBackend, Policy, RateLimiter, RateLimitMiddleware, SQLiteBackend, client_ip, parse_proxies,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_gcra_burst_then_steady_rate():
+    clock = Clock()
+    rl = RateLimiter(MemoryBackend(), clock)
+
+    assert all(rl.hit("k", 5, 10)[0] for _ in range(5))
+    allowed, retry = rl.hit("k", 5, 10)
+    assert not allowed and 1.9 < retry <= 2.0
+
+    clock.now += 2  # bitta "token" qaytdi
+    assert rl.hit("k", 5, 10)[0]
+    assert not rl.hit("k", 5, 10)[0]
+    # boshqa kalitga ta'sir qilmaydi
+    assert rl.hit("other", 5, 10)[0]
+
+
+def test_idle_keys_evicted():
+    clock = Clock()
+    backend = MemoryBackend()
+    rl = RateLimiter(backend, clock)
+    rl.hit("a", 5, 10)
+    rl.hit("b", 1, 100)
+    clock.now += 3
+    assert rl.evict() == 1  # "a" to'liq tiklangan
+    assert len(backend) == 1
+
+
+def test_sqlite_backend_shared_between_instances(tmp_path):
+    path = str(tmp_path / "rl.db")
+    clock = Clock()
+    w1 = RateLimiter(SQLiteBackend(path), clock)
+    w2 = RateLimiter(SQLiteBackend(path), clock)
+
+    assert w1.hit("ip:1", 2, 60)[0]
+    assert w2.hit("ip:1", 2, 60)[0]
+    assert not w1.hit("ip:1", 2, 60)[0]
+
+    clock.now += 120
+    assert w2.evict() == 1
+
+
+def test_middleware_returns_429_only_for_matching_routes():
+    app = FastAPI()
+
+    @app.post("/api/v1/auth/login")
+    def login():
+        return {"ok": True}
+
+    @app.get("/api/v1/explorer/block/1")
+    def block():
+        return {"ok": True}
+
+    rl = RateLimiter(MemoryBackend(), Clock())
+    app.add_middleware(RateLimitMiddleware, limiter=rl, policies=[Policy("auth", "POST", "/api/v1/auth/", 2, 60)])
+    client = TestClient(app)
+
+    assert client.post("/api/v1/auth/login").status_code == 200
+    assert client.post("/api/v1/auth/login").status_code == 200
+    r = client.post("/api/v1/auth/login")
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "30"
+    assert all(client.get("/api/v1/explorer/block/1").status_code == 200 for _ in range(5))
+
+
+def test_client_ip_trusts_forwarded_for_only_from_proxies():
+    proxies = parse_proxies("10.0.0.0/8, 127.0.0.1")
+    xff = [(b"x-forwarded-for", b"6.6.6.6, 1.2.3.4, 10.0.0.7")]
+
+    # proxy ortida: o'ngdan birinchi ishonchsiz hop (6.6.6.6 — mijoz soxtalashtirgan)
+    assert client_ip({"client": ("10.0.0.2", 1), "headers": xff}, proxies) == "1.2.3.4"
+    # to'g'ridan-to'g'ri ulangan mijoz headerni soxtalashtira olmaydi
+    assert client_ip({"client": ("5.5.5.5", 1), "headers": xff}, proxies) == "5.5.5.5"
+    # sozlanmagan: har doim peer
+    assert client_ip({"client": ("10.0.0.2", 1), "headers": xff}) == "10.0.0.2"
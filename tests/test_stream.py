@@ -0,0 +1,87 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.routers import stream as stream_router
+from src.services import stream
+from src.services.stream import BLOCKS, Broker, Lagged, addr_topic
+from src.services.transfer import transfer
+
+
+def test_topics_and_slow_consumer_is_dropped():
+    b = Broker(buffer_size=2, max_subscribers=2)
+
+    async def scenario():
+        fast = b.subscribe({BLOCKS})
+        other = b.subscribe({addr_topic("bob")})
+        with pytest.raises(HTTPException):
+            b.subscribe({BLOCKS})
+
+        b.publish([(BLOCKS, {"n": i}) for i in range(3)])
+        await asyncio.sleep(0)
+        # 3-event bufferga sig'madi -> uzildi, lekin oldingilari o'qiladi
+        assert [await fast.next(0.1), await fast.next(0.1)] == [{"n": 0}, {"n": 1}]
+        with pytest.raises(Lagged):
+            await fast.next(0.1)
+        assert await other.next(0.01) is None
+
+    asyncio.run(scenario())
+    assert b.stats()["dropped_subscribers"] == 1 and b.stats()["subscribers"] == 1
+
+
+@pytest.fixture
+def users(funded_users, monkeypatch):
+    monkeypatch.setattr(stream, "broker", Broker(16, 10))
+    return funded_users[0]
+
+
+def test_events_published_only_after_commit(db, users, monkeypatch):
+    seen = []
+    monkeypatch.setattr(stream.broker, "publish", seen.extend)
+
+    with pytest.raises(HTTPException):
+        transfer(db, users, "a@x", "bob", Decimal("100"))
+    assert seen == []
+
+    tx = transfer(db, users, "a@x", "bob", Decimal("3"))
+    topics = {t: ev for t, ev in seen}
+    assert topics[BLOCKS]["block_hash"] == tx.block_hash
+    assert topics[addr_topic("alice")]["delta"] == "-3.00000000"
+    assert topics[addr_topic("bob")] == {"type": "tx", "address": "bob", "direction": "in", "delta": "3.00000000",
+                                         "tx_hash": tx.tx_hash, "block_index": tx.block_index}
+
+
+def test_websocket_receives_block_and_own_tx(db, users, monkeypatch):
+    monkeypatch.setattr(stream_router, "broker", stream.broker)
+    app = FastAPI()
+    app.include_router(stream_router.router)
+
+    with TestClient(app).websocket_connect("/api/v1/stream/ws") as ws:
+        while not stream.broker.has_subscribers():
+            pass
+        tx = transfer(db, users, "a@x", "bob", Decimal("1"))
+        assert ws.receive_json() == {"type": "block", "block_index": tx.block_index,
+                                     "block_hash": tx.block_hash, "tx_count": 1}
+
+
+def test_sse_subscribes_only_when_body_starts(monkeypatch):
+    b = Broker(16, 1)
+    monkeypatch.setattr(stream_router, "broker", b)
+
+    async def scenario():
+        resp = stream_router._sse_response({BLOCKS})
+        # klient body dan oldin uzildi — generator ishga tushmagan, subscriber yo'q
+        assert b.stats()["subscribers"] == 0
+        body = resp.body_iterator
+        assert await body.__anext__() == "retry: 3000\n\n"
+        assert b.stats()["subscribers"] == 1
+        with pytest.raises(HTTPException) as e:
+            stream_router._sse_response({BLOCKS})
+        assert e.value.status_code == 503
+        await body.aclose()
+        assert b.stats()["subscribers"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,126 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import OperationalError
+
+from src.core.config import settings
+from src.db.retry import RetryPolicy
+from src.models.block import Block
+from src.models.transaction import Transaction
+from src.models.user import User
+from src.schemas.transaction import TxBatchIn, TxCreate
+from src.services.transfer import transfer_batch
+from src.services.transfer_core import transfer_core
+
+
+@pytest.fixture
+def users(db, monkeypatch):
+    # audit_logs sqlite da yo'q — audit commitdan keyin alohida yoziladi
+    monkeypatch.setattr(settings, "AUDIT_TX_DURABLE", False)
+    alice = User(email="a@x", address="alice", balance=Decimal("10"), password_hash="x")
+    bob = User(email="b@x", address="bob", balance=Decimal("0"), password_hash="x")
+    carol = User(email="c@x", address="carol", balance=Decimal("0"), password_hash="x")
+    db.add_all([alice, bob, carol])
+    db.commit()
+    ids = [u.id for u in (alice, bob, carol)]
+    # transfer o'zi db.begin() qiladi — ochiq autobegin tranzaksiya qolmasin
+    db.rollback()
+    return ids
+
+
+def _items(*pairs):
+    return [TxCreate(to_address=a, amount=n) for a, n in pairs]
+
+
+def test_batch_best_effort_one_block(db, users):
+    alice_id, bob_id, carol_id = users
+    res = transfer_batch(db, alice_id, "a@x", _items(("bob", 4), ("nobody", 1), ("carol", 5), ("bob", 2)), atomic=False)
+
+    assert (res["accepted"], res["rejected"]) == (2, 2)
+    assert [r["ok"] for r in res["results"]] == [True, False, True, False]
+    assert res["results"][1]["status_code"] == 404
+    assert res["results"][3]["error"] == "Insufficient balance"
+
+    assert [db.get(User, i).balance for i in users] == [Decimal("1"), Decimal("4"), Decimal("5")]
+    assert db.query(Block).count() == 1
+    assert {t.block_index for t in db.query(Transaction)} == {res["block_index"]}
+
+
+def test_batch_atomic_rolls_back_everything(db, users):
+    with pytest.raises(HTTPException) as e:
+        transfer_batch(db, users[0], "a@x", _items(("bob", 4), ("bob", 7)), atomic=True)
+    assert e.value.status_code == 400 and e.value.detail["index"] == 1
+
+    assert [db.get(User, i).balance for i in users[:2]] == [Decimal("10"), Decimal("0")]
+    assert db.query(Transaction).count() == 0
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def _dbapi_error(pgcode):
+    return OperationalError("UPDATE users ...", {}, _PgError(pgcode))
+
+
+def test_retry_policy_retries_deadlocks_then_gives_up_with_503():
+    policy = RetryPolicy(max_attempts=3, base_ms=0, cap_ms=0, budget_ratio=0.1)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _dbapi_error("40P01")
+        return "ok"
+
+    assert policy.run(flaky) == "ok"
+    assert policy.stats()["retries"] == 2 and policy.stats()["deadlocks"] == 2
+
+    def always():
+        raise _dbapi_error("40001")
+
+    with pytest.raises(HTTPException) as e:
+        policy.run(always)
+    assert e.value.status_code == 503 and e.value.headers["Retry-After"] == "1"
+    assert policy.stats()["gave_up"] == 1
+
+    # boshqa DB xatolari qayta urinilmaydi
+    def unique_violation():
+        raise _dbapi_error("23505")
+
+    with pytest.raises(OperationalError):
+        policy.run(unique_violation)
+    assert policy.stats()["retries"] == 4
+
+
+def test_retry_budget_caps_retries():
+    policy = RetryPolicy(max_attempts=10, base_ms=0, cap_ms=0, budget_ratio=0.0, budget_min=2)
+
+    def always():
+        raise _dbapi_error("40P01")
+
+    with pytest.raises(HTTPException):
+        policy.run(always)
+    st = policy.stats()
+    assert st["retries"] == 2 and st["budget_exhausted"] == 1
+
+
+def test_core_engine_falls_back_to_orm_off_postgres(db, users):
+    alice_id, bob_id, _ = users
+    out = transfer_core(db, alice_id, "a@x", "bob", Decimal("3"))
+    assert out["from_address"] == "alice" and out["to_address"] == "bob"
+    assert db.query(Block).count() == 1
+    assert db.get(User, bob_id).balance == Decimal("3")
+
+
+def test_batch_size_is_validated_by_schema():
+    item = {"to_address": "bob", "amount": 1}
+    assert len(TxBatchIn(items=[item] * settings.TX_BATCH_MAX).items) == settings.TX_BATCH_MAX
+    with pytest.raises(ValidationError):
+        TxBatchIn(items=[item] * (settings.TX_BATCH_MAX + 1))
+    with pytest.raises(ValidationError):
+        TxBatchIn(items=[])
@@ -0,0 +1,109 @@
+"""
+TX_ENGINE=orm va TX_ENGINE=core bir xil ketma-ketlikda bir xil natija beradi.
+Faqat PostgreSQL da (sqlite da transfer_core ORM ga tushadi):
+
+    TEST_PG_URL=postgresql+psycopg2://user@localhost:5432/test pytest tests/test_transfer_core_pg.py
+
+Baza har engine uchun drop_all/create_all qilinadi — alohida test bazasi bering.
+"""
+import os
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.db.base import Base
+from src.models import (  # noqa: F401
+    balance_shard, balance_snapshot, block, chain_checkpoint, chain_head, idempotency_key, session,
+)
+from src.models.address_activity import AddressActivity
+from src.models.audit_log import AuditLog
+from src.models.ledger_posting import LedgerPosting
+from src.models.transaction import Transaction
+from src.models.user import User
+from src.services.audit_partitions import ensure_partitions
+from src.services.chain_verify import verify_chain
+from src.services.ledger import reconcile
+from src.services.transfer import transfer, tx_out
+from src.services.transfer_core import transfer_core
+
+PG_URL = os.getenv("TEST_PG_URL")
+
+pytestmark = pytest.mark.skipif(not PG_URL, reason="TEST_PG_URL berilganda ishlaydi (PostgreSQL)")
+
+# (sender, to, amount) — oxirgilari: yetmaydi, receiver yo'q, muzlatilgan
+STEPS = [
+    ("alice", "bob", "4"), ("bob", "carol", "1.5"), ("alice", "carol", "6"), ("carol", "alice", "0.25"),
+    ("alice", "bob", "100"), ("bob", "nobody", "1"), ("dave", "alice", "1"), ("bob", "alice", "2.5"),
+]
+
+
+def _run(engine, fn) -> dict:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        ensure_partitions(db, ahead=1)
+        users = {
+            name: User(email=f"{name}@x", address=name, password_hash="x", balance=Decimal(bal), is_frozen=name == "dave")
+            for name, bal in (("alice", "10"), ("bob", "0"), ("carol", "0"), ("dave", "5"))
+        }
+        db.add_all(users.values())
+        db.commit()
+        ids = {name: u.id for name, u in users.items()}
+
+    outcomes = []
+    for frm, to, amount in STEPS:
+        # har so'rov o'z sessiyasida (get_db kabi)
+        with Session(engine) as db:
+            try:
+                out = fn(db, ids[frm], f"{frm}@x", to, Decimal(amount))
+                outcomes.append((out["block_index"], out["from_address"], out["to_address"], out["amount"]))
+            except HTTPException as e:
+                outcomes.append((e.status_code, e.detail))
+
+    with Session(engine) as db:
+        res = verify_chain(db, full=True)
+        db.rollback()
+        return {
+            "outcomes": outcomes,
+            "balances": dict(db.execute(select(User.address, User.balance).order_by(User.address)).all()),
+            "postings": db.execute(
+                select(LedgerPosting.block_index, LedgerPosting.block_pos, LedgerPosting.entry,
+                       LedgerPosting.address, LedgerPosting.delta)
+                .order_by(LedgerPosting.block_index, LedgerPosting.entry)
+            ).all(),
+            "activity": db.execute(
+                select(AddressActivity.block_index, AddressActivity.block_pos, AddressActivity.direction,
+                       AddressActivity.address)
+                .order_by(AddressActivity.block_index, AddressActivity.direction)
+            ).all(),
+            "txs": db.execute(
+                select(Transaction.block_index, Transaction.from_address, Transaction.to_address,
+                       Transaction.amount, Transaction.tx_type, Transaction.tx_hash.is_not(None))
+                .order_by(Transaction.block_index)
+            ).all(),
+            "audit": db.execute(select(AuditLog.action, AuditLog.meta["block_index"].as_integer())
+                                .order_by(AuditLog.created_at)).all(),
+            "verify": (res["ok"], res["blocks"]),
+            "reconcile": reconcile(db),
+        }
+
+
+def test_core_engine_matches_orm(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_TX_DURABLE", True)
+    engine = create_engine(PG_URL)
+    try:
+        orm = _run(engine, lambda db, *a: tx_out(transfer(db, *a)))
+        core = _run(engine, transfer_core)
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+    assert orm == core
+    assert orm["verify"] == (True, 5)
+    assert [o[0] for o in orm["outcomes"][4:]] == [400, 404, 403, 5]
+    assert orm["balances"] == {"alice": Decimal("2.75"), "bob": Decimal("0"), "carol": Decimal("7.25"),
+                               "dave": Decimal("5")}
@@ -0,0 +1,34 @@
+import queue
+import threading
+
+from src.services.workers import PeriodicWorker, drain_batch
+
+
+def test_drain_batch_takes_queued_items_after_deadline():
+    q = queue.Queue()
+    assert drain_batch(q, 5, 0, wait_s=0) == []
+    for i in range(7):
+        q.put(i)
+    assert drain_batch(q, 5, 0, wait_s=0) == [0, 1, 2, 3, 4]
+    assert drain_batch(q, 5, 0.01, wait_s=0.01) == [5, 6]
+
+
+def test_periodic_worker_closes_session_and_survives_errors():
+    closed, calls, done = [], [], threading.Event()
+
+    class FakeSession:
+        def close(self):
+            closed.append(1)
+
+    def tick(db):
+        calls.append(db)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        done.set()
+
+    w = PeriodicWorker(FakeSession, 0, tick)
+    w.interval_s = 0.01
+    w.start()
+    assert done.wait(2)
+    w.stop()
+    assert len(calls) >= 2 and len(closed) == len(calls)